@@ -7,6 +7,8 @@ from datetime import datetime
 
 from app.database.postgres_graph import PostgreSQLGraphClient
 from app.services.graph_protocol_service import GraphProtocolService
+from app.utils.helpers import get_http_client
+from app.services.gnn_model import configure_torch_threads
 from app.services.social_intelligence_service import SocialIntelligenceService
 from app.services.network_behavior_analyzer import NetworkBehaviorAnalyzer
 from app.services.alert_system import AlertSystem
@@ -72,6 +74,9 @@ def create_app():
     if not app.debug:
         logging.basicConfig(level=logging.INFO)
     
+    # Torch thread pools are process-wide, so they are sized once at startup
+    configure_torch_threads()
+    
     # Initialize Phase 2 services
     graph_client = None
     graph_service = None
@@ -95,9 +100,13 @@ def create_app():
         app.logger.warning(f"⚠️ PostgreSQL Graph initialization failed: {str(e)} - Using Phase 1 analysis")
         graph_client = None
     
+    # One pooled HTTP client shared by the async data services; they run on the
+    # shared service event loop, which closes the client at shutdown
+    http_client = get_http_client()
+    
     try:
         # The Graph Protocol service
-        graph_service = GraphProtocolService()
+        graph_service = GraphProtocolService(http_client=http_client)
         app.logger.info("✅ The Graph Protocol service initialized")
     except Exception as e:
         app.logger.warning(f"⚠️ The Graph Protocol service failed: {str(e)}")
@@ -105,7 +114,7 @@ def create_app():
     
     try:
         # Social Intelligence service  
-        social_service = SocialIntelligenceService()
+        social_service = SocialIntelligenceService(http_client=http_client)
         app.logger.info("✅ Social Intelligence service initialized")
     except Exception as e:
         app.logger.warning(f"⚠️ Social Intelligence service failed: {str(e)}")
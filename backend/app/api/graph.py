@@ -373,14 +373,9 @@ def import_address_data(address: str):
         if processed_data['transactions']:
             graph_client.bulk_import_transactions(processed_data['transactions'])
         
-        # Create relationships
-        for rel in processed_data['relationships']:
-            graph_client.create_sent_to_relationship(
-                rel['from_hash'], 
-                rel['to_hash'], 
-                rel['transaction'], 
-                rel['value']
-            )
+        # Create relationships in one batch
+        if processed_data['relationships']:
+            graph_client.bulk_import_relationships(processed_data['relationships'])
         
         return jsonify({
             "status": "success",
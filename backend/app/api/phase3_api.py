@@ -124,7 +124,7 @@ def get_comprehensive_intelligence(address: str):
                 possible_chains = multichain_service.detect_address_chain(address)
                 
                 # Analyze address across detected chains
-                multichain_data = multichain_service.analyze_address_multichain(address, possible_chains)
+                multichain_data = multichain_service.analyze_address_multichain_sync(address, possible_chains)
                 
                 # Calculate cross-chain risk
                 cross_chain_risk = multichain_service.calculate_cross_chain_risk(multichain_data)
@@ -334,8 +334,8 @@ def classify_address_with_gnn(address: str):
             "status": "success",
             "data": {
                 "address": address,
-                "gnn_analysis": gnn_result,
-                "model_version": gnn_result.get('model_version', 'GNN_v1.0'),
+                "gnn_analysis": gnn_result.to_dict(),
+                "model_version": gnn_result.model_version,
                 "analysis_timestamp": datetime.now().isoformat(),
                 "features_used": {
                     "graph_data_available": bool(graph_data),
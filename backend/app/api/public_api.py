@@ -249,12 +249,12 @@ def analyze_wallet_public(address):
                     )
                     
                     response['gnn_analysis'] = {
-                        'risk_score': gnn_prediction['risk_score'],
-                        'risk_level': gnn_prediction['risk_level'],
-                        'predicted_class': gnn_prediction['predicted_class'],
-                        'confidence': gnn_prediction['confidence_level'],
-                        'behavioral_tags': gnn_prediction['behavioral_tags'],
-                        'model_version': gnn_prediction['model_version']
+                        'risk_score': gnn_prediction.risk_score,
+                        'risk_level': gnn_prediction.risk_level,
+                        'predicted_class': gnn_prediction.predicted_class,
+                        'confidence': gnn_prediction.confidence_level,
+                        'behavioral_tags': gnn_prediction.behavioral_tags,
+                        'model_version': gnn_prediction.model_version
                     }
                 else:
                     response['gnn_analysis'] = {'error': 'GNN model not available'}
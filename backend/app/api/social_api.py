@@ -9,6 +9,7 @@ import asyncio
 from datetime import datetime
 
 from ..services.social_intelligence_service import SocialIntelligenceService
+from ..utils.helpers import run_async
 from ..database.models import SocialIntelligence
 
 # Create blueprint
@@ -41,12 +42,8 @@ def get_social_intelligence(address: str):
         
         # Perform social intelligence analysis - use sync wrapper to avoid asyncio issues
         try:
-            import asyncio
-            # Run async function in new event loop to avoid conflicts
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            intelligence = loop.run_until_complete(social_service.analyze_address_social_intelligence(address))
-            loop.close()
+            # Run on the shared service event loop, which owns the pooled HTTP client
+            intelligence = run_async(social_service.analyze_address_social_intelligence(address))
         except Exception as async_error:
             # Fallback to mock data if async fails
             intelligence = social_service.get_mock_intelligence(address)
@@ -167,12 +164,8 @@ def bulk_analyze():
             }), 400
         
         try:
-            import asyncio
-            # Run async function in new event loop to avoid conflicts
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            results = loop.run_until_complete(social_service.bulk_analyze_addresses(addresses))
-            loop.close()
+            # Run on the shared service event loop, which owns the pooled HTTP client
+            results = run_async(social_service.bulk_analyze_addresses(addresses))
         except Exception as async_error:
             # Fallback to mock data if async fails
             results = {addr: social_service.get_mock_intelligence(addr) for addr in addresses}
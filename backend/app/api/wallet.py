@@ -12,7 +12,7 @@ from app.services.etherscan_service import EtherscanService
 from app.services.rpc_service import RPCService
 from app.services.hybrid_service import HybridService
 from app.services.risk_scorer import RiskScorer
-from app.utils.helpers import is_valid_ethereum_address, format_wei_to_ether
+from app.utils.helpers import is_valid_ethereum_address, format_wei_to_ether, fast_jsonify, run_async
 from ..database.postgres_graph import PostgreSQLGraphClient
 from ..services.graph_protocol_service import GraphProtocolService
 from ..services.social_intelligence_service import SocialIntelligenceService
@@ -260,11 +260,11 @@ def analyze_wallet_hybrid(address):
         prefer_source = request.args.get('source', 'hybrid')  # 'api', 'rpc', 'hybrid'
         
         # Perform hybrid analysis
-        analysis_result = hybrid_service.analyze_wallet_comprehensive(
+        analysis_result = run_async(hybrid_service.analyze_wallet_comprehensive(
             address=address,
             chain=chain,
             prefer_source=prefer_source
-        )
+        ))
         
         # Add metadata
         analysis_result['metadata'] = {
@@ -308,7 +308,7 @@ def get_data_sources_status():
         api_key = current_app.config.get('ETHERSCAN_API_KEY')
         hybrid_service = HybridService(api_key)
         
-        status = hybrid_service.get_data_source_status()
+        status = run_async(hybrid_service.get_data_source_status())
         
         # Add usage recommendations
         status['recommendations'] = {
@@ -547,7 +547,7 @@ def get_wallet_analysis(address):
             }
         }
         
-        return jsonify(analysis_result), 200
+        return fast_jsonify(analysis_result, 200)
         
     except Exception as e:
         logger.error(f"Error analyzing wallet {address}: {str(e)}")
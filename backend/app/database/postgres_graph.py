@@ -8,9 +8,16 @@ import psycopg2
 from psycopg2.extras import RealDictCursor, execute_values
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from dataclasses import asdict, is_dataclass
 import json
 import hashlib
 
+def _row_properties(row) -> Dict:
+    """JSON-ready node properties from a row dataclass or dict; datetimes become ISO strings"""
+    if is_dataclass(row):
+        row = asdict(row)
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+
 class PostgreSQLGraphClient:
     """PostgreSQL database client for Sentinel graph operations"""
     
@@ -195,11 +202,13 @@ class PostgreSQLGraphClient:
     
     def bulk_create_edges(self, edges: List[Dict]) -> bool:
         """Bulk create edges"""
-        values = []
+        # Keyed by edge_id: a single upsert statement may not touch the same row
+        # twice, so repeated edges collapse to the last one as sequential upserts would
+        values = {}
         for edge in edges:
             edge_id = hashlib.md5(f"{edge['from_node']}:{edge['to_node']}:{edge['edge_type']}".encode()).hexdigest()
-            values.append((edge_id, edge['from_node'], edge['to_node'], 
-                          edge['edge_type'], json.dumps(edge.get('properties', {}))))
+            values[edge_id] = (edge_id, edge['from_node'], edge['to_node'], 
+                               edge['edge_type'], json.dumps(edge.get('properties', {})))
         
         query = """
         INSERT INTO graph_edges (edge_id, from_node, to_node, edge_type, properties) 
@@ -211,7 +220,7 @@ class PostgreSQLGraphClient:
         
         try:
             with self.connection.cursor() as cursor:
-                execute_values(cursor, query, values)
+                execute_values(cursor, query, list(values.values()))
             return True
         except Exception as e:
             self.logger.error(f"Failed to bulk create edges: {str(e)}")
@@ -537,6 +546,7 @@ class PostgreSQLGraphClient:
         """Bulk import address data"""
         nodes = []
         for addr in addresses:
+            addr = _row_properties(addr)
             nodes.append({
                 'node_id': addr.get('hash', addr.get('address')),
                 'node_type': 'address',
@@ -548,6 +558,7 @@ class PostgreSQLGraphClient:
         """Bulk import transaction data"""
         nodes = []
         for tx in transactions:
+            tx = _row_properties(tx)
             nodes.append({
                 'node_id': tx.get('hash'),
                 'node_type': 'transaction',
@@ -555,6 +566,26 @@ class PostgreSQLGraphClient:
             })
         return self.bulk_create_nodes(nodes)
     
+    def bulk_import_relationships(self, relationships: List[Dict]) -> bool:
+        """Bulk import SENT_TO relationships in a single statement"""
+        edges = []
+        for rel in relationships:
+            if is_dataclass(rel):
+                rel = asdict(rel)
+            timestamp = rel.get('timestamp')
+            edges.append({
+                'from_node': rel['from_hash'],
+                'to_node': rel['to_hash'],
+                'edge_type': 'SENT_TO',
+                'properties': {
+                    'value': rel.get('value'),
+                    'transaction_hash': rel.get('transaction'),
+                    'timestamp': timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+                    'gas_used': rel.get('gas_used')
+                }
+            })
+        return self.bulk_create_edges(edges)
+    
     def create_sent_to_relationship(self, from_hash: str, to_hash: str, transaction: Dict, value: float) -> bool:
         """Create SENT_TO relationship between addresses"""
         return self.create_edge(
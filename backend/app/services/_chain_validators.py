@@ -0,0 +1,62 @@
+"""
+Sentinel Chain Validators - Address Format Checks
+Kept free of service state and fully annotated so the module can be compiled
+in place with mypyc (`mypyc app/services/_chain_validators.py`); the pure-Python
+version is used when no compiled extension is present.
+"""
+
+try:
+    # Rust implementation, much faster than the pure-Python base58 package
+    from based58 import b58decode as _b58decode
+except ImportError:
+    from base58 import b58decode as _b58decode
+
+# bytes.translate delete-mask: every byte that is not a hex digit
+HEX_INVALID: bytes = bytes(i for i in range(256) if i not in b'0123456789abcdefABCDEF')
+
+# bytes.translate delete-mask: every byte outside the base58 alphabet
+B58_ALPHABET: bytes = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+B58_INVALID: bytes = bytes(i for i in range(256) if i not in B58_ALPHABET)
+
+# Same for the bech32 data charset used by native SegWit ('bc1') addresses
+BECH32_INVALID: bytes = bytes(i for i in range(256) if i not in b'qpzry9x8gf2tvdw0s3jn54khce6mua7l')
+
+
+def is_ethereum_address(address: str) -> bool:
+    """Check if address is valid Ethereum format"""
+    if len(address) != 42 or not address.isascii():
+        return False
+    raw = address.encode('ascii')
+    return raw[:2] == b'0x' and len(raw[2:].translate(None, HEX_INVALID)) == 40
+
+
+def is_solana_address(address: str) -> bool:
+    """Check if address is valid Solana format"""
+    if len(address) < 32 or len(address) > 44 or not address.isascii():
+        return False
+
+    # Reject anything outside the base58 alphabet in a single C-level pass
+    raw = address.encode('ascii')
+    if raw.translate(None, B58_INVALID) != raw:
+        return False
+
+    # Only well-formed candidates are decoded, to tell 32-byte keys apart
+    # from shorter base58 payloads such as legacy Bitcoin addresses
+    return len(_b58decode(raw)) == 32
+
+
+def is_bitcoin_address(address: str) -> bool:
+    """Check if address is valid Bitcoin format"""
+    # Format-level validation only (no checksum): legacy/P2SH base58 or bech32
+    if not address.startswith(('1', '3', 'bc1', 'BC1')) or not address.isascii():
+        return False
+
+    raw = address.encode('ascii')
+    if raw[0] in b'13':
+        return 26 <= len(raw) <= 35 and raw.translate(None, B58_INVALID) == raw
+
+    # bech32 is single-case; validate the data part after the 'bc1' prefix
+    if raw != raw.lower() and raw != raw.upper():
+        return False
+    data = raw[3:].lower()
+    return 11 <= len(data) <= 71 and data.translate(None, BECH32_INVALID) == data
@@ -8,15 +8,174 @@ import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from typing import Dict, List, Tuple, Optional
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 import pickle
+import json
+import copy
 import os
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, replace
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Position of each engineered feature in the GNN input vector
+_FEATURE_INDEX = {
+    # Transaction features
+    'in_degree': 0,
+    'out_degree': 1,
+    'total_received_eth': 2,
+    'total_sent_eth': 3,
+    'tx_count': 4,
+    'value_mean': 5,
+    'value_std': 6,
+    'value_max': 7,
+    'value_min': 8,
+    # Temporal features
+    'account_age_days': 9,
+    'interval_mean_hours': 10,
+    'interval_std_hours': 11,
+    # Graph features
+    'network_centrality': 12,
+    'clustering_coefficient': 13,
+    'contract_interactions': 14,
+    'unique_recipients': 15,
+    'unique_senders': 16,
+    # Pattern features
+    'round_ratio': 17,
+    'gas_mean': 18,
+    'gas_std': 19,
+    # Risk indicators
+    'known_bad_interactions': 20,
+    # Social features
+    'social_mentions': 21,
+    'scam_alerts': 22,
+    'sentiment_score': 23,
+}
+_NUM_FEATURES = len(_FEATURE_INDEX)
+
+# Known bad addresses, stored lowercase (placeholder until a threat feed is wired in)
+_KNOWN_BAD_ADDRS = frozenset((
+    '0x0000000000000000000000000000000000000000',
+))
+
+def _array_stats_numpy(arr: np.ndarray) -> Tuple[float, float, float, float]:
+    """Mean, population std, min and max of a non-empty float array"""
+    return arr.mean(), arr.std(), arr.min(), arr.max()
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _array_stats(arr):
+        """Single-pass (Welford) mean, population std, min and max of a non-empty float array"""
+        mean = 0.0
+        m2 = 0.0
+        lo = arr[0]
+        hi = arr[0]
+        for i in range(arr.size):
+            x = arr[i]
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+            if x < lo:
+                lo = x
+            elif x > hi:
+                hi = x
+        return mean, np.sqrt(m2 / arr.size), lo, hi
+else:
+    _array_stats = _array_stats_numpy
+
+def _has_utc_offset(ts: str) -> bool:
+    """Whether an ISO-8601 string ends in 'Z' or carries a +/-HH:MM offset after its date"""
+    time_part = ts[10:]
+    return ts.endswith('Z') or '+' in time_part or '-' in time_part
+
+def _parse_timestamps(timestamps: List[str]) -> Tuple[np.ndarray, bool]:
+    """
+    Parse ISO-8601 timestamps into a datetime64[us] array in one C-level pass
+    
+    Unparseable entries are dropped instead of invalidating the whole column.
+    Returns the parsed array and whether the inputs carried a UTC offset; a
+    column mixing offset and naive values cannot be compared and parses empty.
+    """
+    # numpy would read numbers as raw microsecond counts, so only ISO strings are kept
+    strings = [ts for ts in timestamps if isinstance(ts, str)]
+    if not strings:
+        return np.empty(0, dtype='datetime64[us]'), False
+    
+    tz_aware = _has_utc_offset(strings[0])
+    if any(_has_utc_offset(ts) != tz_aware for ts in strings):
+        return np.empty(0, dtype='datetime64[us]'), tz_aware
+    
+    # numpy rejects the 'Z' suffix and normalizes explicit offsets to UTC
+    cleaned = [ts[:-1] if ts.endswith('Z') else ts for ts in strings]
+    
+    try:
+        return np.array(cleaned, dtype='datetime64[us]'), tz_aware
+    except ValueError:
+        pass
+    
+    # Slow path only when the column holds bad values: coerce them to NaT and drop
+    parsed = np.full(len(cleaned), np.datetime64('NaT'), dtype='datetime64[us]')
+    for i, ts in enumerate(cleaned):
+        try:
+            parsed[i] = np.datetime64(ts, 'us')
+        except ValueError:
+            continue
+    return parsed[~np.isnat(parsed)], tz_aware
+
+def configure_torch_threads():
+    """
+    Size torch's process-wide thread pools once, at app startup
+    
+    Single-row GEMVs are dominated by OpenMP fork/join, so GNN_SINGLE_THREAD=true
+    pins intra-op and inter-op parallelism to one thread. Batch inference then
+    runs single-threaded too; leave it unset for batch-heavy deployments.
+    """
+    if os.getenv('GNN_SINGLE_THREAD', 'False').lower() != 'true':
+        return
+    torch.set_num_threads(1)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Interop pool already started by earlier torch work
+
+@dataclass(frozen=True, slots=True)
+class WalletPrediction:
+    """Data class for a single wallet prediction"""
+    risk_score: float
+    risk_level: str
+    predicted_class: str
+    class_confidence: float
+    class_probabilities: Dict[str, float]
+    behavioral_tags: List[str]
+    risk_factors: List[str]
+    embedding: Optional[List[float]]
+    model_version: str
+    confidence_level: str
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form for API responses"""
+        return asdict(self)
+    
+    def copy(self) -> 'WalletPrediction':
+        """Copy whose list and dict fields are not shared with this prediction"""
+        return replace(
+            self,
+            class_probabilities=dict(self.class_probabilities),
+            behavioral_tags=list(self.behavioral_tags),
+            risk_factors=list(self.risk_factors),
+            embedding=list(self.embedding) if self.embedding is not None else None
+        )
+
 class WalletGraphSAGE(nn.Module):
     """
     GraphSAGE model for wallet risk classification
@@ -25,6 +184,8 @@ class WalletGraphSAGE(nn.Module):
     risky wallet patterns that traditional heuristics cannot detect.
     """
     
+    __constants__ = ['residual_from']
+    
     def __init__(self, input_dim: int, hidden_dim: int = 128, num_classes: int = 7, num_layers: int = 3):
         super(WalletGraphSAGE, self).__init__()
         
@@ -41,6 +202,10 @@ class WalletGraphSAGE(nn.Module):
         
         self.sage_layers.append(nn.Linear(hidden_dim, hidden_dim))
         
+        # Only the first layer changes width (input_dim -> hidden_dim); every
+        # later layer is hidden_dim -> hidden_dim and takes a residual
+        self.residual_from = 1
+        
         # Classification head
         self.classifier = nn.Sequential(
             nn.Linear(hidden_dim, hidden_dim // 2),
@@ -54,11 +219,11 @@ class WalletGraphSAGE(nn.Module):
             nn.Linear(hidden_dim, hidden_dim // 2),
             nn.ReLU(),
             nn.Dropout(0.3),
-            nn.Linear(hidden_dim // 2, 1),
-            nn.Sigmoid()  # Output between 0 and 1, will be scaled to 0-100
+            nn.Linear(hidden_dim // 2, 1)
+            # Sigmoid and 0-100 scaling are applied together in forward()
         )
         
-    def forward(self, features):
+    def forward(self, features: torch.Tensor) -> Dict[str, torch.Tensor]:
         """
         Forward pass through the GNN
         
@@ -78,14 +243,14 @@ class WalletGraphSAGE(nn.Module):
             h_new = F.dropout(h_new, training=self.training)
             
             # Residual connection for deeper layers
-            if i > 0 and h.shape[1] == h_new.shape[1]:
+            if i >= self.residual_from:
                 h = h + h_new
             else:
                 h = h_new
         
         # Predictions
         classifications = self.classifier(h)
-        risk_scores = self.risk_scorer(h) * 100  # Scale to 0-100
+        risk_scores = torch.sigmoid(self.risk_scorer(h)) * 100  # Scale to 0-100 in one fused op
         
         return {
             'classifications': classifications,
@@ -101,10 +266,31 @@ class GNNIntelligenceEngine:
     
     def __init__(self, model_path: str = None):
         self.model = None
+        self._inference_model = None  # Optimized copy of self.model used for prediction
+        self._batch_model = None  # FP32 copy on the accelerator for large batches
         self.feature_scaler = StandardScaler()
+        self._scaler_mean: Optional[np.ndarray] = None  # Cached from feature_scaler at load time
+        self._scaler_scale: Optional[np.ndarray] = None
         self.is_trained = False
         self.model_path = model_path or 'models/wallet_gnn_model.pt'
         self.feature_dim = 32  # Will be set during training
+        # Dynamic int8 weights are opt-in (GNN_QUANTIZE_INT8=true); they can shift scores near level boundaries
+        self.quantize = os.getenv('GNN_QUANTIZE_INT8', 'False').lower() == 'true'
+        
+        # Large batches go to CUDA when available (MODEL_DEVICE=auto|cuda|cpu)
+        model_device = os.getenv('MODEL_DEVICE', 'auto').lower()
+        use_cuda = model_device in ('auto', 'cuda') and torch.cuda.is_available()
+        self.device = torch.device('cuda' if use_cuda else 'cpu')
+        self.gpu_batch_threshold = 256
+        
+        # Reusable (1, feature_dim) input buffer; guarded since Flask serves requests on threads
+        self._input_buf = torch.empty((1, self.feature_dim), dtype=torch.float32)
+        self._inference_lock = threading.Lock()
+        
+        # LRU of recent predictions keyed on the wallet's history fingerprint
+        self._prediction_cache: OrderedDict = OrderedDict()
+        self._prediction_cache_size = 10000
+        self._cache_lock = threading.Lock()
         
         # Class labels for behavioral classification
         self.class_labels = [
@@ -116,6 +302,11 @@ class GNNIntelligenceEngine:
             'General_Scam',
             'Sanctions_Related'
         ]
+        self._potential_labels = [f"Potential_{label}" for label in self.class_labels]
+        
+        # Compile the numba statistics kernel up front rather than on the first request
+        if NUMBA_AVAILABLE:
+            _array_stats(np.zeros(1, dtype=np.float64))
         
         # Load model if available
         if os.path.exists(self.model_path):
@@ -132,114 +323,101 @@ class GNNIntelligenceEngine:
         - Off-chain features: social media mentions
         """
         
-        features = []
+        # Slots past the last named feature stay zero as padding up to feature_dim
+        features = np.zeros(max(self.feature_dim, _NUM_FEATURES), dtype=np.float32)
+        idx = _FEATURE_INDEX
         
         # === Transaction Features ===
         tx_count = len(transaction_data)
         
         # Basic transaction metrics
-        features.extend([
-            graph_data.get('incoming_count', 0),  # in-degree
-            graph_data.get('outgoing_count', 0),  # out-degree
-            graph_data.get('total_received', 0) / 1e18,  # total ETH received
-            graph_data.get('total_sent', 0) / 1e18,  # total ETH sent
-            tx_count,  # total transactions
-        ])
+        features[idx['in_degree']] = graph_data.get('incoming_count', 0)
+        features[idx['out_degree']] = graph_data.get('outgoing_count', 0)
+        features[idx['total_received_eth']] = graph_data.get('total_received', 0) / 1e18
+        features[idx['total_sent_eth']] = graph_data.get('total_sent', 0) / 1e18
+        features[idx['tx_count']] = tx_count
+        
+        # Single pass over the history; numeric columns land in preallocated arrays
+        values = np.empty(tx_count, dtype=np.float64)
+        gas_used = np.empty(tx_count, dtype=np.float64)
+        gas_count = 0
+        timestamps = []
+        round_txs = 0
+        known_bad_interactions = 0
+        
+        for i, tx in enumerate(transaction_data):
+            value_wei = tx.get('value_wei', 0)
+            values[i] = value_wei
+            
+            # Round number transactions (automation indicator); kept on the Python
+            # int because wei amounts routinely overflow int64
+            if value_wei % (10**18) == 0:
+                round_txs += 1
+            
+            gas = tx.get('gas_used')
+            if gas:
+                gas_used[gas_count] = gas
+                gas_count += 1
+            
+            timestamp = tx.get('timestamp')
+            if timestamp:
+                timestamps.append(timestamp)
+            
+            # Interaction with known bad addresses (placeholder)
+            to_addr = tx.get('to')
+            if to_addr and to_addr.lower() in _KNOWN_BAD_ADDRS:
+                known_bad_interactions += 1
+        
+        gas_used = gas_used[:gas_count]
         
         # Transaction value statistics
-        if transaction_data:
-            values = [tx.get('value_wei', 0) / 1e18 for tx in transaction_data]
-            features.extend([
-                np.mean(values) if values else 0,
-                np.std(values) if len(values) > 1 else 0,
-                np.max(values) if values else 0,
-                np.min(values) if values else 0,
-            ])
-        else:
-            features.extend([0, 0, 0, 0])
+        if tx_count:
+            values /= 1e18
+            value_mean, value_std, value_min, value_max = _array_stats(values)
+            features[idx['value_mean']] = value_mean
+            features[idx['value_std']] = value_std
+            features[idx['value_max']] = value_max
+            features[idx['value_min']] = value_min
         
         # === Temporal Features ===
-        if transaction_data:
-            timestamps = [tx.get('timestamp') for tx in transaction_data if tx.get('timestamp')]
-            if timestamps:
-                try:
-                    dates = [datetime.fromisoformat(ts.replace('Z', '+00:00')) for ts in timestamps]
-                    account_age_days = (datetime.now(dates[0].tzinfo) - min(dates)).days
-                    
-                    # Time intervals between transactions
-                    intervals = []
-                    for i in range(1, len(dates)):
-                        interval = (dates[i] - dates[i-1]).total_seconds() / 3600  # hours
-                        intervals.append(interval)
-                    
-                    features.extend([
-                        account_age_days,
-                        np.mean(intervals) if intervals else 0,
-                        np.std(intervals) if len(intervals) > 1 else 0,
-                    ])
-                except:
-                    features.extend([0, 0, 0])
-            else:
-                features.extend([0, 0, 0])
-        else:
-            features.extend([0, 0, 0])
+        dates, tz_aware = _parse_timestamps(timestamps)
+        if dates.size:
+            now = datetime.now(timezone.utc).replace(tzinfo=None) if tz_aware else datetime.now()
+            account_age_days = int((np.datetime64(now) - dates.min()) // np.timedelta64(1, 'D'))
+            
+            # Time intervals between transactions (hours)
+            intervals = np.diff(dates) / np.timedelta64(1, 'h')
+            
+            features[idx['account_age_days']] = account_age_days
+            features[idx['interval_mean_hours']] = intervals.mean() if intervals.size else 0
+            features[idx['interval_std_hours']] = intervals.std() if intervals.size > 1 else 0
         
         # === Graph Features ===
-        features.extend([
-            graph_data.get('network_centrality', 0),
-            graph_data.get('clustering_coefficient', 0),
-            graph_data.get('contract_interactions', 0),
-            len(graph_data.get('sent_to_addresses', [])),  # unique recipients
-            len(graph_data.get('received_from_addresses', [])),  # unique senders
-        ])
+        features[idx['network_centrality']] = graph_data.get('network_centrality', 0)
+        features[idx['clustering_coefficient']] = graph_data.get('clustering_coefficient', 0)
+        features[idx['contract_interactions']] = graph_data.get('contract_interactions', 0)
+        features[idx['unique_recipients']] = len(graph_data.get('sent_to_addresses', []))
+        features[idx['unique_senders']] = len(graph_data.get('received_from_addresses', []))
         
         # === Pattern Features ===
-        # Round number transactions (automation indicator)
-        if transaction_data:
-            round_txs = sum(1 for tx in transaction_data 
-                          if tx.get('value_wei', 0) % (10**18) == 0)
-            round_ratio = round_txs / len(transaction_data) if transaction_data else 0
-        else:
-            round_ratio = 0
-        
-        features.append(round_ratio)
+        features[idx['round_ratio']] = round_txs / tx_count if tx_count else 0
         
         # Gas usage patterns
-        if transaction_data:
-            gas_used = [tx.get('gas_used', 0) for tx in transaction_data if tx.get('gas_used')]
-            features.extend([
-                np.mean(gas_used) if gas_used else 0,
-                np.std(gas_used) if len(gas_used) > 1 else 0,
-            ])
-        else:
-            features.extend([0, 0])
+        if gas_count:
+            gas_mean, gas_std, _, _ = _array_stats(gas_used)
+            features[idx['gas_mean']] = gas_mean
+            features[idx['gas_std']] = gas_std
         
         # === Risk Indicators ===
-        # Interaction with known bad addresses (placeholder)
-        known_bad_interactions = 0
-        for tx in transaction_data:
-            to_addr = tx.get('to', '').lower()
-            if to_addr in ['0x0000000000000000000000000000000000000000']:  # Placeholder
-                known_bad_interactions += 1
-        
-        features.append(known_bad_interactions)
+        features[idx['known_bad_interactions']] = known_bad_interactions
         
         # === Social Features ===
-        # These would come from social intelligence service
-        features.extend([
-            0,  # social_mentions
-            0,  # scam_alerts
-            0,  # sentiment_score
-        ])
+        # social_mentions, scam_alerts and sentiment_score would come from the
+        # social intelligence service; their slots stay zero for now
         
-        # Pad or truncate to fixed dimension
-        while len(features) < self.feature_dim:
-            features.append(0)
-        features = features[:self.feature_dim]
-        
-        return np.array(features, dtype=np.float32)
+        return features[:self.feature_dim]
     
-    def predict_single_wallet(self, address: str, graph_data: Dict, transaction_data: List[Dict]) -> Dict:
+    def predict_single_wallet(self, address: str, graph_data: Dict, transaction_data: List[Dict]) -> WalletPrediction:
         """
         Predict risk and behavioral classification for a single wallet
         
@@ -249,65 +427,152 @@ class GNNIntelligenceEngine:
             transaction_data: Transaction history
             
         Returns:
-            Dict with predictions, confidence scores, and explanations
+            WalletPrediction with predictions, confidence scores, and explanations
         """
         
         if not self.is_trained or self.model is None:
             logger.warning("GNN model not trained, falling back to heuristics")
             return self._fallback_prediction(address, graph_data, transaction_data)
         
+        cache_key = self._prediction_cache_key(address, graph_data, transaction_data)
+        with self._cache_lock:
+            cached = self._prediction_cache.get(cache_key)
+            if cached is not None:
+                self._prediction_cache.move_to_end(cache_key)
+                return cached.copy()
+        
         # Engineer features for this address
         features = self.engineer_features(address, graph_data, transaction_data)
-        features_tensor = torch.tensor(features, dtype=torch.float32).unsqueeze(0)
         
-        # Model inference
-        self.model.eval()
-        with torch.no_grad():
-            predictions = self.model(features_tensor)
+        # Model inference (model is put in eval mode once at load time)
+        with self._inference_lock, torch.inference_mode():
+            np.copyto(self._input_buf.numpy()[0], self._scale_features(features))
+            predictions = self._inference_model(self._input_buf)
             
             # Get class probabilities
-            class_probs = F.softmax(predictions['classifications'], dim=1)[0]
-            predicted_class = torch.argmax(class_probs).item()
-            confidence = torch.max(class_probs).item()
+            class_probs_tensor = F.softmax(predictions['classifications'], dim=1)[0]
+            confidence_tensor, predicted_tensor = torch.max(class_probs_tensor, dim=0)
+            predicted_class = int(predicted_tensor)
+            confidence = float(confidence_tensor)
+            class_probs = class_probs_tensor.tolist()
             
             # Get risk score
             risk_score = predictions['risk_scores'][0].item()
             
             # Get node embedding for similarity analysis
-            embedding = predictions['node_embeddings'][0].cpu().numpy()
+            embedding = predictions['node_embeddings'][0].tolist()
+        
+        result = self._format_prediction(features, predicted_class, confidence, class_probs, risk_score, embedding)
+        
+        # The cache keeps its own copy, so callers may mutate what they get back
+        with self._cache_lock:
+            self._prediction_cache[cache_key] = result.copy()
+            if len(self._prediction_cache) > self._prediction_cache_size:
+                self._prediction_cache.popitem(last=False)
+        
+        return result
+    
+    def _prediction_cache_key(self, address: str, graph_data: Dict, transaction_data: List[Dict]) -> Tuple:
+        """Cheap fingerprint of a wallet's inputs: unchanged history means an unchanged prediction"""
+        latest_timestamp = transaction_data[-1].get('timestamp', '') if transaction_data else ''
+        return (
+            address.lower(),
+            len(transaction_data),
+            latest_timestamp,
+            graph_data.get('incoming_count', 0),
+            graph_data.get('outgoing_count', 0),
+        )
+    
+    def predict_many_wallets(self, wallets: List[Tuple[str, Dict, List[Dict]]]) -> List[WalletPrediction]:
+        """
+        Predict risk and behavioral classification for a batch of wallets
+        
+        Runs the model once over an (N, feature_dim) matrix so the per-call
+        dispatch overhead is paid once per batch rather than once per wallet.
+        
+        Args:
+            wallets: List of (address, graph_data, transaction_data) tuples
+            
+        Returns:
+            List of WalletPrediction, in the same order as the input
+        """
+        
+        if not wallets:
+            return []
+        
+        if not self.is_trained or self.model is None:
+            logger.warning("GNN model not trained, falling back to heuristics")
+            return [self._fallback_prediction(address, graph_data, transaction_data)
+                    for address, graph_data, transaction_data in wallets]
+        
+        features = np.stack([
+            self.engineer_features(address, graph_data, transaction_data)
+            for address, graph_data, transaction_data in wallets
+        ])
+        
+        inputs = torch.from_numpy(self._scale_features(features))
+        use_gpu = self._batch_model is not None and len(wallets) >= self.gpu_batch_threshold
+        
+        with torch.inference_mode():
+            if use_gpu:
+                # Pinned host memory lets the copy run asynchronously with the launch queue
+                inputs = inputs.pin_memory().to(self.device, non_blocking=True)
+                predictions = self._batch_model(inputs)
+            else:
+                predictions = self._inference_model(inputs)
+            
+            class_probs = F.softmax(predictions['classifications'], dim=1)
+            confidences, predicted_classes = torch.max(class_probs, dim=1)
+            
+            # One device->host transfer per output instead of per element
+            confidences = confidences.tolist()
+            predicted_classes = predicted_classes.tolist()
+            risk_scores = predictions['risk_scores'][:, 0].tolist()
+            embeddings = predictions['node_embeddings'].tolist()
+            class_probs_rows = class_probs.tolist()
+        
+        return [
+            self._format_prediction(features[i], predicted_classes[i], confidences[i],
+                                    class_probs_rows[i], risk_scores[i], embeddings[i])
+            for i in range(len(wallets))
+        ]
+    
+    def _scale_features(self, features: np.ndarray) -> np.ndarray:
+        """Standardize features for model input; raw features are kept for explanations"""
+        if self._scaler_mean is None:
+            return features
+        return (features - self._scaler_mean) / self._scaler_scale
+    
+    def _format_prediction(self, features: np.ndarray, predicted_class: int, confidence: float,
+                           class_probs: List[float], risk_score: float, embedding: List[float]) -> WalletPrediction:
+        """Interpret raw model outputs for one wallet into a WalletPrediction"""
         
-        # Interpret results
         behavioral_tags = self._interpret_classification(predicted_class, class_probs, risk_score)
         risk_factors = self._explain_risk_score(features, risk_score)
         
-        return {
-            'risk_score': float(risk_score),
-            'risk_level': self._get_risk_level(risk_score),
-            'predicted_class': self.class_labels[predicted_class],
-            'class_confidence': float(confidence),
-            'class_probabilities': {
-                label: float(prob) for label, prob in zip(self.class_labels, class_probs)
-            },
-            'behavioral_tags': behavioral_tags,
-            'risk_factors': risk_factors,
-            'embedding': embedding.tolist(),
-            'model_version': 'GNN_v1.0',
-            'confidence_level': 'high' if confidence > 0.8 else 'medium' if confidence > 0.6 else 'low'
-        }
+        return WalletPrediction(
+            risk_score=float(risk_score),
+            risk_level=self._get_risk_level(risk_score),
+            predicted_class=self.class_labels[predicted_class],
+            class_confidence=float(confidence),
+            class_probabilities=dict(zip(self.class_labels, class_probs)),
+            behavioral_tags=behavioral_tags,
+            risk_factors=risk_factors,
+            embedding=embedding,
+            model_version='GNN_v1.0',
+            confidence_level='high' if confidence > 0.8 else 'medium' if confidence > 0.6 else 'low'
+        )
     
-    def _interpret_classification(self, predicted_class: int, class_probs: torch.Tensor, risk_score: float) -> List[str]:
+    def _interpret_classification(self, predicted_class: int, class_probs: List[float], risk_score: float) -> List[str]:
         """Generate behavioral tags based on classification results"""
         
-        tags = []
-        
-        # Primary classification
-        primary_label = self.class_labels[predicted_class]
-        tags.append(primary_label)
-        
-        # Secondary classifications (if probability > 0.3)
-        for i, prob in enumerate(class_probs):
-            if i != predicted_class and prob > 0.3:
-                tags.append(f"Potential_{self.class_labels[i]}")
+        # Primary classification, then secondary classifications (if probability > 0.3)
+        tags = [self.class_labels[predicted_class]]
+        tags.extend([
+            potential_label
+            for i, (prob, potential_label) in enumerate(zip(class_probs, self._potential_labels))
+            if prob > 0.3 and i != predicted_class
+        ])
         
         # Risk-based tags
         if risk_score > 80:
@@ -323,26 +588,29 @@ class GNNIntelligenceEngine:
         """Generate explanations for the risk score"""
         
         factors = []
+        idx = _FEATURE_INDEX
         
         # High transaction volume
-        if features[4] > 1000:  # tx_count
-            factors.append(f"Very high transaction volume ({features[4]:.0f} transactions)")
+        tx_count = features[idx['tx_count']]
+        if tx_count > 1000:
+            factors.append(f"Very high transaction volume ({tx_count:.0f} transactions)")
         
         # High value transactions
-        if features[7] > 100:  # max_value
-            factors.append(f"Large transaction detected ({features[7]:.2f} ETH)")
+        max_value = features[idx['value_max']]
+        if max_value > 100:
+            factors.append(f"Large transaction detected ({max_value:.2f} ETH)")
         
         # High network connectivity
-        total_connections = features[0] + features[1]  # in_degree + out_degree
+        total_connections = features[idx['in_degree']] + features[idx['out_degree']]
         if total_connections > 500:
             factors.append(f"Highly connected wallet ({total_connections:.0f} connections)")
         
         # Account age factor
-        if features[12] < 30:  # account_age_days
+        if features[idx['account_age_days']] < 30:
             factors.append("Relatively new account")
         
         # Automation indicators
-        if features[17] > 0.7:  # round_ratio
+        if features[idx['round_ratio']] > 0.7:
             factors.append("High proportion of round-number transactions (automation)")
         
         return factors
@@ -360,7 +628,7 @@ class GNNIntelligenceEngine:
         else:
             return "MINIMAL"
     
-    def _fallback_prediction(self, address: str, graph_data: Dict, transaction_data: List[Dict]) -> Dict:
+    def _fallback_prediction(self, address: str, graph_data: Dict, transaction_data: List[Dict]) -> WalletPrediction:
         """Fallback to heuristic-based prediction when GNN is not available"""
         
         # Import the existing risk scorer as fallback
@@ -371,18 +639,44 @@ class GNNIntelligenceEngine:
             address, transaction_data, graph_data.get('balance', 0)
         )
         
-        return {
-            'risk_score': heuristic_result['risk_score'],
-            'risk_level': heuristic_result['risk_level'],
-            'predicted_class': 'Unknown',
-            'class_confidence': 0.5,
-            'class_probabilities': {},
-            'behavioral_tags': heuristic_result['behavioral_tags'],
-            'risk_factors': heuristic_result['risk_factors'],
-            'embedding': None,
-            'model_version': 'Heuristic_Fallback',
-            'confidence_level': 'medium'
-        }
+        return WalletPrediction(
+            risk_score=heuristic_result['risk_score'],
+            risk_level=heuristic_result['risk_level'],
+            predicted_class='Unknown',
+            class_confidence=0.5,
+            class_probabilities={},
+            behavioral_tags=heuristic_result['behavioral_tags'],
+            risk_factors=heuristic_result['risk_factors'],
+            embedding=None,
+            model_version='Heuristic_Fallback',
+            confidence_level='medium'
+        )
+    
+    def _build_inference_model(self, model: nn.Module) -> nn.Module:
+        """
+        Script and freeze the model for CPU inference, fusing its Linear/ReLU
+        chains. The eager model is kept on self.model for saving and training.
+        """
+        # Dropout is a no-op at eval time; swap it out of the heads so it is never dispatched
+        model = copy.deepcopy(model).eval()
+        for head in (model.classifier, model.risk_scorer):
+            for idx, module in enumerate(head):
+                if isinstance(module, nn.Dropout):
+                    head[idx] = nn.Identity()
+        
+        # Dynamic int8 quantization of the Linear layers (weights 4x smaller, int8 GEMMs)
+        if self.quantize:
+            try:
+                model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+            except Exception as e:
+                logger.warning(f"Dynamic quantization unavailable, keeping FP32 weights: {str(e)}")
+        
+        try:
+            frozen = torch.jit.freeze(torch.jit.script(model))
+            return torch.jit.optimize_for_inference(frozen)
+        except Exception as e:
+            logger.warning(f"TorchScript optimization failed, using eager model: {str(e)}")
+            return model
     
     def save_model(self):
         """Save the trained model and scaler"""
@@ -391,13 +685,20 @@ class GNNIntelligenceEngine:
             
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         
-        torch.save({
-            'model_state_dict': self.model.state_dict(),
-            'feature_scaler': self.feature_scaler,
-            'feature_dim': self.feature_dim,
-            'class_labels': self.class_labels,
-            'is_trained': self.is_trained
-        }, self.model_path)
+        # TorchScript archive with metadata and scaler vectors as extra files,
+        # so loading never has to unpickle arbitrary objects
+        scaler_mean = getattr(self.feature_scaler, 'mean_', None)
+        scaler_scale = getattr(self.feature_scaler, 'scale_', None)
+        extra_files = {
+            'meta.json': json.dumps({
+                'feature_dim': self.feature_dim,
+                'class_labels': self.class_labels,
+                'is_trained': self.is_trained
+            }),
+            'scaler_mean.npy': np.asarray(scaler_mean, dtype=np.float32).tobytes() if scaler_mean is not None else b'',
+            'scaler_scale.npy': np.asarray(scaler_scale, dtype=np.float32).tobytes() if scaler_scale is not None else b''
+        }
+        torch.jit.save(torch.jit.script(self.model), self.model_path, _extra_files=extra_files)
         
         logger.info(f"Model saved to {self.model_path}")
         return True
@@ -409,10 +710,11 @@ class GNNIntelligenceEngine:
             return False
         
         try:
-            checkpoint = torch.load(self.model_path, map_location='cpu')
+            checkpoint = self._read_checkpoint()
             
             self.feature_dim = checkpoint['feature_dim']
             self.class_labels = checkpoint['class_labels']
+            self._potential_labels = [f"Potential_{label}" for label in self.class_labels]
             
             self.model = WalletGraphSAGE(
                 input_dim=self.feature_dim,
@@ -421,7 +723,25 @@ class GNNIntelligenceEngine:
             )
             
             self.model.load_state_dict(checkpoint['model_state_dict'])
+            self.model.eval()
+            
+            # Loaded models are inference-only; stop autograd tracking their weights
+            for param in self.model.parameters():
+                param.requires_grad_(False)
+            
+            self._inference_model = self._build_inference_model(self.model)
+            if self.device.type == 'cuda':
+                self._batch_model = copy.deepcopy(self.model).to(self.device).eval()
+            self._input_buf = torch.empty((1, self.feature_dim), dtype=torch.float32)
+            self._prediction_cache.clear()
             self.feature_scaler = checkpoint['feature_scaler']
+            
+            # Normalize with plain numpy vectors rather than sklearn's validating transform()
+            if hasattr(self.feature_scaler, 'mean_'):
+                self._scaler_mean = self.feature_scaler.mean_.astype(np.float32)
+                self._scaler_scale = self.feature_scaler.scale_.astype(np.float32)
+            else:
+                self._scaler_mean = self._scaler_scale = None
             self.is_trained = checkpoint['is_trained']
             
             logger.info("GNN model loaded successfully")
@@ -430,6 +750,31 @@ class GNNIntelligenceEngine:
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             return False
+    
+    def _read_checkpoint(self) -> Dict:
+        """Read a TorchScript model archive, falling back to the legacy torch.save checkpoint"""
+        extra_files = {'meta.json': '', 'scaler_mean.npy': '', 'scaler_scale.npy': ''}
+        try:
+            scripted = torch.jit.load(self.model_path, map_location='cpu', _extra_files=extra_files)
+        except RuntimeError:
+            # Not a TorchScript archive - checkpoint written before the format change
+            return torch.load(self.model_path, map_location='cpu')
+        
+        checkpoint = json.loads(extra_files['meta.json'])
+        checkpoint['model_state_dict'] = scripted.state_dict()
+        
+        # Rebuild the fitted scaler from its stored vectors
+        feature_scaler = StandardScaler()
+        scaler_mean = np.frombuffer(extra_files['scaler_mean.npy'] or b'', dtype=np.float32)
+        if scaler_mean.size:
+            scaler_scale = np.frombuffer(extra_files['scaler_scale.npy'], dtype=np.float32)
+            feature_scaler.mean_ = scaler_mean.astype(np.float64)
+            feature_scaler.scale_ = scaler_scale.astype(np.float64)
+            feature_scaler.var_ = feature_scaler.scale_ ** 2
+            feature_scaler.n_features_in_ = scaler_mean.size
+        checkpoint['feature_scaler'] = feature_scaler
+        
+        return checkpoint
 
 # Global instance
 gnn_engine = GNNIntelligenceEngine() 
\ No newline at end of file
@@ -3,18 +3,309 @@ Sentinel The Graph Protocol Service - Historical Blockchain Data Provider
 """
 
 import asyncio
+import copy
 import logging
-from typing import Dict, List, Optional, Any
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 import httpx
+import numpy as np
 from gql import gql, Client
-from gql.transport.httpx import HTTPXTransport
+from gql.transport.httpx import HTTPXAsyncTransport
+from gql.transport.exceptions import TransportServerError
+from graphql import DocumentNode
 import os
+from ..utils.helpers import HTTP2_AVAILABLE
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+try:
+    from gql.transport.exceptions import TransportConnectionFailed
+    _NETWORK_ERRORS = (httpx.TransportError, TransportConnectionFailed)
+except ImportError:
+    # gql < 4 lets httpx errors through unwrapped
+    _NETWORK_ERRORS = (httpx.TransportError,)
+
+
+# Subgraph queries are static, so parse them once at import time
+_ERC20_TRANSFERS_DOC = gql("""
+query GetERC20Transfers($address: String!, $limit: Int!, $skip: Int!) {
+    transfers(
+        where: {
+            or: [
+                { from: $address },
+                { to: $address }
+            ]
+        }
+        first: $limit
+        skip: $skip
+        orderBy: timestamp
+        orderDirection: desc
+    ) {
+        id
+        transaction {
+            id
+            blockNumber
+            timestamp
+            gasUsed
+            gasPrice
+        }
+        token {
+            id
+            name
+            symbol
+            decimals
+        }
+        from
+        to
+        value
+        timestamp
+    }
+}
+""")
+
+_CONTRACT_INTERACTIONS_DOC = gql("""
+query GetContractInteractions($address: String!, $limit: Int!) {
+    transactions(
+        where: {
+            or: [
+                { from: $address },
+                { to: $address }
+            ]
+        }
+        first: $limit
+        orderBy: timestamp
+        orderDirection: desc
+    ) {
+        id
+        blockNumber
+        timestamp
+        from
+        to
+        value
+        gasUsed
+        gasPrice
+        input
+    }
+}
+""")
+
+_TRANSFERS_IN_RANGE_DOC = gql("""
+query GetTransfersInRange($startTime: Int!, $endTime: Int!, $limit: Int!) {
+    transfers(
+        where: {
+            timestamp_gte: $startTime,
+            timestamp_lte: $endTime
+        }
+        first: $limit
+        orderBy: timestamp
+        orderDirection: asc
+    ) {
+        id
+        transaction {
+            id
+            blockNumber
+            timestamp
+            gasUsed
+            gasPrice
+        }
+        token {
+            id
+            name
+            symbol
+            decimals
+            totalSupply
+        }
+        from
+        to
+        value
+        timestamp
+    }
+}
+""")
+
+_HIGH_VALUE_TRANSACTIONS_DOC = gql("""
+query GetHighValueTransactions($minValue: String!, $limit: Int!) {
+    transactions(
+        where: {
+            value_gte: $minValue
+        }
+        first: $limit
+        orderBy: timestamp
+        orderDirection: desc
+    ) {
+        id
+        blockNumber
+        timestamp
+        from
+        to
+        value
+        gasUsed
+        gasPrice
+        input
+    }
+}
+""")
+
+_CONTRACT_CREATIONS_DOC = gql("""
+query GetContractCreations($limit: Int!) {
+    transactions(
+        where: {
+            to: null
+        }
+        first: $limit
+        orderBy: timestamp
+        orderDirection: desc
+    ) {
+        id
+        blockNumber
+        timestamp
+        from
+        value
+        gasUsed
+        gasPrice
+        input
+    }
+}
+""")
+
+_TRANSFER_FIELDS = """
+        id
+        transaction {
+            id
+            blockNumber
+            timestamp
+            gasUsed
+            gasPrice
+        }
+        token {
+            id
+            name
+            symbol
+            decimals
+        }
+        from
+        to
+        value
+        timestamp"""
+
+
+@lru_cache(maxsize=32)
+def _build_batched_transfers_doc(count: int, limit: int = 500) -> DocumentNode:
+    """Build one query fetching transfers for `count` addresses as aliases a0..aN"""
+    params = ', '.join(f'$a{i}: String!' for i in range(count))
+    fields = '\n'.join(
+        f"""    a{i}: transfers(
+        where: {{ or: [{{ from: $a{i} }}, {{ to: $a{i} }}] }}
+        first: {limit}
+        orderBy: timestamp
+        orderDirection: desc
+    ) {{{_TRANSFER_FIELDS}
+    }}"""
+        for i in range(count)
+    )
+    return gql(f"query GetBatchedTransfers({params}) {{\n{fields}\n}}")
+
+# Sections computed by analyze_address_patterns, and the fewest transactions
+# for which its numeric pattern passes are worth running
+ANALYSIS_SECTIONS = frozenset({'temporal', 'value', 'network', 'patterns'})
+MIN_PATTERN_TRANSACTIONS = 5
+
+
+@dataclass(slots=True)
+class TransactionRow:
+    """Transaction node produced by process_transactions_for_neo4j"""
+    hash: Optional[str]
+    block_number: int
+    timestamp: datetime
+    value: float
+    gas_used: int
+    gas_price: int
+    is_error: bool = False  # The Graph typically only shows successful transactions
+
+
+@dataclass(slots=True)
+class AddressRow:
+    """Address node produced by process_transactions_for_neo4j"""
+    hash: str
+    first_seen: datetime
+    last_activity: datetime
+    balance: float = 0.0  # Will be updated later
+    transaction_count: int = 0
+    is_contract: bool = False  # Will be determined later
+
+
+@dataclass(slots=True)
+class RelationshipRow:
+    """SENT_TO relationship produced by process_transactions_for_neo4j"""
+    from_hash: str
+    to_hash: str
+    transaction: Optional[str]
+    value: float
+    timestamp: datetime
+    gas_used: int = 0
+
+
+class _RateLimiter:
+    """Token bucket pacing subgraph requests to `rate` per `per` seconds.
+
+    Slots are reserved under a thread lock and waited for with asyncio.sleep,
+    so the limiter works across the event loops of concurrent requests.
+    """
+
+    def __init__(self, rate: int, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens * self.per / self.rate if self._tokens < 0 else 0.0
+        
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class _SharedClientTransport(HTTPXAsyncTransport):
+    """HTTPX transport bound to a service-owned AsyncClient.
+
+    gql connects and closes the transport around every execute_async call;
+    here that only attaches the shared client, so pooled keep-alive
+    connections survive between queries and the client is closed by the
+    service instead. Responses are decoded with orjson when installed.
+    """
+
+    def __init__(self, url: str, client: httpx.AsyncClient):
+        super().__init__(url=url, json_deserialize=_json_loads)
+        self._shared_client = client
+
+    async def connect(self):
+        self.client = self._shared_client
+
+    async def close(self):
+        pass
+
 
 class GraphProtocolService:
     """Service for querying The Graph Protocol subgraphs"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.logger = logging.getLogger(__name__)
         
         # The Graph endpoints
@@ -25,73 +316,161 @@ class GraphProtocolService:
             # Add more subgraphs as needed
         }
         
-        # HTTP client for API calls
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # HTTP client for API calls, shared by every subgraph client. An injected
+        # client is owned by the caller and left open on close().
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
+        )
+        self._clients: Dict[str, Client] = {}
+        
+        # Cap on concurrent subgraph queries when fanning out
+        self.max_concurrent_queries = 20
+        
+        # Request pacing towards The Graph, shared by all callers
+        self._limiter = _RateLimiter(rate=10, per=1.0)
+        
+        # Historical subgraph data is effectively immutable over short windows
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_size = 10000
+        self._query_cache_ttl = 60.0
+        self._cache_lock = threading.Lock()
+        
+        # Retries for throttled or failing endpoints, and a per-endpoint circuit
+        # breaker: endpoint -> (consecutive failures, open until monotonic time)
+        self.max_query_attempts = 4
+        self.max_retry_delay = 30.0
+        self.breaker_threshold = 5
+        self.breaker_cooldown = 30.0
+        self._breaker: Dict[str, Tuple[int, float]] = {}
+        self._breaker_lock = threading.Lock()
         
     async def close(self):
         """Close HTTP client"""
-        await self.http_client.aclose()
+        self._clients.clear()
+        if self._owns_http_client:
+            await self.http_client.aclose()
+    
+    def _get_client(self, endpoint: str) -> Client:
+        """Get the cached GraphQL client for endpoint"""
+        client = self._clients.get(endpoint)
+        if client is None:
+            transport = _SharedClientTransport(url=endpoint, client=self.http_client)
+            client = self._clients.setdefault(endpoint, Client(transport=transport))
+        return client
+    
+    def clear_cache(self):
+        """Drop all cached subgraph query results"""
+        with self._cache_lock:
+            self._query_cache.clear()
+    
+    def _cache_get(self, key: Tuple) -> Optional[Dict]:
+        with self._cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+        # Results are plain mutable dicts; each caller gets its own copy so edits cannot leak
+        return copy.deepcopy(result)
     
-    def _get_transport(self, endpoint: str):
-        """Get GraphQL transport for endpoint"""
-        return HTTPXTransport(url=endpoint)
+    def _cache_put(self, key: Tuple, result: Dict):
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self._query_cache[key] = (time.monotonic() + self._query_cache_ttl, result)
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
     
-    async def query_subgraph(self, subgraph_name: str, query: str, variables: Dict = None) -> Dict:
+    def _retry_delay(self, error: Exception, client: Client, attempt: int) -> Optional[float]:
+        """Backoff before retrying a failed query, or None if the error is not transient"""
+        if isinstance(error, TransportServerError):
+            if error.code != 429 and (error.code is None or error.code < 500):
+                return None
+        elif not isinstance(error, _NETWORK_ERRORS):
+            return None
+        
+        delay = min(self.max_retry_delay, 0.5 * 2 ** attempt + random.random())
+        
+        # Honour the server's Retry-After when throttled (best effort: the
+        # transport keeps the headers of the last response it parsed)
+        if isinstance(error, TransportServerError) and error.code == 429:
+            headers = getattr(client.transport, 'response_headers', None) or {}
+            try:
+                delay = min(self.max_retry_delay, max(delay, float(headers.get('Retry-After', 0))))
+            except ValueError:
+                pass
+        
+        return delay
+    
+    def _record_failure(self, endpoint: str) -> bool:
+        """Count a transient failure for endpoint; returns True once the circuit opens"""
+        with self._breaker_lock:
+            failures = self._breaker.get(endpoint, (0, 0.0))[0] + 1
+            if failures >= self.breaker_threshold:
+                self._breaker[endpoint] = (0, time.monotonic() + self.breaker_cooldown)
+                self.logger.error(f"Circuit opened for {endpoint} for {self.breaker_cooldown:.0f}s")
+                return True
+            self._breaker[endpoint] = (failures, 0.0)
+            return False
+    
+    async def query_subgraph(self, subgraph_name: str, query: DocumentNode, variables: Dict = None,
+                             cacheable: bool = True) -> Dict:
         """Execute GraphQL query on subgraph"""
         if subgraph_name not in self.subgraph_endpoints:
             raise ValueError(f"Unknown subgraph: {subgraph_name}")
         
+        variables = variables or {}
+        cache_key = (subgraph_name, query, tuple(sorted(variables.items()))) if cacheable else None
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+        
         endpoint = self.subgraph_endpoints[subgraph_name]
-        transport = self._get_transport(endpoint)
+        with self._breaker_lock:
+            _, open_until = self._breaker.get(endpoint, (0, 0.0))
+        if open_until > time.monotonic():
+            raise RuntimeError(f"Subgraph {subgraph_name} circuit open after repeated failures")
         
-        try:
-            async with Client(transport=transport) as client:
-                result = await client.execute_async(gql(query), variable_values=variables or {})
-                return result
-        except Exception as e:
-            self.logger.error(f"Error querying subgraph {subgraph_name}: {str(e)}")
-            raise
+        client = self._get_client(endpoint)
+        
+        for attempt in range(self.max_query_attempts):
+            await self._limiter.acquire()
+            try:
+                result = await client.execute_async(query, variable_values=variables)
+                break
+            except Exception as e:
+                delay = self._retry_delay(e, client, attempt)
+                if delay is None:
+                    # Not a transient failure - the endpoint itself answered
+                    self.logger.error(f"Error querying subgraph {subgraph_name}: {str(e)}")
+                    raise
+                
+                if self._record_failure(endpoint) or attempt == self.max_query_attempts - 1:
+                    self.logger.error(f"Error querying subgraph {subgraph_name}: {str(e)}")
+                    raise
+                
+                self.logger.warning(
+                    f"Subgraph {subgraph_name} attempt {attempt + 1} failed ({str(e)}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        
+        with self._breaker_lock:
+            self._breaker.pop(endpoint, None)
+        
+        if cache_key is not None:
+            self._cache_put(cache_key, result)
+        return result
     
     async def get_address_transactions(self, address: str, limit: int = 1000, skip: int = 0) -> List[Dict]:
         """Get historical transactions for an address"""
         
-        # Query for ERC20 transfers involving the address
-        erc20_query = """
-        query GetERC20Transfers($address: String!, $limit: Int!, $skip: Int!) {
-            transfers(
-                where: {
-                    or: [
-                        { from: $address },
-                        { to: $address }
-                    ]
-                }
-                first: $limit
-                skip: $skip
-                orderBy: timestamp
-                orderDirection: desc
-            ) {
-                id
-                transaction {
-                    id
-                    blockNumber
-                    timestamp
-                    gasUsed
-                    gasPrice
-                }
-                token {
-                    id
-                    name
-                    symbol
-                    decimals
-                }
-                from
-                to
-                value
-                timestamp
-            }
-        }
-        """
-        
         variables = {
             'address': address.lower(),
             'limit': limit,
@@ -99,7 +478,7 @@ class GraphProtocolService:
         }
         
         try:
-            result = await self.query_subgraph('ethereum_erc20', erc20_query, variables)
+            result = await self.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, variables)
             return result.get('transfers', [])
         except Exception as e:
             self.logger.error(f"Error fetching transactions for {address}: {str(e)}")
@@ -108,40 +487,13 @@ class GraphProtocolService:
     async def get_address_interactions(self, address: str, limit: int = 500) -> List[Dict]:
         """Get smart contract interactions for an address"""
         
-        # Query for smart contract interactions
-        interactions_query = """
-        query GetContractInteractions($address: String!, $limit: Int!) {
-            transactions(
-                where: {
-                    or: [
-                        { from: $address },
-                        { to: $address }
-                    ]
-                }
-                first: $limit
-                orderBy: timestamp
-                orderDirection: desc
-            ) {
-                id
-                blockNumber
-                timestamp
-                from
-                to
-                value
-                gasUsed
-                gasPrice
-                input
-            }
-        }
-        """
-        
         variables = {
             'address': address.lower(),
             'limit': limit
         }
         
         try:
-            result = await self.query_subgraph('ethereum_blocks', interactions_query, variables)
+            result = await self.query_subgraph('ethereum_blocks', _CONTRACT_INTERACTIONS_DOC, variables)
             return result.get('transactions', [])
         except Exception as e:
             self.logger.error(f"Error fetching interactions for {address}: {str(e)}")
@@ -150,40 +502,6 @@ class GraphProtocolService:
     async def get_token_transfers_in_range(self, start_timestamp: int, end_timestamp: int, limit: int = 1000) -> List[Dict]:
         """Get token transfers within a timestamp range"""
         
-        transfers_query = """
-        query GetTransfersInRange($startTime: Int!, $endTime: Int!, $limit: Int!) {
-            transfers(
-                where: {
-                    timestamp_gte: $startTime,
-                    timestamp_lte: $endTime
-                }
-                first: $limit
-                orderBy: timestamp
-                orderDirection: asc
-            ) {
-                id
-                transaction {
-                    id
-                    blockNumber
-                    timestamp
-                    gasUsed
-                    gasPrice
-                }
-                token {
-                    id
-                    name
-                    symbol
-                    decimals
-                    totalSupply
-                }
-                from
-                to
-                value
-                timestamp
-            }
-        }
-        """
-        
         variables = {
             'startTime': start_timestamp,
             'endTime': end_timestamp,
@@ -191,7 +509,7 @@ class GraphProtocolService:
         }
         
         try:
-            result = await self.query_subgraph('ethereum_erc20', transfers_query, variables)
+            result = await self.query_subgraph('ethereum_erc20', _TRANSFERS_IN_RANGE_DOC, variables)
             return result.get('transfers', [])
         except Exception as e:
             self.logger.error(f"Error fetching transfers in range: {str(e)}")
@@ -203,36 +521,13 @@ class GraphProtocolService:
         # Convert ETH to Wei
         min_value_wei = str(int(min_value_eth * 10**18))
         
-        high_value_query = """
-        query GetHighValueTransactions($minValue: String!, $limit: Int!) {
-            transactions(
-                where: {
-                    value_gte: $minValue
-                }
-                first: $limit
-                orderBy: timestamp
-                orderDirection: desc
-            ) {
-                id
-                blockNumber
-                timestamp
-                from
-                to
-                value
-                gasUsed
-                gasPrice
-                input
-            }
-        }
-        """
-        
         variables = {
             'minValue': min_value_wei,
             'limit': limit
         }
         
         try:
-            result = await self.query_subgraph('ethereum_blocks', high_value_query, variables)
+            result = await self.query_subgraph('ethereum_blocks', _HIGH_VALUE_TRANSACTIONS_DOC, variables)
             return result.get('transactions', [])
         except Exception as e:
             self.logger.error(f"Error fetching high-value transactions: {str(e)}")
@@ -241,32 +536,10 @@ class GraphProtocolService:
     async def get_contract_creations(self, limit: int = 100) -> List[Dict]:
         """Get recent contract creations"""
         
-        contract_query = """
-        query GetContractCreations($limit: Int!) {
-            transactions(
-                where: {
-                    to: null
-                }
-                first: $limit
-                orderBy: timestamp
-                orderDirection: desc
-            ) {
-                id
-                blockNumber
-                timestamp
-                from
-                value
-                gasUsed
-                gasPrice
-                input
-            }
-        }
-        """
-        
         variables = {'limit': limit}
         
         try:
-            result = await self.query_subgraph('ethereum_blocks', contract_query, variables)
+            result = await self.query_subgraph('ethereum_blocks', _CONTRACT_CREATIONS_DOC, variables)
             return result.get('transactions', [])
         except Exception as e:
             self.logger.error(f"Error fetching contract creations: {str(e)}")
@@ -285,12 +558,30 @@ class GraphProtocolService:
         current_addresses = {address}
         all_addresses = {address}
         
+        # Addresses already fetched and edges already recorded
+        visited = set()
+        seen_edges = set()
+        
+        # Bound in-flight subgraph queries per frontier
+        semaphore = asyncio.Semaphore(self.max_concurrent_queries)
+        
+        async def fetch(addr: str) -> List[Dict]:
+            async with semaphore:
+                return await self.get_address_transactions(addr, limit=200)
+        
         for current_depth in range(depth):
             next_addresses = set()
             
-            for addr in current_addresses:
-                # Get transactions involving this address
-                transactions = await self.get_address_transactions(addr, limit=200)
+            frontier = [addr for addr in current_addresses if addr not in visited]
+            visited.update(frontier)
+            
+            # Fetch the whole frontier concurrently
+            results = await asyncio.gather(*(fetch(addr) for addr in frontier), return_exceptions=True)
+            
+            for addr, transactions in zip(frontier, results):
+                if isinstance(transactions, Exception):
+                    self.logger.error(f"Error fetching network data for {addr}: {transactions}")
+                    continue
                 
                 for tx in transactions:
                     tx_value = float(tx.get('value', 0)) / 10**18  # Convert to ETH
@@ -298,6 +589,13 @@ class GraphProtocolService:
                     if tx_value >= min_value:
                         from_addr = tx.get('from', '').lower()
                         to_addr = tx.get('to', '').lower()
+                        tx_id = tx.get('transaction', {}).get('id')
+                        
+                        # The same transfer shows up from both of its endpoints
+                        edge_key = (from_addr, to_addr, tx_id)
+                        if edge_key in seen_edges:
+                            continue
+                        seen_edges.add(edge_key)
                         
                         # Add addresses to network
                         if from_addr and from_addr not in all_addresses:
@@ -313,7 +611,7 @@ class GraphProtocolService:
                             'from': from_addr,
                             'to': to_addr,
                             'value': tx_value,
-                            'transaction': tx.get('transaction', {}).get('id'),
+                            'transaction': tx_id,
                             'timestamp': tx.get('timestamp'),
                             'token': tx.get('token', {})
                         })
@@ -327,8 +625,13 @@ class GraphProtocolService:
         network_data['nodes'] = list(all_addresses)
         return network_data
     
-    async def analyze_address_patterns(self, address: str) -> Dict:
-        """Analyze transaction patterns for an address"""
+    async def analyze_address_patterns(self, address: str, include: frozenset = ANALYSIS_SECTIONS) -> Dict:
+        """Analyze transaction patterns for an address
+        
+        Args:
+            address: Address to analyze
+            include: Sections to compute, any of 'temporal', 'value', 'network', 'patterns'
+        """
         
         # Get comprehensive transaction data
         transactions = await self.get_address_transactions(address, limit=2000)
@@ -349,70 +652,101 @@ class GraphProtocolService:
             'network_analysis': {}
         }
         
-        # Temporal patterns
-        timestamps = [int(tx.get('timestamp', 0)) for tx in transactions]
-        if timestamps:
-            time_diffs = [timestamps[i] - timestamps[i+1] for i in range(len(timestamps)-1)]
-            avg_interval = sum(time_diffs) / len(time_diffs) if time_diffs else 0
-            
-            analysis['temporal_analysis'] = {
-                'average_interval_seconds': avg_interval,
-                'first_transaction': datetime.fromtimestamp(min(timestamps)).isoformat(),
-                'last_transaction': datetime.fromtimestamp(max(timestamps)).isoformat(),
-                'time_span_days': (max(timestamps) - min(timestamps)) / 86400,
-                'activity_frequency': len(transactions) / ((max(timestamps) - min(timestamps)) / 86400) if max(timestamps) != min(timestamps) else 0
-            }
+        n = len(transactions)
         
-        # Value patterns
-        values = [float(tx.get('value', 0)) / 10**18 for tx in transactions]
-        if values:
-            analysis['value_analysis'] = {
-                'total_volume': sum(values),
-                'average_value': sum(values) / len(values),
-                'max_value': max(values),
-                'min_value': min(values),
-                'round_number_ratio': sum(1 for v in values if v == int(v)) / len(values)
-            }
+        # Too few transactions for any pattern to be meaningful - skip the numeric passes
+        numeric = n >= MIN_PATTERN_TRANSACTIONS
+        detect_patterns = numeric and 'patterns' in include
+        need_temporal = numeric and ('temporal' in include or detect_patterns)
+        need_values = numeric and ('value' in include or detect_patterns)
+        need_network = 'network' in include or detect_patterns
+        patterns = []
         
-        # Network patterns
-        counterparts = set()
+        # Single pass over the raw transactions, lowercasing each endpoint once
+        address_lower = address.lower()
+        timestamps = []
+        values = []
+        counterparts = Counter()
         for tx in transactions:
-            from_addr = tx.get('from', '').lower()
-            to_addr = tx.get('to', '').lower()
+            if need_temporal:
+                timestamps.append(int(tx.get('timestamp', 0)))
+            if need_values:
+                values.append(float(tx.get('value', 0)))
+            if need_network:
+                from_addr = tx.get('from') or ''
+                if from_addr:
+                    from_addr = from_addr.lower()
+                    if from_addr != address_lower:
+                        counterparts[from_addr] += 1
+                to_addr = tx.get('to') or ''
+                if to_addr:
+                    to_addr = to_addr.lower()
+                    if to_addr != address_lower:
+                        counterparts[to_addr] += 1
+        
+        if need_temporal:
+            # Temporal patterns
+            timestamps = np.array(timestamps, dtype=np.int64)
+            time_diffs = timestamps[:-1] - timestamps[1:]
+            avg_interval = float(time_diffs.mean())
             
-            if from_addr != address.lower():
-                counterparts.add(from_addr)
-            if to_addr != address.lower():
-                counterparts.add(to_addr)
-        
-        analysis['network_analysis'] = {
-            'unique_counterparts': len(counterparts),
-            'network_diversity': len(counterparts) / len(transactions) if transactions else 0,
-            'top_counterparts': list(counterparts)[:10]  # Top 10 for brevity
-        }
-        
-        # Pattern detection
-        patterns = []
-        
-        # Regular interval pattern
-        if analysis['temporal_analysis'].get('average_interval_seconds', 0) > 0:
-            regular_intervals = sum(1 for diff in time_diffs if abs(diff - avg_interval) < avg_interval * 0.1)
-            if regular_intervals > len(time_diffs) * 0.7:
-                patterns.append('regular_intervals')
-        
-        # Round value pattern
-        if analysis['value_analysis'].get('round_number_ratio', 0) > 0.7:
-            patterns.append('round_values')
-        
-        # Low diversity pattern (potential circular activity)
-        if analysis['network_analysis'].get('network_diversity', 1) < 0.1:
-            patterns.append('low_diversity')
+            if 'temporal' in include:
+                first_ts = int(timestamps.min())
+                last_ts = int(timestamps.max())
+                span = last_ts - first_ts
+                analysis['temporal_analysis'] = {
+                    'average_interval_seconds': avg_interval,
+                    'first_transaction': datetime.fromtimestamp(first_ts).isoformat(),
+                    'last_transaction': datetime.fromtimestamp(last_ts).isoformat(),
+                    'time_span_days': span / 86400,
+                    'activity_frequency': n / (span / 86400) if span else 0
+                }
+            
+            # Regular interval pattern
+            if detect_patterns and avg_interval > 0:
+                regular_intervals = int(np.count_nonzero(np.abs(time_diffs - avg_interval) < avg_interval * 0.1))
+                if regular_intervals > time_diffs.size * 0.7:
+                    patterns.append('regular_intervals')
+        
+        if need_values:
+            # Value patterns
+            values = np.array(values, dtype=np.float64) / 10**18
+            round_number_ratio = float(np.mean(values == np.floor(values)))
+            
+            if 'value' in include:
+                analysis['value_analysis'] = {
+                    'total_volume': float(values.sum()),
+                    'average_value': float(values.mean()),
+                    'max_value': float(values.max()),
+                    'min_value': float(values.min()),
+                    'round_number_ratio': round_number_ratio
+                }
+            
+            # Round value pattern
+            if detect_patterns and round_number_ratio > 0.7:
+                patterns.append('round_values')
         
-        analysis['patterns'] = {
-            'detected_patterns': patterns,
-            'pattern_count': len(patterns),
-            'suspicion_score': min(len(patterns) * 25, 100)  # Simple scoring
-        }
+        if need_network:
+            # Network patterns
+            network_diversity = len(counterparts) / n
+            
+            if 'network' in include:
+                analysis['network_analysis'] = {
+                    'unique_counterparts': len(counterparts),
+                    'network_diversity': network_diversity,
+                    'top_counterparts': [addr for addr, _ in counterparts.most_common(10)]
+                }
+            
+            # Low diversity pattern (potential circular activity)
+            if detect_patterns and network_diversity < 0.1:
+                patterns.append('low_diversity')
+        
+        if 'patterns' in include:
+            analysis['patterns'] = {
+                'detected_patterns': patterns,
+                'pattern_count': len(patterns),
+                'suspicion_score': min(len(patterns) * 25, 100)  # Simple scoring
+            }
         
         return analysis
     
@@ -427,47 +761,64 @@ class GraphProtocolService:
             'relationships': []
         }
         
+        addresses = processed_data['addresses']
+        append_tx = processed_data['transactions'].append
+        append_rel = processed_data['relationships'].append
+        fromtimestamp = datetime.fromtimestamp
+        wei = 10**18
+        
         for tx in transactions:
+            # Transfers nest tx metadata under 'transaction'; raw transactions carry it inline
+            subtx = tx.get('transaction')
+            if subtx is not None:
+                tx_hash = subtx.get('id', tx.get('id'))
+                block_number = int(subtx.get('blockNumber', 0))
+                gas_used = int(subtx.get('gasUsed', 0))
+                gas_price = int(subtx.get('gasPrice', 0))
+            else:
+                tx_hash = tx.get('id')
+                block_number = int(tx.get('blockNumber', 0))
+                gas_used = int(tx.get('gasUsed', 0))
+                gas_price = int(tx.get('gasPrice', 0))
+            
+            timestamp = fromtimestamp(int(tx.get('timestamp', 0)))
+            value = float(tx.get('value', 0)) / wei  # Convert to ETH
+            
             # Process transaction
-            tx_data = {
-                'hash': tx.get('transaction', {}).get('id', tx.get('id')),
-                'block_number': int(tx.get('transaction', {}).get('blockNumber', tx.get('blockNumber', 0))),
-                'timestamp': datetime.fromtimestamp(int(tx.get('timestamp', 0))),
-                'value': float(tx.get('value', 0)) / 10**18,  # Convert to ETH
-                'gas_used': int(tx.get('transaction', {}).get('gasUsed', tx.get('gasUsed', 0))),
-                'gas_price': int(tx.get('transaction', {}).get('gasPrice', tx.get('gasPrice', 0))),
-                'is_error': False  # The Graph typically only shows successful transactions
-            }
-            processed_data['transactions'].append(tx_data)
+            append_tx(TransactionRow(tx_hash, block_number, timestamp, value, gas_used, gas_price))
             
             # Process addresses
             from_addr = tx.get('from', '').lower()
             to_addr = tx.get('to', '').lower()
             
-            for addr in [from_addr, to_addr]:
-                if addr and addr not in processed_data['addresses']:
-                    processed_data['addresses'][addr] = {
-                        'hash': addr,
-                        'first_seen': tx_data['timestamp'],
-                        'last_activity': tx_data['timestamp'],
-                        'balance': 0.0,  # Will be updated later
-                        'transaction_count': 0,
-                        'is_contract': False  # Will be determined later
-                    }
+            for addr in (from_addr, to_addr):
+                if addr and addr not in addresses:
+                    addresses[addr] = AddressRow(addr, timestamp, timestamp)
             
             # Create relationship
             if from_addr and to_addr:
-                relationship = {
-                    'from_hash': from_addr,
-                    'to_hash': to_addr,
-                    'transaction': tx_data['hash'],
-                    'value': tx_data['value'],
-                    'timestamp': tx_data['timestamp']
-                }
-                processed_data['relationships'].append(relationship)
+                append_rel(RelationshipRow(from_addr, to_addr, tx_hash, value, timestamp, gas_used))
         
         return processed_data
     
+    async def _fetch_transfers_batch(self, addresses: List[str], limit: int = 500) -> List[Any]:
+        """Fetch transfers for several addresses in a single subgraph request"""
+        variables = {f'a{i}': address.lower() for i, address in enumerate(addresses)}
+        
+        try:
+            result = await self.query_subgraph(
+                'ethereum_erc20', _build_batched_transfers_doc(len(addresses), limit), variables
+            )
+            return [result.get(f'a{i}', []) for i in range(len(addresses))]
+        except Exception as e:
+            # Large batches can exceed the subgraph's query complexity limit
+            self.logger.warning(f"Batched transfer query failed, fetching individually: {str(e)}")
+        
+        return await asyncio.gather(
+            *(self.get_address_transactions(address, limit=limit) for address in addresses),
+            return_exceptions=True
+        )
+    
     async def bulk_fetch_address_data(self, addresses: List[str], batch_size: int = 10) -> Dict:
         """Bulk fetch data for multiple addresses"""
         
@@ -481,14 +832,8 @@ class GraphProtocolService:
         for i in range(0, len(addresses), batch_size):
             batch = addresses[i:i + batch_size]
             
-            # Fetch data for each address in the batch
-            batch_tasks = []
-            for address in batch:
-                task = self.get_address_transactions(address, limit=500)
-                batch_tasks.append(task)
-            
-            # Execute batch
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
+            # One aliased query per batch instead of one request per address
+            batch_results = await self._fetch_transfers_batch(batch)
             
             # Process results
             for address, transactions in zip(batch, batch_results):
@@ -503,8 +848,5 @@ class GraphProtocolService:
                 all_data['addresses'].update(processed['addresses'])
                 all_data['transactions'].extend(processed['transactions'])
                 all_data['relationships'].extend(processed['relationships'])
-            
-            # Rate limiting - wait between batches
-            await asyncio.sleep(1)
         
         return all_data 
\ No newline at end of file
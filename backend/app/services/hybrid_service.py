@@ -3,15 +3,30 @@ Sentinel Hybrid Service - Combines API and RPC for comprehensive data
 Uses best of both worlds: API for detailed data + RPC for real-time/multi-chain
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from .etherscan_service import EtherscanService
 from .rpc_service import RPCService
-from ..utils.helpers import is_valid_ethereum_address
+from ..utils.helpers import is_valid_ethereum_address, run_blocking
 
 logger = logging.getLogger(__name__)
 
+# Data source probes are cached across instances (one is built per request),
+# keyed by Etherscan API key since the reported status depends on it
+STATUS_CACHE_TTL = 30.0
+PROBE_TIMEOUT = 2.0
+_status_cache: Dict[str, Tuple[float, Dict]] = {}
+_status_cache_lock = threading.Lock()
+
+# Monotonic time of the last successful real Etherscan request per API key; a
+# recent one stands in for the synthetic status probe for that key
+RECENT_SUCCESS_WINDOW = 10.0
+_last_success: Dict[str, float] = {}
+
 class HybridService:
     """
     Hybrid service that intelligently combines API and RPC data sources
@@ -24,7 +39,7 @@ class HybridService:
         self.rpc_service = RPCService()
         self.logger = logging.getLogger(__name__)
         
-    def analyze_wallet_comprehensive(self, address: str, chain: str = 'ethereum', prefer_source: str = 'hybrid') -> Dict:
+    async def analyze_wallet_comprehensive(self, address: str, chain: str = 'ethereum', prefer_source: str = 'hybrid') -> Dict:
         """
         Comprehensive wallet analysis using both API and RPC
         
@@ -48,18 +63,23 @@ class HybridService:
             'analysis_mode': prefer_source
         }
         
-        # Get RPC data (always available, real-time)
-        rpc_data = self._get_rpc_data(address, chain)
+        # RPC data (always available, real-time) and API data (detailed but may fail)
+        # are independent, so fetch them concurrently. Etherscan only supports Ethereum.
+        if chain.lower() == 'ethereum':
+            rpc_data, api_data = await asyncio.gather(
+                self._get_rpc_data(address, chain),
+                self._get_api_data(address)
+            )
+        else:
+            rpc_data = await self._get_rpc_data(address, chain)
+            api_data = None
+        
         analysis_result['rpc_data'] = rpc_data
         analysis_result['data_sources_used'].append('RPC')
         
-        # Get API data (detailed but may fail)
-        api_data = None
-        if chain.lower() == 'ethereum':  # Etherscan only supports Ethereum
-            api_data = self._get_api_data(address)
-            if api_data and not api_data.get('error'):
-                analysis_result['api_data'] = api_data
-                analysis_result['data_sources_used'].append('Etherscan API')
+        if api_data and not api_data.get('error'):
+            analysis_result['api_data'] = api_data
+            analysis_result['data_sources_used'].append('Etherscan API')
         
         # Combine data intelligently
         combined_analysis = self._combine_data_sources(rpc_data, api_data, prefer_source)
@@ -67,10 +87,10 @@ class HybridService:
         
         return analysis_result
     
-    def _get_rpc_data(self, address: str, chain: str) -> Dict:
+    async def _get_rpc_data(self, address: str, chain: str) -> Dict:
         """Get data from RPC endpoints"""
         try:
-            balance_data = self.rpc_service.get_balance(address, chain)
+            balance_data = await run_blocking(self.rpc_service.get_balance, address, chain)
             return {
                 'success': True,
                 'balance': balance_data,
@@ -84,11 +104,14 @@ class HybridService:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _get_api_data(self, address: str) -> Optional[Dict]:
+    async def _get_api_data(self, address: str) -> Optional[Dict]:
         """Get data from Etherscan API"""
         try:
-            balance_data = self.etherscan_service.get_balance(address)
-            transaction_data = self.etherscan_service.get_transactions(address, limit=50)
+            balance_data, transaction_data = await asyncio.gather(
+                run_blocking(self.etherscan_service.get_balance, address),
+                run_blocking(self.etherscan_service.get_transactions, address, limit=50)
+            )
+            _last_success[self.etherscan_service.api_key] = time.monotonic()
             
             return {
                 'success': True,
@@ -142,41 +165,78 @@ class HybridService:
         
         return combined
     
-    def get_data_source_status(self) -> Dict:
+    async def get_data_source_status(self) -> Dict:
         """Check status of all data sources"""
         
+        cache_key = self.etherscan_service.api_key
+        with _status_cache_lock:
+            cached = _status_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+            return dict(cached[1])
+        
+        rpc_status, api_status = await asyncio.gather(self._probe_rpc(), self._probe_api())
         status = {
             'timestamp': datetime.now().isoformat(),
-            'sources': {}
+            'sources': {
+                'rpc': rpc_status,
+                'etherscan_api': api_status
+            }
         }
         
-        # Test RPC
+        with _status_cache_lock:
+            _status_cache[cache_key] = (time.monotonic(), status)
+        return dict(status)
+    
+    async def _probe_rpc(self) -> Dict:
+        """Test RPC availability"""
         try:
-            chains = self.rpc_service.get_available_chains()
-            status['sources']['rpc'] = {
+            chains = await asyncio.wait_for(
+                run_blocking(self.rpc_service.get_available_chains), PROBE_TIMEOUT
+            )
+            return {
                 'status': 'available',
                 'chains': len(chains.get('chains', [])),
                 'details': chains
             }
+        except asyncio.TimeoutError:
+            return {
+                'status': 'error',
+                'error': f'RPC probe timed out after {PROBE_TIMEOUT}s'
+            }
         except Exception as e:
-            status['sources']['rpc'] = {
+            return {
                 'status': 'error',
                 'error': str(e)
             }
+    
+    async def _probe_api(self) -> Dict:
+        """Test Etherscan API availability"""
+        api_key_configured = bool(self.etherscan_service.api_key != 'YourApiKeyToken')
+        if time.monotonic() - _last_success.get(self.etherscan_service.api_key, float('-inf')) < RECENT_SUCCESS_WINDOW:
+            return {
+                'status': 'available',
+                'api_key_configured': api_key_configured
+            }
         
-        # Test API
         try:
             # Test with a known address
-            test_result = self.etherscan_service.get_balance('0x742d35Cc6634C0532925a3b8D09f5f56F8c4C0e5')
-            status['sources']['etherscan_api'] = {
+            await asyncio.wait_for(
+                run_blocking(self.etherscan_service.get_balance, '0x742d35Cc6634C0532925a3b8D09f5f56F8c4C0e5'),
+                PROBE_TIMEOUT
+            )
+            return {
                 'status': 'available',
-                'api_key_configured': bool(self.etherscan_service.api_key != 'YourApiKeyToken')
+                'api_key_configured': api_key_configured
+            }
+        except asyncio.TimeoutError:
+            return {
+                'status': 'error',
+                'error': f'Etherscan probe timed out after {PROBE_TIMEOUT}s',
+                'api_key_configured': api_key_configured
             }
         except Exception as e:
-            status['sources']['etherscan_api'] = {
+            return {
                 'status': 'error',
                 'error': str(e),
-                'api_key_configured': bool(self.etherscan_service.api_key != 'YourApiKeyToken')
+                'api_key_configured': api_key_configured
             }
-        
-        return status 
\ No newline at end of file
@@ -3,18 +3,55 @@ Sentinel Multi-chain Service - Support for Multiple Blockchain Networks
 Extends Sentinel's capabilities beyond Ethereum to support Solana, Arbitrum, and other chains
 """
 
+import os
 import logging
 import asyncio
+import threading
+import time
+import concurrent.futures
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Mapping, Optional, Any, Union, Tuple
 from enum import Enum
-from dataclasses import dataclass
-import requests
+from collections import OrderedDict
+from functools import lru_cache
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+import aiohttp
 import base64
-import base58
+import numpy as np
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_dumps = lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+    _json_loads = json.loads
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    RedisError = OSError
+    REDIS_AVAILABLE = False
+
+from ..utils.helpers import in_shared_loop, on_async_shutdown, run_async
+from ._chain_validators import is_ethereum_address, is_solana_address, is_bitcoin_address
 
 logger = logging.getLogger(__name__)
 
+# Pre-encoded balance + nonce batch for EVM chains; only the (hex-validated)
+# address bytes are interpolated per request
+_EVM_BATCH_TEMPLATE = (
+    b'[{"jsonrpc":"2.0","id":0,"method":"eth_getBalance","params":["%s","latest"]},'
+    b'{"jsonrpc":"2.0","id":1,"method":"eth_getTransactionCount","params":["%s","latest"]}]'
+)
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
 class ChainType(Enum):
     ETHEREUM = "ethereum"
     BITCOIN = "bitcoin"
@@ -25,7 +62,53 @@ class ChainType(Enum):
     BSC = "bsc"
     OPTIMISM = "optimism"
 
-@dataclass
+# Chains an EVM-format address may belong to, and the chain families
+# weighted by calculate_cross_chain_risk
+_EVM_CHAINS = (
+    ChainType.ETHEREUM,
+    ChainType.ARBITRUM,
+    ChainType.POLYGON,
+    ChainType.BSC,
+    ChainType.AVALANCHE
+)
+_PRIVACY_CHAINS = frozenset({ChainType.SOLANA})
+_L2_CHAINS = frozenset({ChainType.ARBITRUM, ChainType.POLYGON})
+_CHAIN_VALUE = {chain: chain.value for chain in ChainType}
+
+# Column of each chain in the (N, len(ChainType)) activity masks used for batch scoring
+CHAIN_INDEX = {chain: i for i, chain in enumerate(ChainType)}
+CHAIN_BY_INDEX = tuple(ChainType)
+_PRIVACY_COLUMNS = [CHAIN_INDEX[chain] for chain in _PRIVACY_CHAINS]
+_L2_COLUMNS = [CHAIN_INDEX[chain] for chain in _L2_CHAINS]
+_EVM_COLUMNS = [CHAIN_INDEX[chain] for chain in _EVM_CHAINS]
+
+# Score ladders shared by the scalar (bisect) and batch (np.digitize) scorers:
+# chain count steps are inclusive (>=), transaction volume steps exclusive (>)
+_CHAIN_COUNT_STEPS = (3, 5)
+_CHAIN_COUNT_POINTS = (0, 10, 20)
+_CHAIN_COUNT_FACTORS = (None, "Active on 3+ blockchain networks", "Active on 5+ blockchain networks")
+_TX_VOLUME_STEPS = (1000, 10000)
+_TX_VOLUME_POINTS = (0, 15, 25)
+_TX_VOLUME_FACTORS = (None, "High cross-chain transaction volume", "Very high cross-chain transaction volume")
+_RISK_LEVEL_STEPS = (15, 30, 50, 70)
+_RISK_LEVEL_NAMES = ("MINIMAL", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+_RISK_LEVEL_LABELS = np.array(_RISK_LEVEL_NAMES)
+
+# (epoch second, ISO string) - risk assessments are stamped at one-second resolution
+_iso_second = (0, '')
+
+def _iso_now() -> str:
+    """Local ISO timestamp truncated to the second, formatted at most once per second"""
+    global _iso_second
+    second = int(time.time())
+    cached_second, stamp = _iso_second
+    if second != cached_second:
+        stamp = datetime.fromtimestamp(second).isoformat()
+        # Tuple swap keeps the pair consistent without a lock
+        _iso_second = (second, stamp)
+    return stamp
+
+@dataclass(frozen=True)
 class ChainConfig:
     """Configuration for blockchain networks"""
     name: str
@@ -36,8 +119,138 @@ class ChainConfig:
     api_key: Optional[str] = None
     native_token: str = "ETH"
     decimals: int = 18
+    batch_supported: bool = True  # Provider accepts JSON-RPC batch (array) requests
+    cache_ttl: int = 5  # Seconds a fetched balance/activity pair stays in Redis, about one block
+    rps_limit: int = 10  # Sustained requests per second allowed by the provider
+    burst: int = 10  # Requests that may go out back-to-back before pacing kicks in
+    live: bool = False  # Query rpc_url for real data; set once an RPC URL or API key is configured
+
+# Key segment of provider URLs that carry the API key in the path
+_API_KEY_PLACEHOLDER = 'your-api-key'
 
-@dataclass
+# Supported chains, built once at import
+_DEFAULT_CHAIN_CONFIGS: Mapping[ChainType, ChainConfig] = MappingProxyType({
+    ChainType.ETHEREUM: ChainConfig(
+        name="Ethereum",
+        chain_type=ChainType.ETHEREUM,
+        rpc_url="https://eth-mainnet.alchemyapi.io/v2/your-api-key",
+        explorer_api_url="https://api.etherscan.io/api",
+        api_key_required=True,
+        native_token="ETH",
+        decimals=18,
+        cache_ttl=15,
+        rps_limit=25,
+        burst=25
+    ),
+    ChainType.ARBITRUM: ChainConfig(
+        name="Arbitrum One",
+        chain_type=ChainType.ARBITRUM,
+        rpc_url="https://arb1.arbitrum.io/rpc",
+        explorer_api_url="https://api.arbiscan.io/api",
+        api_key_required=True,
+        native_token="ETH",
+        decimals=18
+    ),
+    ChainType.POLYGON: ChainConfig(
+        name="Polygon",
+        chain_type=ChainType.POLYGON,
+        rpc_url="https://polygon-rpc.com",
+        explorer_api_url="https://api.polygonscan.com/api",
+        api_key_required=True,
+        native_token="MATIC",
+        decimals=18
+    ),
+    ChainType.BSC: ChainConfig(
+        name="Binance Smart Chain",
+        chain_type=ChainType.BSC,
+        rpc_url="https://bsc-dataseed.binance.org",
+        explorer_api_url="https://api.bscscan.com/api",
+        api_key_required=True,
+        native_token="BNB",
+        decimals=18
+    ),
+    ChainType.AVALANCHE: ChainConfig(
+        name="Avalanche C-Chain",
+        chain_type=ChainType.AVALANCHE,
+        rpc_url="https://api.avax.network/ext/bc/C/rpc",
+        explorer_api_url="https://api.snowtrace.io/api",
+        api_key_required=True,
+        native_token="AVAX",
+        decimals=18
+    ),
+    ChainType.SOLANA: ChainConfig(
+        name="Solana",
+        chain_type=ChainType.SOLANA,
+        rpc_url="https://api.mainnet-beta.solana.com",
+        explorer_api_url="https://public-api.solscan.io",
+        api_key_required=False,
+        native_token="SOL",
+        decimals=9,
+        cache_ttl=2,
+        rps_limit=4,
+        burst=10
+    )
+})
+
+class _ProviderLimiter:
+    """Token bucket for one RPC provider, with AIMD adjustment of its rate.
+    
+    A 429 halves the rate (down to 1 rps) and holds all callers until the
+    provider's Retry-After has passed; after that the rate climbs back by one
+    request per second every `increase_interval` seconds of successful calls.
+    Slots are reserved under a thread lock and waited for with asyncio.sleep,
+    so the limiter works across the event loops of concurrent requests.
+    """
+    
+    def __init__(self, rate: int, burst: int, increase_interval: float = 30.0):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = burst
+        self.increase_interval = increase_interval
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._adjusted = self._updated
+        self._lock = threading.Lock()
+    
+    async def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                delay += -self._tokens / self.rate
+        
+        if delay:
+            await asyncio.sleep(delay)
+    
+    def throttled(self, retry_after: float):
+        with self._lock:
+            now = time.monotonic()
+            self.rate = max(1.0, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._adjusted = now
+    
+    def succeeded(self):
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now - self._adjusted >= self.increase_interval:
+                self.rate = min(self.max_rate, self.rate + 1)
+                self._adjusted = now
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Delay from a Retry-After header given in seconds; HTTP-date values are ignored"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+@dataclass(slots=True, frozen=True)
 class MultiChainTransaction:
     """Standardized transaction data across chains"""
     hash: str
@@ -52,7 +265,7 @@ class MultiChainTransaction:
     token_transfers: List[Dict[str, Any]] = None
     method: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MultiChainAddress:
     """Standardized address data across chains"""
     address: str
@@ -73,103 +286,89 @@ class MultiChainService:
     def __init__(self):
         self.chains = self._initialize_chain_configs()
         self.clients = {}
+        
+        # Chain listing is static after init; built once and shared by every caller
+        self._supported_chains = tuple(
+            {
+                'chain_type': chain_type.value,
+                'name': config.name,
+                'native_token': config.native_token,
+                'available': True
+            }
+            for chain_type, config in self.chains.items()
+        )
         self._initialize_clients()
+        
+        # Address format never changes, so chain detection is memoized per address
+        self._detect_address_chain_cached = lru_cache(maxsize=131072)(self._detect_address_chain)
+        
+        # Short-lived cache of per-chain analyses keyed by (address, chains)
+        self.analysis_cache_ttl = 300.0
+        self.analysis_cache_size = 10000
+        self._analysis_cache: OrderedDict = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+        
+        # Live per-chain fetches: connection cap per provider host, per-request
+        # timeout, and attempts for throttled (429) or failing (5xx) providers
+        self.connections_per_host = 64
+        self.request_timeout = 10.0
+        self.max_rpc_attempts = 3
+        self.max_retry_after = 10.0
+        
+        # Per-provider pacing, keyed by RPC URL and sized from each chain's published limits
+        self._limiters = {
+            config.rpc_url: _ProviderLimiter(config.rps_limit, config.burst)
+            for config in self.chains.values()
+        }
+        
+        # Shared Redis cache for per-chain fetches, plus in-flight fetches by cache
+        # key so concurrent requests for the same address wait on one provider call
+        self.redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self.redis_retry_interval = 30.0
+        self._redis_retry_at = 0.0
+        self._redis_lock = threading.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._redis = None
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
     
     def _initialize_chain_configs(self) -> Dict[ChainType, ChainConfig]:
         """Initialize configuration for supported chains"""
         
-        return {
-            ChainType.ETHEREUM: ChainConfig(
-                name="Ethereum",
-                chain_type=ChainType.ETHEREUM,
-                rpc_url="https://eth-mainnet.alchemyapi.io/v2/your-api-key",
-                explorer_api_url="https://api.etherscan.io/api",
-                api_key_required=True,
-                native_token="ETH",
-                decimals=18
-            ),
-            ChainType.ARBITRUM: ChainConfig(
-                name="Arbitrum One",
-                chain_type=ChainType.ARBITRUM,
-                rpc_url="https://arb1.arbitrum.io/rpc",
-                explorer_api_url="https://api.arbiscan.io/api",
-                api_key_required=True,
-                native_token="ETH",
-                decimals=18
-            ),
-            ChainType.POLYGON: ChainConfig(
-                name="Polygon",
-                chain_type=ChainType.POLYGON,
-                rpc_url="https://polygon-rpc.com",
-                explorer_api_url="https://api.polygonscan.com/api",
-                api_key_required=True,
-                native_token="MATIC",
-                decimals=18
-            ),
-            ChainType.BSC: ChainConfig(
-                name="Binance Smart Chain",
-                chain_type=ChainType.BSC,
-                rpc_url="https://bsc-dataseed.binance.org",
-                explorer_api_url="https://api.bscscan.com/api",
-                api_key_required=True,
-                native_token="BNB",
-                decimals=18
-            ),
-            ChainType.AVALANCHE: ChainConfig(
-                name="Avalanche C-Chain",
-                chain_type=ChainType.AVALANCHE,
-                rpc_url="https://api.avax.network/ext/bc/C/rpc",
-                explorer_api_url="https://api.snowtrace.io/api",
-                api_key_required=True,
-                native_token="AVAX",
-                decimals=18
-            ),
-            ChainType.SOLANA: ChainConfig(
-                name="Solana",
-                chain_type=ChainType.SOLANA,
-                rpc_url="https://api.mainnet-beta.solana.com",
-                explorer_api_url="https://public-api.solscan.io",
-                api_key_required=False,
-                native_token="SOL",
-                decimals=9
-            )
-        }
+        # Configs are frozen, so the per-instance dict can share them; update_api_key
+        # swaps in a modified copy instead of mutating the shared default.
+        # Chains stay on demo records until <CHAIN>_RPC_URL points them at a provider.
+        chains = dict(_DEFAULT_CHAIN_CONFIGS)
+        for chain_type, config in chains.items():
+            rpc_url = os.getenv(f'{chain_type.name}_RPC_URL')
+            if rpc_url:
+                chains[chain_type] = replace(config, rpc_url=rpc_url, live=True)
+        return chains
     
     def _initialize_clients(self):
         """Initialize blockchain clients"""
         
-        # Initialize basic HTTP clients for now
-        # In production, would use proper blockchain clients
+        # Live RPC reads go through the pooled aiohttp session opened on the
+        # shared service loop (see _shared_clients); explorer APIs are not called yet
         pass
     
     def get_supported_chains(self) -> List[Dict[str, Any]]:
-        """Get list of supported blockchain networks"""
+        """Get list of supported blockchain networks (entries are shared - do not mutate)"""
         
-        supported = []
-        for chain_type, config in self.chains.items():
-            supported.append({
-                'chain_type': chain_type.value,
-                'name': config.name,
-                'native_token': config.native_token,
-                'available': True
-            })
-        
-        return supported
+        return list(self._supported_chains)
     
     def detect_address_chain(self, address: str) -> List[ChainType]:
         """Detect which blockchain networks an address could belong to"""
+        return list(self._detect_address_chain_cached(address))
+    
+    def _detect_address_chain(self, address: str) -> Tuple[ChainType, ...]:
+        """Uncached chain detection; returns a tuple so results can be shared"""
         
         possible_chains = []
         
         # Ethereum-like addresses (EVM chains)
         if self._is_ethereum_address(address):
-            possible_chains.extend([
-                ChainType.ETHEREUM,
-                ChainType.ARBITRUM,
-                ChainType.POLYGON,
-                ChainType.BSC,
-                ChainType.AVALANCHE
-            ])
+            possible_chains.extend(_EVM_CHAINS)
         
         # Solana addresses
         if self._is_solana_address(address):
@@ -179,34 +378,41 @@ class MultiChainService:
         if self._is_bitcoin_address(address):
             possible_chains.append(ChainType.BITCOIN)
         
-        return possible_chains
+        return tuple(possible_chains)
     
-    def _is_ethereum_address(self, address: str) -> bool:
-        """Check if address is valid Ethereum format"""
-        return (len(address) == 42 and 
-                address.startswith('0x') and 
-                all(c in '0123456789abcdefABCDEF' for c in address[2:]))
-    
-    def _is_solana_address(self, address: str) -> bool:
-        """Check if address is valid Solana format"""
-        try:
-            if len(address) < 32 or len(address) > 44:
-                return False
-            # Try to decode as base58
-            decoded = base58.b58decode(address)
-            return len(decoded) == 32
-        except:
-            return False
+    def detect_address_chain_batch(self, addresses: List[str]) -> np.ndarray:
+        """
+        detect_address_chain over many addresses, as an activity mask
+        
+        Returns:
+            uint8 array of shape (N, len(ChainType)), columns ordered by CHAIN_INDEX,
+            ready to pass as chain_mask to calculate_cross_chain_risk_batch
+        """
+        
+        mask = np.zeros((len(addresses), len(CHAIN_INDEX)), dtype=np.uint8)
+        # Same validator as detect_address_chain, so single and batch checks agree
+        evm = np.fromiter(map(is_ethereum_address, addresses), dtype=bool, count=len(addresses))
+        mask[np.ix_(evm, _EVM_COLUMNS)] = 1
+        
+        # 0x-hex addresses cannot be base58/bech32, so only the remaining rows
+        # go through the Solana and Bitcoin checks
+        solana_column = CHAIN_INDEX[ChainType.SOLANA]
+        bitcoin_column = CHAIN_INDEX[ChainType.BITCOIN]
+        for i in np.flatnonzero(~evm):
+            address = addresses[i]
+            if is_solana_address(address):
+                mask[i, solana_column] = 1
+            if is_bitcoin_address(address):
+                mask[i, bitcoin_column] = 1
+        return mask
     
-    def _is_bitcoin_address(self, address: str) -> bool:
-        """Check if address is valid Bitcoin format"""
-        # Simplified Bitcoin address validation
-        return (address.startswith('1') or 
-                address.startswith('3') or 
-                address.startswith('bc1'))
+    # Format checks live in _chain_validators so they can be compiled with mypyc
+    _is_ethereum_address = staticmethod(is_ethereum_address)
+    _is_solana_address = staticmethod(is_solana_address)
+    _is_bitcoin_address = staticmethod(is_bitcoin_address)
     
-    def analyze_address_multichain(self, address: str, 
-                                 chains: Optional[List[ChainType]] = None) -> Dict[ChainType, MultiChainAddress]:
+    async def analyze_address_multichain(self, address: str, 
+                                         chains: Optional[List[ChainType]] = None) -> Dict[ChainType, MultiChainAddress]:
         """
         Analyze an address across multiple blockchain networks
         
@@ -221,30 +427,278 @@ class MultiChainService:
         if chains is None:
             chains = self.detect_address_chain(address)
         
-        results = {}
+        cache_key = (address, tuple(chains))
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._analysis_cache.move_to_end(cache_key)
+                return dict(cached[1])
+        
+        chains = [chain for chain in chains if chain in self.chains]
+        live_chains = [chain for chain in chains if self.chains[chain].live]
         
-        # For demo, return basic analysis for detected chains
-        for chain in chains:
-            if chain in self.chains:
+        results = {chain: self._address_record(address, chain, 0, 0) for chain in chains}
+        cacheable = True
+        if live_chains:
+            # Query every configured chain concurrently over the pooled session
+            if in_shared_loop():
+                session, cache = self._shared_clients()
+                fetched = await self._fetch_chains(session, cache, address, live_chains)
+            else:
+                # Awaited from another loop: its clients cannot outlive this call
+                cache = self._new_redis() if self._redis_usable() else None
                 try:
-                    # Basic mock analysis - in production would call actual APIs
-                    address_data = MultiChainAddress(
-                        address=address,
-                        chain=chain,
-                        balance="0.0",
-                        balance_usd=0.0,
-                        transaction_count=0,
-                        first_seen=None,
-                        last_activity=None,
-                        tokens=[]
-                    )
-                    results[chain] = address_data
-                except Exception as e:
-                    logger.error(f"Error analyzing {address} on {chain.value}: {str(e)}")
+                    async with self._new_session() as session:
+                        fetched = await self._fetch_chains(session, cache, address, live_chains)
+                finally:
+                    if cache is not None:
+                        await cache.aclose()
+            
+            for chain, outcome in zip(live_chains, fetched):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error analyzing {address} on {chain.value}: {str(outcome)}")
+                    del results[chain]
+                    cacheable = False
                     continue
+                results[chain], live = outcome
+                cacheable = cacheable and live
+        
+        # Fallback records stand in for an unreachable provider and are not cached,
+        # so the next request tries the provider again
+        if cacheable:
+            with self._analysis_cache_lock:
+                self._analysis_cache[cache_key] = (time.monotonic() + self.analysis_cache_ttl, results)
+                self._analysis_cache.move_to_end(cache_key)
+                if len(self._analysis_cache) > self.analysis_cache_size:
+                    self._analysis_cache.popitem(last=False)
         
+        return dict(results)
+    
+    def analyze_address_multichain_sync(self, address: str, 
+                                        chains: Optional[List[ChainType]] = None) -> Dict[ChainType, MultiChainAddress]:
+        """Blocking wrapper around analyze_address_multichain for sync callers"""
+        return run_async(self.analyze_address_multichain(address, chains))
+    
+    async def _fetch_chains(self, session: aiohttp.ClientSession, cache, address: str,
+                            chains: List[ChainType]) -> List[Any]:
+        return await asyncio.gather(
+            *(self._fetch_chain(session, cache, address, chain) for chain in chains),
+            return_exceptions=True
+        )
+    
+    def _shared_clients(self):
+        """aiohttp session and Redis client (None while unusable) kept open on the shared service loop"""
+        
+        # Only the shared loop's own thread gets here, so check-then-create cannot race
+        if self._session is None:
+            self._session = self._new_session()
+            self._redis = self._new_redis()
+            on_async_shutdown(self._close_clients)
+        return self._session, self._redis if self._redis_usable() else None
+    
+    async def _close_clients(self):
+        await self._session.close()
+        if self._redis is not None:
+            await self._redis.aclose()
+    
+    def _new_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit_per_host=self.connections_per_host)
+        return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.request_timeout))
+    
+    def _new_redis(self):
+        if not REDIS_AVAILABLE:
+            return None
+        return aioredis.from_url(self.redis_url, socket_connect_timeout=0.25, socket_timeout=0.25)
+    
+    def _redis_usable(self) -> bool:
+        """False while Redis is missing or was unreachable within the retry interval"""
+        if not REDIS_AVAILABLE:
+            return False
+        with self._redis_lock:
+            return time.monotonic() >= self._redis_retry_at
+    
+    def _redis_failed(self, e: Exception):
+        logger.warning(f"Redis cache unavailable, bypassing for {self.redis_retry_interval:.0f}s: {str(e)}")
+        with self._redis_lock:
+            self._redis_retry_at = time.monotonic() + self.redis_retry_interval
+    
+    async def _fetch_chain(self, session: aiohttp.ClientSession, cache, address: str,
+                           chain: ChainType) -> Tuple[MultiChainAddress, bool]:
+        """Fetch balance and activity for an address on one chain
+        
+        Returns the record and whether it holds live data (False for the empty fallback)
+        """
+        
+        config = self.chains[chain]
+        try:
+            balance_raw, transaction_count = await self._fetch_chain_cached(session, cache, config, address)
+        except Exception as e:
+            # Provider unreachable or rejected the call - fall back to an empty record for demo
+            logger.warning(f"Live data unavailable for {address} on {chain.value}, using empty record: {str(e)}")
+            return self._address_record(address, chain, 0, 0), False
+        
+        return self._address_record(address, chain, balance_raw, transaction_count), True
+    
+    def _address_record(self, address: str, chain: ChainType, balance_raw: int,
+                        transaction_count: int) -> MultiChainAddress:
+        return MultiChainAddress(
+            address=address,
+            chain=chain,
+            balance=str(balance_raw / 10 ** self.chains[chain].decimals),
+            balance_usd=0.0,
+            transaction_count=transaction_count,
+            first_seen=None,
+            last_activity=None,
+            tokens=[]
+        )
+    
+    async def _fetch_chain_cached(self, session: aiohttp.ClientSession, cache, config: ChainConfig,
+                                  address: str) -> Tuple[int, int]:
+        """(raw balance, transaction count) from Redis, an identical in-flight fetch, or the provider"""
+        
+        key = f"sentinel:chain:{config.chain_type.value}:{address}"
+        
+        if cache is not None:
+            try:
+                hit = await cache.get(key)
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+                cache = hit = None
+            if hit is not None:
+                # Stored as "balance,count"; wei balances overflow 64-bit JSON integers
+                balance_raw, transaction_count = hit.split(b',')
+                return int(balance_raw), int(transaction_count)
+        
+        # Single-flight: later callers wait on the first caller's fetch. A
+        # concurrent future can be awaited from any request's event loop.
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = concurrent.futures.Future()
+        if not leader:
+            return await asyncio.wrap_future(pending)
+        
+        try:
+            if config.chain_type == ChainType.SOLANA:
+                value = await self._fetch_solana(session, config, address)
+            else:
+                value = await self._fetch_evm(session, config, address)
+            pending.set_result(value)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        
+        if cache is not None:
+            try:
+                await cache.setex(key, config.cache_ttl, b'%d,%d' % value)
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+        return value
+    
+    async def _fetch_evm(self, session: aiohttp.ClientSession, config: ChainConfig, address: str) -> Tuple[int, int]:
+        """Native balance (wei) and nonce for an EVM address"""
+        
+        calls = [
+            ('eth_getBalance', [address, 'latest']),
+            ('eth_getTransactionCount', [address, 'latest'])
+        ]
+        if config.batch_supported and self._is_ethereum_address(address):
+            raw = address.encode('ascii')
+            balance_hex, nonce_hex = await self._rpc_batch(
+                session, config.rpc_url, calls, body=_EVM_BATCH_TEMPLATE % (raw, raw)
+            )
+        else:
+            balance_hex, nonce_hex = await self._rpc_calls(session, config, calls)
+        return int(balance_hex, 16), int(nonce_hex, 16)
+    
+    async def _fetch_solana(self, session: aiohttp.ClientSession, config: ChainConfig, address: str) -> Tuple[int, int]:
+        """Balance (lamports) and recent signature count for a Solana address"""
+        
+        balance, signatures = await self._rpc_calls(session, config, [
+            ('getBalance', [address]),
+            ('getSignaturesForAddress', [address, {'limit': 1000}])
+        ])
+        return int(balance['value']), len(signatures)
+    
+    async def _rpc_calls(self, session: aiohttp.ClientSession, config: ChainConfig,
+                         calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """Run several calls against a chain's RPC, batched into one request when the provider allows it"""
+        
+        if config.batch_supported:
+            return await self._rpc_batch(session, config.rpc_url, calls)
+        
+        return await asyncio.gather(*(
+            self._rpc_call(session, config.rpc_url, method, params) for method, params in calls
+        ))
+    
+    async def _rpc_batch(self, session: aiohttp.ClientSession, rpc_url: str,
+                         calls: List[Tuple[str, List[Any]]], body: Optional[bytes] = None) -> List[Any]:
+        """JSON-RPC batch request; results are returned in the order of calls
+        
+        body may carry the already-encoded request, with ids 0..len(calls)-1
+        """
+        
+        if body is None:
+            body = _json_dumps([
+                {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+                for i, (method, params) in enumerate(calls)
+            ])
+        data = await self._post_json(session, rpc_url, body)
+        
+        if not isinstance(data, list):
+            # Providers without batch support answer with a single error object
+            raise Exception(f"RPC batch rejected: {data.get('error', data) if isinstance(data, dict) else data}")
+        
+        # Batch responses may come back in any order
+        by_id = {item.get('id'): item for item in data}
+        results = []
+        for i in range(len(calls)):
+            item = by_id.get(i)
+            if item is None or 'error' in item:
+                raise Exception(f"RPC Error: {item.get('error') if item else 'missing response'}")
+            results.append(item.get('result'))
         return results
     
+    async def _rpc_call(self, session: aiohttp.ClientSession, rpc_url: str, method: str, params: List[Any]) -> Any:
+        """Single JSON-RPC call"""
+        
+        body = _json_dumps({'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params})
+        data = await self._post_json(session, rpc_url, body)
+        if 'error' in data:
+            raise Exception(f"RPC Error: {data['error']}")
+        return data.get('result')
+    
+    async def _post_json(self, session: aiohttp.ClientSession, rpc_url: str, body: bytes) -> Any:
+        """POST an encoded JSON-RPC body, paced by the provider's limiter
+        
+        429/5xx responses are retried after the provider's Retry-After, or with
+        exponential backoff when it sends none; a 429 also slows the limiter.
+        """
+        
+        limiter = self._limiters.get(rpc_url)
+        for attempt in range(self.max_rpc_attempts):
+            if limiter is not None:
+                await limiter.acquire()
+            async with session.post(rpc_url, data=body, headers=_JSON_HEADERS) as response:
+                if response.status == 429 or response.status >= 500:
+                    delay = _retry_after_seconds(response.headers.get('Retry-After'))
+                    if delay is None:
+                        delay = min(8.0, 0.5 * 2 ** attempt)
+                    delay = min(delay, self.max_retry_after)
+                    if response.status == 429 and limiter is not None:
+                        limiter.throttled(delay)
+                    if attempt < self.max_rpc_attempts - 1:
+                        await asyncio.sleep(delay)
+                        continue
+                response.raise_for_status()
+                if limiter is not None:
+                    limiter.succeeded()
+                return _json_loads(await response.read())
+    
     def calculate_cross_chain_risk(self, multichain_data: Dict[ChainType, MultiChainAddress]) -> Dict[str, Any]:
         """
         Calculate risk score considering cross-chain activity patterns
@@ -263,31 +717,29 @@ class MultiChainService:
         total_chains = len(multichain_data)
         total_balance_usd = 0
         total_transactions = 0
+        chains_active = []
         
         for chain, address_data in multichain_data.items():
+            chains_active.append(_CHAIN_VALUE[chain])
             total_transactions += address_data.transaction_count
             if address_data.balance_usd:
                 total_balance_usd += address_data.balance_usd
         
         # Multi-chain presence risk factors
-        if total_chains >= 5:
-            risk_factors.append("Active on 5+ blockchain networks")
-            risk_score += 20
-        elif total_chains >= 3:
-            risk_factors.append("Active on 3+ blockchain networks")
-            risk_score += 10
+        step = bisect_right(_CHAIN_COUNT_STEPS, total_chains)
+        if step:
+            risk_factors.append(_CHAIN_COUNT_FACTORS[step])
+            risk_score += _CHAIN_COUNT_POINTS[step]
         
         # High activity across chains
-        if total_transactions > 10000:
-            risk_factors.append("Very high cross-chain transaction volume")
-            risk_score += 25
-        elif total_transactions > 1000:
-            risk_factors.append("High cross-chain transaction volume")
-            risk_score += 15
+        step = bisect_left(_TX_VOLUME_STEPS, total_transactions)
+        if step:
+            risk_factors.append(_TX_VOLUME_FACTORS[step])
+            risk_score += _TX_VOLUME_POINTS[step]
         
         # Chain diversity patterns
-        has_privacy_chains = any(chain in [ChainType.SOLANA] for chain in multichain_data.keys())
-        has_layer2 = any(chain in [ChainType.ARBITRUM, ChainType.POLYGON] for chain in multichain_data.keys())
+        has_privacy_chains = not multichain_data.keys().isdisjoint(_PRIVACY_CHAINS)
+        has_layer2 = not multichain_data.keys().isdisjoint(_L2_CHAINS)
         
         if has_privacy_chains:
             risk_factors.append("Activity on privacy-focused chains")
@@ -298,16 +750,7 @@ class MultiChainService:
             risk_score += 5
         
         # Determine risk level
-        if risk_score >= 70:
-            risk_level = "CRITICAL"
-        elif risk_score >= 50:
-            risk_level = "HIGH"
-        elif risk_score >= 30:
-            risk_level = "MEDIUM"
-        elif risk_score >= 15:
-            risk_level = "LOW"
-        else:
-            risk_level = "MINIMAL"
+        risk_level = _RISK_LEVEL_NAMES[bisect_right(_RISK_LEVEL_STEPS, risk_score)]
         
         return {
             'cross_chain_risk_score': min(100, risk_score),
@@ -317,9 +760,46 @@ class MultiChainService:
                 'total_chains': total_chains,
                 'total_transactions': total_transactions,
                 'total_balance_usd': total_balance_usd,
-                'chains_active': [chain.value for chain in multichain_data.keys()]
+                'chains_active': chains_active
             },
-            'analysis_timestamp': datetime.now().isoformat()
+            'analysis_timestamp': _iso_now()
+        }
+    
+    def calculate_cross_chain_risk_batch(self, tx_counts: np.ndarray, balances_usd: np.ndarray,
+                                         chain_mask: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_cross_chain_risk over many addresses
+        
+        Args:
+            tx_counts: Total transactions per address across chains, shape (N,)
+            balances_usd: Total USD balance per address, shape (N,)
+            chain_mask: Nonzero where an address is active on a chain, shape (N, len(ChainType)),
+                columns ordered by CHAIN_INDEX
+            
+        Returns:
+            Arrays of scores, risk levels and chain summary totals, one entry per address
+        """
+        
+        tx_counts = np.asarray(tx_counts, dtype=np.int64)
+        chain_mask = np.asarray(chain_mask).astype(bool, copy=False)
+        
+        total_chains = chain_mask.sum(axis=1)
+        has_privacy_chains = chain_mask[:, _PRIVACY_COLUMNS].any(axis=1)
+        has_layer2 = chain_mask[:, _L2_COLUMNS].any(axis=1)
+        
+        risk_score = (
+            np.take(_CHAIN_COUNT_POINTS, np.digitize(total_chains, _CHAIN_COUNT_STEPS))
+            + np.take(_TX_VOLUME_POINTS, np.digitize(tx_counts, _TX_VOLUME_STEPS, right=True))
+            + 10 * has_privacy_chains
+            + 5 * has_layer2
+        )
+        
+        return {
+            'cross_chain_risk_score': np.minimum(100, risk_score),
+            'risk_level': _RISK_LEVEL_LABELS[np.digitize(risk_score, _RISK_LEVEL_STEPS)],
+            'total_chains': total_chains,
+            'total_transactions': tx_counts,
+            'total_balance_usd': np.asarray(balances_usd, dtype=np.float64)
         }
     
     def get_chain_config(self, chain: ChainType) -> Optional[ChainConfig]:
@@ -330,7 +810,12 @@ class MultiChainService:
         """Update API key for a specific chain"""
         
         if chain in self.chains:
-            self.chains[chain].api_key = api_key
+            config = self.chains[chain]
+            config = self.chains[chain] = replace(
+                config, api_key=api_key, live=True,
+                rpc_url=config.rpc_url.replace(_API_KEY_PLACEHOLDER, api_key)
+            )
+            self._limiters.setdefault(config.rpc_url, _ProviderLimiter(config.rps_limit, config.burst))
             logger.info(f"Updated API key for {chain.value}")
             return True
         
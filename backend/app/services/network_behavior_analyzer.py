@@ -4,15 +4,94 @@ Implements the "Galaxy View" cluster analysis and suspicious network pattern det
 """
 
 import logging
+import hashlib
+import threading
+import time
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Set
-from collections import defaultdict, Counter
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Tuple, Optional, Set
+from collections import defaultdict, Counter, OrderedDict
+from joblib import Parallel, delayed
 from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
+from sklearn.neighbors import NearestNeighbors
+from scipy import sparse
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# KD-trees prune well in low dimensions; past this many features a ball tree does better
+_KD_TREE_MAX_DIMS = 15
+
+# Cluster risk score over per-cluster arrays (see _score_clusters); the NumPy
+# fallback in _cluster_risk_scores must stay in step with this expression
+_CLUSTER_RISK_EXPR = (
+    "where(size > 50, 30, where(size > 20, 20, where(size > 10, 10, 0)))"
+    " + where(fc > 0.8, 25, where(fc > 0.5, 15, 0))"
+    " + where(sim > 0.8, 20, 0)"
+    " + where(act > 0.7, 25, 0)"
+    " + atk * 15"
+)
+
+class NetworkArrays(NamedTuple):
+    """Column (SoA) view of network_data, built once per analysis
+    
+    from_id/to_id index into addresses; seconds are epoch seconds and only
+    meaningful where parsed is True. tx_postings is an inverted index in CSR
+    form: the transactions touching address i are
+    tx_postings[posting_offsets[i]:posting_offsets[i + 1]].
+    """
+    addresses: np.ndarray
+    address_index: pd.Index
+    from_id: np.ndarray
+    to_id: np.ndarray
+    value: np.ndarray
+    seconds: np.ndarray
+    parsed: np.ndarray
+    tx_postings: np.ndarray
+    posting_offsets: np.ndarray
+
+def _cluster_edge_stats_numpy(from_in: np.ndarray, to_in: np.ndarray,
+                              values: np.ndarray) -> Tuple[int, int, float, float]:
+    """Touching and internal transaction counts, internal and boundary-crossing volume"""
+    internal = from_in & to_in
+    crossing = from_in ^ to_in
+    return int((from_in | to_in).sum()), int(internal.sum()), values[internal].sum(), values[crossing].sum()
+
+if NUMBA_AVAILABLE:
+    # Serial and GIL-free: clusters already fan out over joblib threads, and a
+    # parallel kernel entered from several threads at once is unsafe on numba's
+    # default workqueue threading layer
+    @njit(nogil=True, cache=True)
+    def _cluster_edge_stats(from_in, to_in, values):
+        """Touching and internal transaction counts, internal and boundary-crossing volume, in one sweep"""
+        touching = 0
+        internal = 0
+        internal_volume = 0.0
+        crossing_volume = 0.0
+        for i in range(values.size):
+            if from_in[i] and to_in[i]:
+                touching += 1
+                internal += 1
+                internal_volume += values[i]
+            elif from_in[i] or to_in[i]:
+                touching += 1
+                crossing_volume += values[i]
+        return touching, internal, internal_volume, crossing_volume
+else:
+    _cluster_edge_stats = _cluster_edge_stats_numpy
+
 class NetworkBehaviorAnalyzer:
     """
     Advanced network behavior analysis for detecting suspicious wallet clusters
@@ -21,7 +100,28 @@ class NetworkBehaviorAnalyzer:
     
     def __init__(self, neo4j_client):
         self.neo4j = neo4j_client
-        self.scaler = StandardScaler()
+        
+        # DBSCAN neighborhood radius (in scaled feature space) and a small LRU of
+        # the sparse radius-neighbor graphs built for recent feature matrices
+        self.cluster_eps = 0.5
+        self.neighbor_graph_cache_size = 8
+        self._neighbor_graphs: OrderedDict = OrderedDict()
+        self._neighbor_graphs_lock = threading.Lock()
+        
+        # Networks with at least this many addresses are clustered on a sampled
+        # neighbor graph (SNG-DBSCAN) instead of exact radius neighborhoods
+        self.sampled_graph_min_points = 2000
+        
+        # Clusters are analyzed on a thread pool once there are this many; the
+        # NumPy/numba work releases the GIL and threads share the network arrays
+        self.parallel_cluster_min = 8
+        
+        # Short-lived LRU of fetched networks and their derived arrays/features,
+        # keyed by query, so dashboard refreshes skip the graph store round trip
+        self.network_cache_ttl = 60.0
+        self.network_cache_size = 64
+        self._network_cache: OrderedDict = OrderedDict()
+        self._network_cache_lock = threading.Lock()
         
         # Suspicious patterns thresholds
         self.thresholds = {
@@ -29,8 +129,13 @@ class NetworkBehaviorAnalyzer:
             'sybil_funding_similarity': 0.8,
             'mixer_interaction_threshold': 5,
             'flash_loan_time_window': 300,  # 5 minutes
-            'coordinated_attack_threshold': 0.7
+            'coordinated_attack_threshold': 0.7,
+            'timing_min_cluster_size': 3
         }
+        
+        # Compile the numba cluster kernel up front rather than on the first request
+        if NUMBA_AVAILABLE:
+            _cluster_edge_stats(np.zeros(1, dtype=np.bool_), np.zeros(1, dtype=np.bool_), np.zeros(1))
     
     def analyze_network_clusters(self, center_address: str = None, max_depth: int = 3, 
                                 min_cluster_size: int = 5) -> Dict:
@@ -43,46 +148,47 @@ class NetworkBehaviorAnalyzer:
             min_cluster_size: Minimum size for clusters to be considered
             
         Returns:
-            Dict containing cluster analysis results
+            Dict containing cluster analysis results. 'galaxy_view_data' holds only
+            the visualization 'nodes'; each node's cluster_id points at its full
+            analysis in 'clusters' (there is no 'cluster_meta' copy).
         """
         
         logger.info(f"Starting network cluster analysis")
         
         try:
-            # Get network data from Neo4j
-            if center_address:
-                network_data = self.neo4j.get_network_subgraph(center_address, max_depth)
-            else:
-                network_data = self.neo4j.get_suspicious_networks(limit=1000)
+            # Get network data (and its typed arrays and node features) from the graph store
+            network_data, arrays, feature_matrix = self._load_network(center_address, max_depth)
             
             if not network_data:
                 return {'clusters': [], 'analysis': 'No network data available'}
-            
-            # Extract features for each node
-            node_features = self._extract_network_features(network_data)
+            addresses = arrays.addresses
             
             # Perform clustering
-            clusters = self._detect_clusters(node_features, min_cluster_size)
+            clusters = self._detect_clusters(addresses, feature_matrix, min_cluster_size)
             
             # Analyze each cluster for suspicious patterns
-            cluster_analysis = []
-            for cluster_id, cluster_nodes in clusters.items():
-                analysis = self._analyze_cluster_behavior(
-                    cluster_nodes, network_data, cluster_id
+            if len(clusters) >= self.parallel_cluster_min:
+                cluster_analysis = Parallel(n_jobs=-1, prefer='threads')(
+                    delayed(self._analyze_cluster_behavior)(cluster_nodes, arrays, cluster_id)
+                    for cluster_id, cluster_nodes in clusters.items()
                 )
-                cluster_analysis.append(analysis)
+            else:
+                cluster_analysis = [
+                    self._analyze_cluster_behavior(cluster_nodes, arrays, cluster_id)
+                    for cluster_id, cluster_nodes in clusters.items()
+                ]
+            self._score_clusters(cluster_analysis)
             
             # Detect specific attack patterns
-            attack_patterns = self._detect_attack_patterns(network_data, clusters)
+            attack_patterns = self._detect_attack_patterns(arrays, clusters)
             
             # Calculate network-wide risk metrics
-            network_metrics = self._calculate_network_metrics(network_data, clusters)
+            network_metrics = self._calculate_network_metrics(arrays, clusters)
             
             return {
                 'analysis_timestamp': datetime.now().isoformat(),
                 'network_overview': {
-                    'total_addresses': len(set([tx['from_address'] for tx in network_data] + 
-                                             [tx['to_address'] for tx in network_data])),
+                    'total_addresses': len(addresses),
                     'total_transactions': len(network_data),
                     'cluster_count': len(clusters),
                     'suspicious_cluster_count': len([c for c in cluster_analysis if c['risk_level'] != 'LOW'])
@@ -97,87 +203,159 @@ class NetworkBehaviorAnalyzer:
             logger.error(f"Error in network cluster analysis: {str(e)}")
             return {'error': str(e)}
     
-    def _extract_network_features(self, network_data: List[Dict]) -> Dict[str, np.ndarray]:
-        """Extract sophisticated features for each node in the network"""
-        
-        # Build address interaction statistics
-        address_stats = defaultdict(lambda: {
-            'in_degree': 0, 'out_degree': 0, 'in_volume': 0, 'out_volume': 0,
-            'tx_count': 0, 'unique_counterparties': set(), 'timestamps': []
-        })
-        
-        for tx in network_data:
-            from_addr = tx['from_address']
-            to_addr = tx['to_address']
-            value = tx.get('value', 0)
-            timestamp = tx.get('timestamp')
-            
-            # Update statistics
-            address_stats[from_addr]['out_degree'] += 1
-            address_stats[from_addr]['out_volume'] += value
-            address_stats[from_addr]['tx_count'] += 1
-            address_stats[from_addr]['unique_counterparties'].add(to_addr)
-            if timestamp:
-                address_stats[from_addr]['timestamps'].append(timestamp)
-            
-            address_stats[to_addr]['in_degree'] += 1
-            address_stats[to_addr]['in_volume'] += value
-            address_stats[to_addr]['tx_count'] += 1
-            address_stats[to_addr]['unique_counterparties'].add(from_addr)
-            if timestamp:
-                address_stats[to_addr]['timestamps'].append(timestamp)
-        
-        # Convert to feature vectors
-        features_dict = {}
-        for address, stats in address_stats.items():
-            features = [
-                stats['in_degree'],
-                stats['out_degree'], 
-                stats['in_volume'] / 1e18,  # Convert to ETH
-                stats['out_volume'] / 1e18,
-                stats['tx_count'],
-                len(stats['unique_counterparties']),
-            ]
-            
-            # Temporal features
-            if stats['timestamps']:
-                try:
-                    dates = [datetime.fromisoformat(ts.replace('Z', '+00:00')) for ts in stats['timestamps'] if ts]
-                    if dates:
-                        activity_span = (max(dates) - min(dates)).days
-                        features.append(activity_span)
-                    else:
-                        features.append(0)
-                except:
-                    features.append(0)
-            else:
-                features.append(0)
-            
-            # Balance ratio
-            total_volume = stats['in_volume'] + stats['out_volume']
-            balance_ratio = stats['in_volume'] / max(1, total_volume)
-            features.append(balance_ratio)
-            
-            features_dict[address] = np.array(features)
+    def _load_network(self, center_address: Optional[str], max_depth: int) -> Tuple[List[Dict], Optional[NetworkArrays], Optional[np.ndarray]]:
+        """Network transactions with their typed arrays and feature matrix, served from cache within the TTL"""
+        
+        key = (center_address, max_depth) if center_address else ('suspicious', 1000)
+        with self._network_cache_lock:
+            cached = self._network_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._network_cache.move_to_end(key)
+                return cached[1]
+        
+        if center_address:
+            network_data = self.neo4j.get_network_subgraph(center_address, max_depth)
+        else:
+            network_data = self.neo4j.get_suspicious_networks(limit=1000)
+        
+        if not network_data:
+            return network_data, None, None
+        
+        # Convert transactions to typed arrays once, then extract features for each node
+        arrays = self._network_arrays(network_data)
+        entry = (network_data, arrays, self._extract_network_features(arrays))
         
-        return features_dict
+        with self._network_cache_lock:
+            self._network_cache[key] = (time.monotonic() + self.network_cache_ttl, entry)
+            self._network_cache.move_to_end(key)
+            if len(self._network_cache) > self.network_cache_size:
+                self._network_cache.popitem(last=False)
+        return entry
     
-    def _detect_clusters(self, node_features: Dict[str, np.ndarray], min_cluster_size: int) -> Dict[int, List[str]]:
-        """Detect clusters using DBSCAN clustering algorithm"""
+    def _network_arrays(self, network_data: List[Dict]) -> NetworkArrays:
+        """Typed column arrays for network_data, with addresses factorized to integer ids"""
+        
+        df = pd.DataFrame(network_data, columns=['from_address', 'to_address', 'value', 'timestamp'])
+        tx_total = len(df)
+        
+        # Endpoints interleaved (from, to, from, to, ...) so addresses are numbered
+        # in order of first appearance, as the per-transaction loop did; DBSCAN
+        # labels and border-point assignment depend on that row order
+        endpoints = np.empty(2 * tx_total, dtype=object)
+        endpoints[0::2] = df['from_address'].to_numpy(dtype=object)
+        endpoints[1::2] = df['to_address'].to_numpy(dtype=object)
+        codes, addresses = pd.factorize(pd.Series(endpoints))
+        values = df['value'].fillna(0).to_numpy(dtype=np.float64)
+        
+        timestamps = pd.to_datetime(df['timestamp'], utc=True, errors='coerce', format='ISO8601')
+        parsed = timestamps.notna().to_numpy()
+        seconds = np.zeros(tx_total, dtype=np.int64)
+        seconds[parsed] = timestamps[parsed].to_numpy(dtype='datetime64[s]').astype(np.int64)
+        
+        # Posting lists address -> transactions, from one stable sort of both endpoints
+        tx_postings = np.argsort(codes, kind='stable') // 2
+        posting_offsets = np.zeros(len(addresses) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(addresses)), out=posting_offsets[1:])
+        
+        return NetworkArrays(
+            addresses=np.asarray(addresses, dtype=object),
+            address_index=addresses,
+            from_id=codes[0::2],
+            to_id=codes[1::2],
+            value=values,
+            seconds=seconds,
+            parsed=parsed,
+            tx_postings=tx_postings,
+            posting_offsets=posting_offsets
+        )
+    
+    def _extract_network_features(self, arrays: NetworkArrays) -> np.ndarray:
+        """
+        Extract sophisticated features for each node in the network
         
-        if not node_features:
-            return {}
+        Every per-address statistic is a bincount or ufunc reduction over the
+        factorized address ids.
         
-        # Prepare feature matrix
-        addresses = list(node_features.keys())
-        feature_matrix = np.array([node_features[addr] for addr in addresses])
+        Returns:
+            (n_addresses, 8) float32 feature matrix, rows ordered like the addresses array
+        """
         
-        # Normalize features
-        feature_matrix_scaled = self.scaler.fit_transform(feature_matrix)
+        from_id, to_id, values, seconds, parsed = arrays.from_id, arrays.to_id, arrays.value, arrays.seconds, arrays.parsed
+        n = len(arrays.addresses)
+        
+        # Degree and volume per address; total degree is the posting-list length
+        # already held by the inverted index
+        total_degree = np.diff(arrays.posting_offsets)
+        out_degree = np.bincount(from_id, minlength=n)
+        in_degree = total_degree - out_degree
+        out_volume = np.bincount(from_id, weights=values, minlength=n)
+        in_volume = np.bincount(to_id, weights=values, minlength=n)
+        
+        # Unique counterparties: distinct undirected pairs, each credited to both
+        # endpoints (once for a self-transfer). One int64 key per transaction is
+        # sorted, with no per-address sets however dense a hub gets
+        low, high = np.minimum(from_id, to_id), np.maximum(from_id, to_id)
+        pairs = np.unique(low * n + high)
+        low, high = pairs // n, pairs % n
+        unique_counterparties = np.bincount(low, minlength=n) + np.bincount(high[high != low], minlength=n)
+        
+        # Temporal features: whole days between each address's first and last transaction
+        ids = np.concatenate([from_id[parsed], to_id[parsed]])
+        tx_seconds = np.concatenate([seconds[parsed], seconds[parsed]])
+        first_seen = np.full(n, np.iinfo(np.int64).max)
+        last_seen = np.full(n, np.iinfo(np.int64).min)
+        np.minimum.at(first_seen, ids, tx_seconds)
+        np.maximum.at(last_seen, ids, tx_seconds)
+        activity_span = np.where(last_seen >= first_seen, (last_seen - first_seen) // 86400, 0)
+        
+        # Balance ratio
+        total_volume = in_volume + out_volume
+        balance_ratio = in_volume / np.maximum(1, total_volume)
+        
+        # Written column by column into one contiguous float32 block; single
+        # precision is ample for eps-neighborhoods in z-scored space
+        feature_matrix = np.empty((n, 8), dtype=np.float32)
+        feature_matrix[:, 0] = in_degree
+        feature_matrix[:, 1] = out_degree
+        feature_matrix[:, 2] = in_volume / 1e18  # Convert to ETH
+        feature_matrix[:, 3] = out_volume / 1e18
+        feature_matrix[:, 4] = total_degree
+        feature_matrix[:, 5] = unique_counterparties
+        feature_matrix[:, 6] = activity_span
+        feature_matrix[:, 7] = balance_ratio
+        
+        return feature_matrix
+    
+    def _detect_clusters(self, addresses: np.ndarray, feature_matrix: np.ndarray,
+                         min_cluster_size: int, sample_ratio: float = 0.01) -> Dict[int, List[str]]:
+        """
+        Detect clusters using DBSCAN clustering algorithm
         
-        # Apply DBSCAN clustering
-        dbscan = DBSCAN(eps=0.5, min_samples=min_cluster_size)
-        cluster_labels = dbscan.fit_predict(feature_matrix_scaled)
+        Large networks (sampled_graph_min_points and up) only compare each address
+        against a random sample_ratio share of the others (at least
+        2 * min_cluster_size candidates) when building neighborhoods.
+        """
+        
+        # No cluster can reach min_cluster_size; skip scaling and DBSCAN entirely
+        if len(addresses) < max(1, min_cluster_size):
+            return {}
+        
+        # Normalize features (z-score; constant columns keep a unit scale, as in StandardScaler)
+        # Moments are accumulated in float64, then applied in the matrix's float32
+        sigma = feature_matrix.std(axis=0, dtype=np.float64)
+        sigma[sigma == 0] = 1.0
+        mu = feature_matrix.mean(axis=0, dtype=np.float64)
+        feature_matrix_scaled = (feature_matrix - mu.astype(np.float32)) / sigma.astype(np.float32)
+        
+        # Apply DBSCAN clustering on precomputed sparse neighborhoods, so memory
+        # grows with the number of neighbor pairs rather than n^2
+        if len(addresses) >= self.sampled_graph_min_points:
+            candidates = max(min_cluster_size * 2, int(sample_ratio * len(addresses)))
+        else:
+            candidates = None
+        neighbor_graph = self._neighbor_graph(feature_matrix_scaled, candidates)
+        dbscan = DBSCAN(eps=self.cluster_eps, min_samples=min_cluster_size, metric='precomputed', n_jobs=-1)
+        cluster_labels = dbscan.fit_predict(neighbor_graph)
         
         # Group addresses by cluster
         clusters = defaultdict(list)
@@ -193,119 +371,237 @@ class NetworkBehaviorAnalyzer:
         
         return filtered_clusters
     
-    def _analyze_cluster_behavior(self, cluster_nodes: List[str], network_data: List[Dict], 
+    def _neighbor_graph(self, feature_matrix: np.ndarray, candidates: Optional[int] = None) -> sparse.csr_matrix:
+        """
+        Sparse distance graph of point pairs within cluster_eps, cached by matrix digest
+        
+        With candidates set, the graph is sampled: see _sampled_neighbor_graph.
+        """
+        
+        feature_matrix = np.ascontiguousarray(feature_matrix)
+        key = (feature_matrix.shape, hashlib.blake2b(feature_matrix.tobytes(), digest_size=16).digest(), candidates)
+        with self._neighbor_graphs_lock:
+            graph = self._neighbor_graphs.get(key)
+            if graph is not None:
+                self._neighbor_graphs.move_to_end(key)
+                return graph
+        
+        if candidates is None:
+            graph = self._radius_neighbor_graph(feature_matrix)
+        else:
+            graph = self._sampled_neighbor_graph(feature_matrix, candidates)
+        
+        with self._neighbor_graphs_lock:
+            self._neighbor_graphs[key] = graph
+            if len(self._neighbor_graphs) > self.neighbor_graph_cache_size:
+                self._neighbor_graphs.popitem(last=False)
+        return graph
+    
+    def _radius_neighbor_graph(self, feature_matrix: np.ndarray) -> sparse.csr_matrix:
+        """Exact eps-neighborhoods from a spatial tree"""
+        
+        algorithm = 'kd_tree' if feature_matrix.shape[1] <= _KD_TREE_MAX_DIMS else 'ball_tree'
+        neighbors = NearestNeighbors(radius=self.cluster_eps, algorithm=algorithm, leaf_size=32, n_jobs=-1)
+        return neighbors.fit(feature_matrix).radius_neighbors_graph(mode='distance', sort_results=False)
+    
+    def _sampled_neighbor_graph(self, feature_matrix: np.ndarray, candidates: int,
+                                chunk_size: int = 4096) -> sparse.csr_matrix:
+        """
+        SNG-DBSCAN neighborhoods: each point is compared with `candidates` random
+        others, and pairs within eps are kept in both directions
+        
+        The sampling seed is fixed so repeated analyses of a network agree.
+        """
+        
+        n = feature_matrix.shape[0]
+        candidates = min(candidates, n - 1)
+        rng = np.random.default_rng(0)
+        rows, cols, distances = [], [], []
+        
+        for start in range(0, n, chunk_size):
+            points = np.arange(start, min(start + chunk_size, n))
+            sampled = rng.integers(0, n, size=(points.size, candidates))
+            diff = feature_matrix[sampled] - feature_matrix[points][:, None, :]
+            dist = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+            keep = (dist <= self.cluster_eps) & (sampled != points[:, None])
+            rows.append(np.broadcast_to(points[:, None], sampled.shape)[keep])
+            cols.append(sampled[keep])
+            distances.append(dist[keep])
+        
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        distances = np.concatenate(distances)
+        
+        # Symmetrize and drop pairs drawn twice, keeping explicit zero distances
+        # (identical feature rows) as neighbors
+        pair_rows = np.concatenate([rows, cols])
+        pair_cols = np.concatenate([cols, rows])
+        _, unique = np.unique(pair_rows * n + pair_cols, return_index=True)
+        return sparse.csr_matrix(
+            (np.concatenate([distances, distances])[unique], (pair_rows[unique], pair_cols[unique])),
+            shape=(n, n)
+        )
+    
+    def _analyze_cluster_behavior(self, cluster_nodes: List[str], arrays: NetworkArrays,
                                  cluster_id: int) -> Dict:
         """Analyze behavior patterns within a cluster"""
         
-        # Filter transactions involving cluster nodes
-        cluster_txs = [tx for tx in network_data 
-                      if tx['from_address'] in cluster_nodes or tx['to_address'] in cluster_nodes]
+        # Restrict the transaction columns to those touching the cluster, found
+        # through the posting lists rather than a scan of the whole network
+        node_ids = arrays.address_index.get_indexer(cluster_nodes)
+        arrays = self._cluster_transactions(arrays, node_ids)
+        
+        # Membership per address, then per transaction endpoint; every analysis
+        # below works from these masks with O(1) lookups instead of list scans
+        in_cluster = np.zeros(len(arrays.addresses), dtype=np.bool_)
+        in_cluster[node_ids] = True
+        from_in = in_cluster[arrays.from_id]
+        to_in = in_cluster[arrays.to_id]
+        external_funding = to_in & ~from_in
+        
+        # Connectivity and volumes in a single sweep over the transaction arrays
+        touching_count, internal_count, internal_volume, crossing_volume = _cluster_edge_stats(
+            from_in, to_in, arrays.value
+        )
         
         # Basic cluster metrics
         cluster_size = len(cluster_nodes)
-        internal_txs = [tx for tx in cluster_txs 
-                       if tx['from_address'] in cluster_nodes and tx['to_address'] in cluster_nodes]
         
         # Analyze funding patterns
-        funding_analysis = self._analyze_funding_patterns(cluster_nodes, network_data)
+        funding_analysis = self._analyze_funding_patterns(external_funding, arrays)
         
-        # Analyze transaction timing
-        timing_analysis = self._analyze_timing_patterns(cluster_nodes, cluster_txs)
+        # Analyze transaction timing; with one or two members every shared window
+        # would read as coordinated, so tiny clusters report no correlation
+        if cluster_size >= self.thresholds['timing_min_cluster_size']:
+            timing_analysis = self._analyze_timing_patterns(np.sort(node_ids), from_in, to_in, arrays)
+        else:
+            timing_analysis = {'activity_correlation': 0, 'coordinated_windows': []}
         
         # Detect specific attack patterns
-        attack_indicators = self._detect_cluster_attack_patterns(cluster_nodes, network_data)
-        
-        # Calculate cluster risk score
-        risk_score = self._calculate_cluster_risk_score(
-            cluster_size, funding_analysis, timing_analysis, attack_indicators
+        attack_indicators = self._detect_cluster_attack_patterns(
+            cluster_size, funding_analysis['external_funding_sources'], internal_volume, crossing_volume
         )
         
-        # Determine cluster type and risk level
+        # Determine cluster type; risk score and level are filled in for all
+        # clusters at once by _score_clusters
         cluster_type = self._classify_cluster_type(funding_analysis, timing_analysis, attack_indicators)
-        risk_level = self._get_risk_level(risk_score)
         
         return {
             'cluster_id': cluster_id,
             'cluster_type': cluster_type,
-            'risk_score': risk_score,
-            'risk_level': risk_level,
             'size': cluster_size,
             'addresses': cluster_nodes,
             'connectivity': {
-                'internal_transactions': len(internal_txs),
-                'external_transactions': len(cluster_txs) - len(internal_txs),
+                'internal_transactions': internal_count,
+                'external_transactions': touching_count - internal_count,
             },
             'funding_analysis': funding_analysis,
             'timing_analysis': timing_analysis,
             'attack_indicators': attack_indicators,
-            'recommendations': self._generate_cluster_recommendations(cluster_type, risk_level)
         }
     
-    def _analyze_funding_patterns(self, cluster_nodes: List[str], network_data: List[Dict]) -> Dict:
-        """Analyze funding patterns within cluster for Sybil attack detection"""
-        
-        # Find external funding sources
-        external_funding = defaultdict(float)
-        for tx in network_data:
-            if (tx['to_address'] in cluster_nodes and 
-                tx['from_address'] not in cluster_nodes):
-                external_funding[tx['from_address']] += tx.get('value', 0)
-        
-        total_funding = sum(external_funding.values())
-        max_funding = max(external_funding.values()) if external_funding else 0
+    def _cluster_transactions(self, arrays: NetworkArrays, node_ids: np.ndarray) -> NetworkArrays:
+        """Transaction columns cut down to the transactions touching node_ids, in network order"""
+        
+        starts = arrays.posting_offsets[node_ids]
+        lengths = arrays.posting_offsets[node_ids + 1] - starts
+        
+        # Concatenate the posting-list slices: each position is its list's start
+        # plus its offset within that list
+        list_begin = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - list_begin, lengths) + np.arange(lengths.sum())
+        tx_idx = np.unique(arrays.tx_postings[positions])
+        
+        return arrays._replace(
+            from_id=arrays.from_id[tx_idx],
+            to_id=arrays.to_id[tx_idx],
+            value=arrays.value[tx_idx],
+            seconds=arrays.seconds[tx_idx],
+            parsed=arrays.parsed[tx_idx]
+        )
+    
+    def _analyze_funding_patterns(self, external: np.ndarray, arrays: NetworkArrays) -> Dict:
+        """Analyze funding patterns within cluster for Sybil attack detection
+        
+        external marks transfers into the cluster from outside it
+        """
+        
+        # Find external funding sources; amounts are summed per funder over the
+        # compact unique ids, not a bincount the size of the whole network
+        funders, funder_idx = np.unique(arrays.from_id[external], return_inverse=True)
+        amounts = np.bincount(funder_idx, weights=arrays.value[external], minlength=funders.size)
+        
+        total_funding = amounts.sum()
+        max_funding = amounts.max() if amounts.size else 0
         funding_concentration = max_funding / max(1, total_funding)
         
-        # Check for similar funding amounts
-        amounts = list(external_funding.values())
-        amount_similarity = 1 - (np.std(amounts) / max(1, np.mean(amounts))) if amounts else 0
+        # Check for similar funding amounts (a lone funder is trivially uniform)
+        if amounts.size >= 2:
+            amount_similarity = 1 - (amounts.std() / max(1, amounts.mean()))
+        else:
+            amount_similarity = float(amounts.size)
         
         return {
-            'external_funding_sources': len(external_funding),
+            'external_funding_sources': int(funders.size),
             'total_funding_amount': total_funding / 1e18,
             'funding_concentration': funding_concentration,
             'amount_similarity': amount_similarity,
         }
     
-    def _analyze_timing_patterns(self, cluster_nodes: List[str], cluster_txs: List[Dict]) -> Dict:
-        """Analyze temporal patterns for coordinated activity detection"""
+    def _analyze_timing_patterns(self, member_ids: np.ndarray, from_in: np.ndarray, to_in: np.ndarray,
+                                 arrays: NetworkArrays) -> Dict:
+        """Analyze temporal patterns for coordinated activity detection
+        
+        member_ids are the cluster's address ids, sorted
+        """
         
-        if not cluster_txs:
+        from_id, to_id, seconds, parsed = arrays.from_id, arrays.to_id, arrays.seconds, arrays.parsed
+        cluster_size = member_ids.size
+        if not (from_in | to_in).any():
             return {'activity_correlation': 0, 'coordinated_windows': []}
         
-        # Group transactions by time windows
-        time_windows = defaultdict(set)
-        window_size = timedelta(minutes=15)
-        
-        for tx in cluster_txs:
-            try:
-                timestamp = datetime.fromisoformat(tx['timestamp'].replace('Z', '+00:00'))
-                window_key = timestamp.replace(minute=timestamp.minute // 15 * 15, second=0, microsecond=0)
-                if tx['from_address'] in cluster_nodes:
-                    time_windows[window_key].add(tx['from_address'])
-                if tx['to_address'] in cluster_nodes:
-                    time_windows[window_key].add(tx['to_address'])
-            except:
-                continue
+        # Group cluster participants by 15-minute window using the pre-parsed epoch
+        # seconds: distinct (window, address) pairs, then participants per window
+        window_size = 900
+        sender = from_in & parsed
+        receiver = to_in & parsed
+        windows = np.concatenate([seconds[sender], seconds[receiver]]) // window_size
+        first_window = windows.min() if windows.size else 0
+        
+        # Keys stay small: window offset from the first window times the cluster
+        # size, plus the participant's position among the cluster members
+        participants = np.searchsorted(member_ids, np.concatenate([from_id[sender], to_id[receiver]]))
+        pairs = np.unique((windows - first_window) * cluster_size + participants)
+        window_offsets, participant_counts = np.unique(pairs // cluster_size, return_counts=True)
+        window_keys = window_offsets + first_window
         
         # Calculate activity correlation
-        window_participation = [len(nodes) / len(cluster_nodes) for nodes in time_windows.values()]
-        activity_correlation = np.mean(window_participation) if window_participation else 0
+        window_participation = participant_counts / cluster_size
+        activity_correlation = window_participation.mean() if window_participation.size else 0
         
         # Identify coordinated windows
+        coordinated = window_participation > 0.5
         coordinated_windows = [
-            {'timestamp': window.isoformat(), 'participation_rate': len(nodes) / len(cluster_nodes)}
-            for window, nodes in time_windows.items()
-            if len(nodes) / len(cluster_nodes) > 0.5
+            {
+                'timestamp': datetime.fromtimestamp(int(window) * window_size, tz=timezone.utc).isoformat(),
+                'participation_rate': rate
+            }
+            for window, rate in zip(window_keys[coordinated], window_participation[coordinated].tolist())
         ]
         
         return {
             'activity_correlation': activity_correlation,
             'coordinated_windows': coordinated_windows,
-            'peak_coordination': max(window_participation) if window_participation else 0
+            'peak_coordination': window_participation.max() if window_participation.size else 0
         }
     
-    def _detect_cluster_attack_patterns(self, cluster_nodes: List[str], network_data: List[Dict]) -> Dict:
-        """Detect specific attack patterns within the cluster"""
+    def _detect_cluster_attack_patterns(self, cluster_size: int, funding_sources: int,
+                                        internal_volume: float, external_volume: float) -> Dict:
+        """Detect specific attack patterns within the cluster
+        
+        Works purely from reductions computed once per cluster: the distinct
+        external funder count and the internal/boundary-crossing volumes.
+        """
         
         indicators = {
             'sybil_attack': False,
@@ -315,60 +611,60 @@ class NetworkBehaviorAnalyzer:
         }
         
         # Sybil attack detection
-        if len(cluster_nodes) >= self.thresholds['sybil_min_cluster_size']:
-            funding_sources = set()
-            for tx in network_data:
-                if (tx['to_address'] in cluster_nodes and 
-                    tx['from_address'] not in cluster_nodes):
-                    funding_sources.add(tx['from_address'])
-            
-            if len(funding_sources) <= 3:
-                indicators['sybil_attack'] = True
+        if cluster_size >= self.thresholds['sybil_min_cluster_size'] and funding_sources <= 3:
+            indicators['sybil_attack'] = True
         
         # Wash trading detection
-        internal_volume = sum(tx['value'] for tx in network_data 
-                            if tx['from_address'] in cluster_nodes and tx['to_address'] in cluster_nodes)
-        external_volume = sum(tx['value'] for tx in network_data 
-                            if (tx['from_address'] in cluster_nodes) != (tx['to_address'] in cluster_nodes))
-        
         if internal_volume > external_volume * 2:
             indicators['wash_trading'] = True
         
         return indicators
     
-    def _calculate_cluster_risk_score(self, cluster_size: int, funding_analysis: Dict, 
-                                    timing_analysis: Dict, attack_indicators: Dict) -> float:
-        """Calculate overall risk score for the cluster"""
-        
-        risk_score = 0
-        
-        # Size factor
-        if cluster_size > 50:
-            risk_score += 30
-        elif cluster_size > 20:
-            risk_score += 20
-        elif cluster_size > 10:
-            risk_score += 10
-        
-        # Funding concentration risk
-        if funding_analysis['funding_concentration'] > 0.8:
-            risk_score += 25
-        elif funding_analysis['funding_concentration'] > 0.5:
-            risk_score += 15
-        
-        # Similar funding amounts
-        if funding_analysis['amount_similarity'] > 0.8:
-            risk_score += 20
-        
-        # Coordinated activity
-        if timing_analysis['activity_correlation'] > 0.7:
-            risk_score += 25
-        
-        # Attack pattern indicators
-        attack_count = sum(attack_indicators.values())
-        risk_score += attack_count * 15
-        
-        return min(100, risk_score)
+    def _score_clusters(self, cluster_analysis: List[Dict]):
+        """Add risk score, risk level and recommendations to every analyzed cluster"""
+        
+        if not cluster_analysis:
+            return
+        
+        risk_scores = self._cluster_risk_scores(
+            size=np.array([a['size'] for a in cluster_analysis], dtype=np.int64),
+            fc=np.array([a['funding_analysis']['funding_concentration'] for a in cluster_analysis], dtype=np.float64),
+            sim=np.array([a['funding_analysis']['amount_similarity'] for a in cluster_analysis], dtype=np.float64),
+            act=np.array([a['timing_analysis']['activity_correlation'] for a in cluster_analysis], dtype=np.float64),
+            atk=np.array([sum(a['attack_indicators'].values()) for a in cluster_analysis], dtype=np.int64),
+        )
+        
+        for analysis, risk_score in zip(cluster_analysis, risk_scores.tolist()):
+            risk_level = self._get_risk_level(risk_score)
+            analysis['risk_score'] = risk_score
+            analysis['risk_level'] = risk_level
+            analysis['recommendations'] = self._generate_cluster_recommendations(analysis['cluster_type'], risk_level)
+    
+    def _cluster_risk_scores(self, size: np.ndarray, fc: np.ndarray, sim: np.ndarray,
+                             act: np.ndarray, atk: np.ndarray) -> np.ndarray:
+        """
+        Overall risk score per cluster, capped at 100
+        
+        Args:
+            size: Cluster sizes
+            fc: Funding concentration
+            sim: Funding amount similarity
+            act: Activity correlation
+            atk: Number of attack indicators raised
+        """
+        
+        if NUMEXPR_AVAILABLE:
+            risk_scores = ne.evaluate(_CLUSTER_RISK_EXPR)
+        else:
+            risk_scores = (
+                np.select([size > 50, size > 20, size > 10], [30, 20, 10], 0)
+                + np.select([fc > 0.8, fc > 0.5], [25, 15], 0)
+                + np.where(sim > 0.8, 20, 0)
+                + np.where(act > 0.7, 25, 0)
+                + atk * 15
+            )
+        
+        return np.minimum(risk_scores, 100)
     
     def _classify_cluster_type(self, funding_analysis: Dict, timing_analysis: Dict, 
                              attack_indicators: Dict) -> str:
@@ -420,69 +716,78 @@ class NetworkBehaviorAnalyzer:
         
         return recommendations
     
-    def _detect_attack_patterns(self, network_data: List[Dict], clusters: Dict[int, List[str]]) -> List[Dict]:
+    def _detect_attack_patterns(self, arrays: NetworkArrays,
+                                clusters: Dict[int, List[str]]) -> List[Dict]:
         """Detect network-wide attack patterns"""
         
         patterns = []
-        
-        # Cross-cluster coordination detection
-        for cluster1_id, cluster1_nodes in clusters.items():
-            for cluster2_id, cluster2_nodes in clusters.items():
-                if cluster1_id != cluster2_id:
-                    cross_cluster_txs = [
-                        tx for tx in network_data 
-                        if ((tx['from_address'] in cluster1_nodes and tx['to_address'] in cluster2_nodes) or
-                            (tx['from_address'] in cluster2_nodes and tx['to_address'] in cluster1_nodes))
-                    ]
-                    
-                    if len(cross_cluster_txs) > 5:
-                        patterns.append({
-                            'pattern_type': 'Cross-Cluster Coordination',
-                            'description': f'Clusters {cluster1_id} and {cluster2_id} show coordinated activity',
-                            'risk_level': 'HIGH',
-                            'evidence': f'{len(cross_cluster_txs)} transactions between clusters'
-                        })
+        cluster_ids = list(clusters)
+        cluster_total = len(cluster_ids)
+        if cluster_total < 2:
+            return patterns
+        
+        # Cross-cluster coordination detection: one histogram of transactions
+        # between every pair of clusters instead of a scan per pair
+        cluster_of = np.full(len(arrays.addresses), -1, dtype=np.int64)
+        for position, cluster_nodes in enumerate(clusters.values()):
+            cluster_of[arrays.address_index.get_indexer(cluster_nodes)] = position
+        
+        from_cluster = cluster_of[arrays.from_id]
+        to_cluster = cluster_of[arrays.to_id]
+        crossing = (from_cluster >= 0) & (to_cluster >= 0) & (from_cluster != to_cluster)
+        from_cluster, to_cluster = from_cluster[crossing], to_cluster[crossing]
+        pair_counts = np.bincount(
+            np.minimum(from_cluster, to_cluster) * cluster_total + np.maximum(from_cluster, to_cluster),
+            minlength=cluster_total * cluster_total
+        ).reshape(cluster_total, cluster_total)
+        pair_counts += pair_counts.T  # Either direction counts, and each pair is reported both ways
+        
+        for i, j in np.argwhere(pair_counts > 5):
+            patterns.append({
+                'pattern_type': 'Cross-Cluster Coordination',
+                'description': f'Clusters {cluster_ids[i]} and {cluster_ids[j]} show coordinated activity',
+                'risk_level': 'HIGH',
+                'evidence': f'{pair_counts[i, j]} transactions between clusters'
+            })
         
         return patterns
     
-    def _calculate_network_metrics(self, network_data: List[Dict], clusters: Dict[int, List[str]]) -> Dict:
+    def _calculate_network_metrics(self, arrays: NetworkArrays, clusters: Dict[int, List[str]]) -> Dict:
         """Calculate network-wide risk and complexity metrics"""
         
-        all_addresses = set([tx['from_address'] for tx in network_data] + 
-                           [tx['to_address'] for tx in network_data])
+        # arrays.addresses already holds each distinct address exactly once
         clustered_nodes = sum(len(nodes) for nodes in clusters.values())
         
         return {
-            'clustering_coverage': clustered_nodes / max(1, len(all_addresses)),
+            'clustering_coverage': clustered_nodes / max(1, len(arrays.addresses)),
             'average_cluster_size': np.mean([len(nodes) for nodes in clusters.values()]) if clusters else 0,
-            'total_value_flow': sum(tx.get('value', 0) for tx in network_data) / 1e18
+            'total_value_flow': float(arrays.value.sum()) / 1e18
         }
     
     def _prepare_galaxy_view_data(self, clusters: Dict[int, List[str]], 
                                  cluster_analysis: List[Dict]) -> Dict:
-        """Prepare data structure for galaxy view visualization"""
+        """
+        Prepare data structure for galaxy view visualization
         
-        galaxy_data = {
-            'nodes': [],
-            'cluster_meta': {}
-        }
+        Nodes carry the cluster_id of their entry in the result's 'clusters'
+        list, where the full analysis lives; it is not repeated here.
+        """
         
         # Create cluster nodes for galaxy view
-        for analysis in cluster_analysis:
-            cluster_id = analysis['cluster_id']
-            
-            galaxy_data['nodes'].append({
-                'id': f'cluster_{cluster_id}',
-                'group': 'cluster',
-                'size': analysis['size'],
-                'risk_score': analysis['risk_score'],
-                'color': self._get_risk_color(analysis['risk_level']),
-                'cluster_type': analysis['cluster_type']
-            })
-            
-            galaxy_data['cluster_meta'][f'cluster_{cluster_id}'] = analysis
-        
-        return galaxy_data
+        return {
+            'nodes': [
+                {
+                    'id': f'cluster_{analysis["cluster_id"]}',
+                    'cluster_id': analysis['cluster_id'],
+                    'group': 'cluster',
+                    'size': analysis['size'],
+                    'risk_score': analysis['risk_score'],
+                    'color': self._get_risk_color(analysis['risk_level']),
+                    'cluster_type': analysis['cluster_type']
+                }
+                for analysis in cluster_analysis
+            ]
+        }
     
     def _get_risk_color(self, risk_level: str) -> str:
         """Get color code for risk level visualization"""
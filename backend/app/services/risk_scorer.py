@@ -2,11 +2,16 @@
 Sentinel Risk Scorer - Heuristic-based Risk Assessment Engine
 """
 
-import re
+import numpy as np
+from itertools import chain
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
 
+# Run of zeros that marks a vanity address, and the characters of a lowercase hex body
+_VANITY_ZEROS = '0' * 8
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
 class RiskScorer:
     """Heuristic-based risk scoring engine for wallet analysis"""
     
@@ -29,6 +34,10 @@ class RiskScorer:
             '0x095ea7b3',  # approve
             '0x23b872dd'   # transferFrom
         ]
+        
+        # Lowercased lookup sets for the lists above, built once for O(1) checks
+        self._mixers_lc = frozenset(mixer.lower() for mixer in self.known_mixers)
+        self._exchanges_lc = frozenset(ex.lower() for ex in self.known_exchanges)
     
     def calculate_risk_score(self, address: str, transactions: List[Dict], balance: int) -> Dict:
         """
@@ -77,8 +86,10 @@ class RiskScorer:
         
         # Factor 3: Transaction Pattern Analysis
         if transactions:
-            # Analyze recent activity (last 30 days)
-            recent_txs = self._get_recent_transactions(transactions, days=30)
+            # Analyze recent activity (last 30 days); timestamps are parsed once
+            # here and shared with the timing analysis
+            timestamps = [self._parse_timestamp(tx.get('timestamp')) for tx in transactions]
+            recent_txs, recent_timestamps = self._get_recent_transactions(transactions, timestamps, days=30)
             
             if len(recent_txs) > 100:
                 risk_factors.append("High recent activity (>100 tx in 30 days)")
@@ -86,7 +97,7 @@ class RiskScorer:
                 behavioral_tags.append("Very Active")
             
             # Analyze transaction timing patterns
-            timing_risk = self._analyze_timing_patterns(recent_txs)
+            timing_risk = self._analyze_timing_patterns(recent_timestamps)
             base_score += timing_risk['score']
             risk_factors.extend(timing_risk['factors'])
             behavioral_tags.extend(timing_risk['tags'])
@@ -139,57 +150,57 @@ class RiskScorer:
             }
         }
     
-    def _get_recent_transactions(self, transactions: List[Dict], days: int = 30) -> List[Dict]:
-        """Filter transactions from the last N days"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+    def _parse_timestamp(self, timestamp) -> Optional[float]:
+        """Epoch seconds for an ISO timestamp (naive values are local time), None if malformed"""
+        try:
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+        except (AttributeError, TypeError, ValueError):
+            return None
+    
+    def _get_recent_transactions(self, transactions: List[Dict], timestamps: List[Optional[float]],
+                                 days: int = 30) -> Tuple[List[Dict], List[float]]:
+        """Filter transactions from the last N days, along with their parsed timestamps"""
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
         recent_txs = []
+        recent_timestamps = []
         
-        for tx in transactions:
-            try:
-                tx_date = datetime.fromisoformat(tx['timestamp'].replace('Z', '+00:00'))
-                if tx_date >= cutoff_date:
-                    recent_txs.append(tx)
-            except:
-                continue  # Skip invalid timestamps
+        for tx, timestamp in zip(transactions, timestamps):
+            # Invalid timestamps are None and skipped
+            if timestamp is not None and timestamp >= cutoff:
+                recent_txs.append(tx)
+                recent_timestamps.append(timestamp)
                 
-        return recent_txs
+        return recent_txs, recent_timestamps
     
-    def _analyze_timing_patterns(self, transactions: List[Dict]) -> Dict:
-        """Analyze transaction timing patterns for suspicious behavior"""
+    def _analyze_timing_patterns(self, timestamps: List[float]) -> Dict:
+        """Analyze transaction timing patterns for suspicious behavior
+        
+        timestamps are epoch seconds, in transaction order
+        """
         score = 0
         factors = []
         tags = []
         
-        if len(transactions) < 2:
+        if len(timestamps) < 2:
             return {'score': score, 'factors': factors, 'tags': tags}
         
-        # Calculate time intervals between transactions
-        intervals = []
-        for i in range(1, len(transactions)):
-            try:
-                prev_time = datetime.fromisoformat(transactions[i-1]['timestamp'].replace('Z', '+00:00'))
-                curr_time = datetime.fromisoformat(transactions[i]['timestamp'].replace('Z', '+00:00'))
-                interval = abs((prev_time - curr_time).total_seconds() / 60)  # Minutes
-                intervals.append(interval)
-            except:
-                continue
-        
-        if intervals:
-            avg_interval = sum(intervals) / len(intervals)
-            
-            # Very regular intervals (potential bot)
-            regular_intervals = sum(1 for i in intervals if abs(i - avg_interval) < avg_interval * 0.1)
-            if regular_intervals > len(intervals) * 0.8:
-                factors.append("Highly regular transaction timing (potential bot)")
-                score += 20
-                tags.append("Potential Bot")
-            
-            # Very fast transactions (flash loan or MEV)
-            fast_intervals = sum(1 for i in intervals if i < 1)  # Less than 1 minute
-            if fast_intervals > 5:
-                factors.append("Multiple rapid transactions (<1 min apart)")
-                score += 15
-                tags.append("MEV Bot")
+        # Calculate time intervals between transactions, in minutes
+        intervals = np.abs(np.diff(np.asarray(timestamps, dtype=np.float64))) / 60
+        avg_interval = intervals.mean()
+        
+        # Very regular intervals (potential bot)
+        regular_intervals = (np.abs(intervals - avg_interval) < avg_interval * 0.1).sum()
+        if regular_intervals > intervals.size * 0.8:
+            factors.append("Highly regular transaction timing (potential bot)")
+            score += 20
+            tags.append("Potential Bot")
+        
+        # Very fast transactions (flash loan or MEV)
+        fast_intervals = (intervals < 1).sum()  # Less than 1 minute
+        if fast_intervals > 5:
+            factors.append("Multiple rapid transactions (<1 min apart)")
+            score += 15
+            tags.append("MEV Bot")
         
         return {'score': score, 'factors': factors, 'tags': tags}
     
@@ -203,18 +214,17 @@ class RiskScorer:
         to_addresses = [tx['to'] for tx in transactions if tx.get('to')]
         from_addresses = [tx['from'] for tx in transactions if tx.get('from')]
         
-        unique_interactions = len(set(to_addresses + from_addresses))
+        unique_interactions = len(set(chain(to_addresses, from_addresses)))
         
-        # Check for interactions with known risky addresses
-        for addr in to_addresses + from_addresses:
-            if addr.lower() in [mixer.lower() for mixer in self.known_mixers]:
+        # Check for interactions with known risky addresses, and with exchanges
+        # (typically lower risk), in one pass
+        for addr in chain(to_addresses, from_addresses):
+            addr_lower = addr.lower()
+            if addr_lower in self._mixers_lc:
                 factors.append(f"Interaction with known mixer: {addr[:10]}...")
                 score += 30
                 tags.append("Mixer Interaction")
-        
-        # Check for interactions with exchanges (typically lower risk)
-        for addr in to_addresses + from_addresses:
-            if addr.lower() in [ex.lower() for ex in self.known_exchanges]:
+            elif addr_lower in self._exchanges_lc:
                 tags.append("Exchange User")
                 score -= 5  # Slightly reduce risk
         
@@ -242,12 +252,10 @@ class RiskScorer:
         if not transactions:
             return {'score': score, 'factors': factors, 'tags': tags}
         
-        values = [tx['value_wei'] for tx in transactions if tx.get('value_wei', 0) > 0]
+        values = self._positive_values(transactions)
         
-        if values:
-            total_value = sum(values)
-            avg_value = total_value / len(values)
-            max_value = max(values)
+        if values.size:
+            max_value = values.max()
             
             # Very large transactions
             if max_value > 100 * 10**18:  # > 100 ETH
@@ -256,21 +264,32 @@ class RiskScorer:
                 tags.append("Whale Activity")
             
             # Many small dust transactions
-            dust_txs = sum(1 for v in values if v < 0.001 * 10**18)  # < 0.001 ETH
-            if dust_txs > len(values) * 0.5:
+            dust_txs = (values < 10**15).sum()  # < 0.001 ETH
+            if dust_txs > values.size * 0.5:
                 factors.append("Many dust transactions")
                 score += 10
                 tags.append("Dust Activity")
             
             # Round number transactions (potential automation)
-            round_numbers = sum(1 for v in values if v % (10**18) == 0)  # Exact ETH amounts
-            if round_numbers > len(values) * 0.7:
+            round_numbers = (values % 10**18 == 0).sum()  # Exact ETH amounts
+            if round_numbers > values.size * 0.7:
                 factors.append("Many round-number transactions")
                 score += 8
                 tags.append("Automated Activity")
         
         return {'score': score, 'factors': factors, 'tags': tags}
     
+    def _positive_values(self, transactions: List[Dict]) -> np.ndarray:
+        """Non-zero transaction values in wei as one array for vectorized checks"""
+        def positive():
+            return (tx['value_wei'] for tx in transactions if tx.get('value_wei', 0) > 0)
+        
+        try:
+            return np.fromiter(positive(), dtype=np.int64)
+        except OverflowError:
+            # int64 tops out around 9.2 ETH; larger amounts stay exact as Python ints
+            return np.array(list(positive()), dtype=object)
+    
     def _analyze_address_patterns(self, address: str) -> Dict:
         """Analyze the address itself for suspicious patterns"""
         score = 0
@@ -280,22 +299,28 @@ class RiskScorer:
         # Convert to lowercase for analysis
         addr_lower = address.lower()
         
-        # Check for vanity address patterns
-        if re.match(r'^0x[0]{8,}', addr_lower):
+        # Check for vanity address patterns with plain prefix/suffix comparisons
+        hex_part = addr_lower[2:]  # Remove '0x' prefix
+        hex_chars = set(hex_part)
+        is_hex = addr_lower.startswith('0x') and hex_chars <= _HEX_DIGITS
+        
+        if addr_lower.startswith('0x' + _VANITY_ZEROS):
             factors.append("Vanity address with leading zeros")
             score += 5
             tags.append("Vanity Address")
         
-        if re.match(r'^0x[a-f0-9]*[0]{8,}$', addr_lower):
+        if is_hex and hex_part.endswith(_VANITY_ZEROS):
             factors.append("Vanity address with trailing zeros")
             score += 5
             tags.append("Vanity Address")
         
-        # Check for repeating patterns
-        hex_part = addr_lower[2:]  # Remove '0x' prefix
-        for i in range(2, 8):  # Check for repeating 2-7 character patterns
-            pattern = hex_part[:i]
-            if hex_part == pattern * (len(hex_part) // i) + pattern[:len(hex_part) % i]:
+        # Check for repeating 2-7 character patterns. A pattern of length i has at
+        # most i distinct characters, so ordinary addresses (usually all 16 hex
+        # digits) are ruled out by the set size alone; otherwise the address
+        # repeats with period i exactly when it equals itself shifted by i.
+        for i in range(max(2, len(hex_chars)), 8):
+            if hex_part[i:] == hex_part[:max(0, len(hex_part) - i)]:
+                pattern = hex_part[:i]
                 factors.append(f"Address contains repeating pattern: {pattern}")
                 score += 8
                 tags.append("Patterned Address")
@@ -5,10 +5,18 @@ Alternative to API-based services using RPC endpoints
 
 import requests
 import json
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from app.utils.helpers import format_wei_to_ether
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# JSON-RPC error codes providers use for throttled calls inside a batch
+# (-32005 is the EIP-1474 "limit exceeded" code)
+_RATE_LIMIT_CODES = frozenset((429, -32005, -32029))
 
 class RPCService:
     """Service for direct blockchain interaction via RPC endpoints"""
@@ -26,6 +34,21 @@ class RPCService:
         
         self.current_rpc = self.rpc_urls['ethereum']  # Default to Ethereum
         
+        # One pooled, keep-alive session so repeated calls to a node reuse their
+        # TCP/TLS connection. Only read methods are sent, so POSTs are safe to retry.
+        retry = Retry(total=2, backoff_factor=0.1, status_forcelist=[429, 502, 503, 504],
+                      allowed_methods=None, respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=len(self.rpc_urls), pool_maxsize=32, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+        
+        # Calls per JSON-RPC batch (providers cap batch size, often at 100), and
+        # passes over a batch's throttled entries before giving up on them
+        self.max_batch_size = 100
+        self.max_batch_attempts = 3
+        
     def _make_rpc_call(self, method: str, params: List[Any], rpc_url: str = None) -> Dict:
         """Make RPC call to blockchain node"""
         
@@ -38,12 +61,8 @@ class RPCService:
             "id": 1
         }
         
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -58,12 +77,59 @@ class RPCService:
         except Exception as e:
             raise Exception(f"RPC call failed: {str(e)}")
     
+    def _make_rpc_batch(self, calls: List[Tuple[str, List[Any]]], rpc_url: str = None) -> List[Dict]:
+        """
+        Make several RPC calls in one JSON-RPC 2.0 batch request
+        
+        Returns one response object per call, in call order; each holds either
+        'result' or 'error', so callers decide how per-call failures surface.
+        """
+        
+        url = rpc_url or self.current_rpc
+        
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params,
+                "id": call_id
+            }
+            for call_id, (method, params) in enumerate(calls)
+        ]
+        
+        try:
+            response = self.session.post(url, json=payload, timeout=10)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            # Providers without batch support answer with a single error object
+            if not isinstance(data, list):
+                raise Exception(f"RPC batch rejected: {data.get('error', data) if isinstance(data, dict) else data}")
+            
+            # Responses may arrive in any order; match them back up by id
+            by_id = {item.get('id'): item for item in data if isinstance(item, dict)}
+            return [by_id.get(call_id, {'error': 'No response for call'}) for call_id in range(len(calls))]
+            
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC Network error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"RPC call failed: {str(e)}")
+    
     def set_chain(self, chain: str):
         """Switch to different blockchain"""
+        self.current_rpc = self._chain_rpc_url(chain)
+    
+    def _chain_rpc_url(self, chain: str) -> str:
+        """
+        RPC URL for a chain
+        
+        Lookups pass this URL to each call rather than switching current_rpc,
+        so concurrent lookups on different chains never see each other's node.
+        """
         if chain.lower() in self.rpc_urls:
-            self.current_rpc = self.rpc_urls[chain.lower()]
-        else:
-            raise Exception(f"Unsupported chain: {chain}")
+            return self.rpc_urls[chain.lower()]
+        raise Exception(f"Unsupported chain: {chain}")
     
     def get_balance(self, address: str, chain: str = 'ethereum') -> Dict:
         """Get native token balance via RPC"""
@@ -74,35 +140,43 @@ class RPCService:
             
             # Get balance in wei
             balance_hex = self._make_rpc_call('eth_getBalance', [address, 'latest'], rpc_url)
-            balance_wei = int(balance_hex, 16)
-            
-            return {
-                'balance': balance_wei,
-                'balance_ether': format_wei_to_ether(balance_wei),
-                'address': address,
-                'chain': chain,
-                'rpc_url': rpc_url,
-                'timestamp': datetime.now().isoformat()
-            }
+            return self._balance_result(address, chain, rpc_url, balance_hex)
             
         except Exception as e:
-            return {
-                'balance': 0,
-                'balance_ether': 0.0,
-                'address': address,
-                'chain': chain,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return self._balance_error(address, chain, e)
+    
+    def _balance_result(self, address: str, chain: str, rpc_url: str, balance_hex: str) -> Dict:
+        """Balance response for an eth_getBalance result"""
+        balance_wei = int(balance_hex, 16)
+        
+        return {
+            'balance': balance_wei,
+            'balance_ether': format_wei_to_ether(balance_wei),
+            'address': address,
+            'chain': chain,
+            'rpc_url': rpc_url,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _balance_error(self, address: str, chain: str, error: Exception) -> Dict:
+        """Balance response for a failed lookup"""
+        return {
+            'balance': 0,
+            'balance_ether': 0.0,
+            'address': address,
+            'chain': chain,
+            'error': str(error),
+            'timestamp': datetime.now().isoformat()
+        }
     
     def get_transaction_count(self, address: str, chain: str = 'ethereum') -> Dict:
         """Get transaction count (nonce) via RPC"""
         
         try:
-            self.set_chain(chain)
+            rpc_url = self._chain_rpc_url(chain)
             
             # Get transaction count
-            count_hex = self._make_rpc_call('eth_getTransactionCount', [address, 'latest'])
+            count_hex = self._make_rpc_call('eth_getTransactionCount', [address, 'latest'], rpc_url)
             tx_count = int(count_hex, 16)
             
             return {
@@ -125,10 +199,10 @@ class RPCService:
         """Get transaction details by hash"""
         
         try:
-            self.set_chain(chain)
+            rpc_url = self._chain_rpc_url(chain)
             
             # Get transaction
-            tx = self._make_rpc_call('eth_getTransactionByHash', [tx_hash])
+            tx = self._make_rpc_call('eth_getTransactionByHash', [tx_hash], rpc_url)
             
             if not tx:
                 return {
@@ -138,7 +212,7 @@ class RPCService:
                 }
             
             # Get transaction receipt for gas used
-            receipt = self._make_rpc_call('eth_getTransactionReceipt', [tx_hash])
+            receipt = self._make_rpc_call('eth_getTransactionReceipt', [tx_hash], rpc_url)
             
             # Process transaction data
             processed_tx = {
@@ -181,14 +255,14 @@ class RPCService:
         """Get block information"""
         
         try:
-            self.set_chain(chain)
+            rpc_url = self._chain_rpc_url(chain)
             
             # Convert block number if it's an integer
             if isinstance(block_number, int):
                 block_number = hex(block_number)
             
             # Get block
-            block = self._make_rpc_call('eth_getBlockByNumber', [block_number, False])
+            block = self._make_rpc_call('eth_getBlockByNumber', [block_number, False], rpc_url)
             
             if not block:
                 return {
@@ -229,10 +303,10 @@ class RPCService:
         """Check if address is a contract by getting code"""
         
         try:
-            self.set_chain(chain)
+            rpc_url = self._chain_rpc_url(chain)
             
             # Get code
-            code = self._make_rpc_call('eth_getCode', [address, 'latest'])
+            code = self._make_rpc_call('eth_getCode', [address, 'latest'], rpc_url)
             
             is_contract = code != '0x' and len(code) > 2
             
@@ -257,23 +331,26 @@ class RPCService:
         """Get blockchain network information"""
         
         try:
-            self.set_chain(chain)
+            rpc_url = self._chain_rpc_url(chain)
+            
+            # Get chain ID, latest block and gas price in a single round-trip
+            responses = self._make_rpc_batch([
+                ('eth_chainId', []),
+                ('eth_getBlockByNumber', ['latest', False]),
+                ('eth_gasPrice', [])
+            ], rpc_url)
+            for item in responses:
+                if 'error' in item:
+                    raise Exception(f"RPC Error: {item['error']}")
+            chain_id_hex, latest_block, gas_price_hex = (item.get('result') for item in responses)
             
-            # Get chain ID
-            chain_id_hex = self._make_rpc_call('eth_chainId', [])
             chain_id = int(chain_id_hex, 16)
-            
-            # Get latest block
-            latest_block = self._make_rpc_call('eth_getBlockByNumber', ['latest', False])
-            
-            # Get gas price
-            gas_price_hex = self._make_rpc_call('eth_gasPrice', [])
             gas_price = int(gas_price_hex, 16)
             
             return {
                 'chain': chain,
                 'chain_id': chain_id,
-                'rpc_url': self.current_rpc,
+                'rpc_url': rpc_url,
                 'latest_block': int(latest_block.get('number', '0x0'), 16),
                 'gas_price_wei': gas_price,
                 'gas_price_gwei': gas_price / 1e9,
@@ -290,11 +367,13 @@ class RPCService:
     def batch_get_balances(self, addresses: List[str], chain: str = 'ethereum') -> Dict:
         """Get balances for multiple addresses in batch"""
         
+        rpc_url = self.rpc_urls.get(chain.lower(), self.rpc_urls['ethereum'])
         results = []
         
-        for address in addresses:
-            balance_result = self.get_balance(address, chain)
-            results.append(balance_result)
+        # One JSON-RPC batch per max_batch_size addresses; each chunk retries or
+        # falls back on its own, so one rejected chunk does not sink the rest
+        for start in range(0, len(addresses), self.max_batch_size):
+            results.extend(self._batch_balances_chunk(addresses[start:start + self.max_batch_size], chain, rpc_url))
         
         return {
             'balances': results,
@@ -303,11 +382,64 @@ class RPCService:
             'timestamp': datetime.now().isoformat()
         }
     
+    def _batch_balances_chunk(self, addresses: List[str], chain: str, rpc_url: str) -> List[Dict]:
+        """Balances for one batch-sized slice of addresses, in input order"""
+        
+        results: List[Optional[Dict]] = [None] * len(addresses)
+        pending = list(range(len(addresses)))
+        
+        for attempt in range(self.max_batch_attempts):
+            if attempt:
+                time.sleep(min(2.0, 0.25 * 2 ** attempt))
+            
+            try:
+                responses = self._make_rpc_batch(
+                    [('eth_getBalance', [addresses[i], 'latest']) for i in pending], rpc_url
+                )
+            except Exception:
+                # Some providers reject batches; fall back to individual calls,
+                # run concurrently since each thread just waits on its socket
+                with ThreadPoolExecutor(max_workers=min(16, len(pending))) as executor:
+                    fetched = executor.map(lambda i: self.get_balance(addresses[i], chain), pending)
+                    for i, result in zip(pending, fetched):
+                        results[i] = result
+                return results
+            
+            # Entries throttled inside an otherwise good batch go round again
+            throttled = []
+            last_attempt = attempt == self.max_batch_attempts - 1
+            for i, item in zip(pending, responses):
+                error = item.get('error')
+                if error is not None and not last_attempt and self._is_rate_limited(error):
+                    throttled.append(i)
+                    continue
+                try:
+                    if error is not None:
+                        raise Exception(f"RPC Error: {error}")
+                    results[i] = self._balance_result(addresses[i], chain, rpc_url, item.get('result'))
+                except Exception as e:
+                    results[i] = self._balance_error(addresses[i], chain, e)
+            
+            if not throttled:
+                break
+            pending = throttled
+        
+        return results
+    
+    def _is_rate_limited(self, error: Any) -> bool:
+        """Whether a per-call JSON-RPC error reports throttling rather than a bad request"""
+        if isinstance(error, dict):
+            if error.get('code') in _RATE_LIMIT_CODES:
+                return True
+            error = error.get('message', '')
+        message = str(error).lower()
+        return 'rate limit' in message or 'too many requests' in message
+    
     def estimate_gas(self, from_address: str, to_address: str, value: str = '0x0', data: str = '0x', chain: str = 'ethereum') -> Dict:
         """Estimate gas for a transaction"""
         
         try:
-            self.set_chain(chain)
+            rpc_url = self._chain_rpc_url(chain)
             
             # Prepare transaction object
             tx_obj = {
@@ -318,11 +450,11 @@ class RPCService:
             }
             
             # Estimate gas
-            gas_hex = self._make_rpc_call('eth_estimateGas', [tx_obj])
+            gas_hex = self._make_rpc_call('eth_estimateGas', [tx_obj], rpc_url)
             gas_estimate = int(gas_hex, 16)
             
             # Get current gas price
-            gas_price_hex = self._make_rpc_call('eth_gasPrice', [])
+            gas_price_hex = self._make_rpc_call('eth_gasPrice', [], rpc_url)
             gas_price = int(gas_price_hex, 16)
             
             # Calculate estimated fee
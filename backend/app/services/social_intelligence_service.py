@@ -14,15 +14,16 @@ from ..database.models import SocialMention, SocialIntelligence
 class SocialIntelligenceService:
     """Service for collecting social media intelligence about addresses"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.logger = logging.getLogger(__name__)
         
         # API configurations
         self.twitter_bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
         self.telegram_bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         
-        # HTTP client for API calls
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # HTTP client for API calls. An injected client is owned by the caller.
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=30.0)
         
         # Ethereum address regex pattern
         self.eth_address_pattern = re.compile(r'0x[a-fA-F0-9]{40}')
@@ -37,7 +38,8 @@ class SocialIntelligenceService:
         
     async def close(self):
         """Close HTTP client"""
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     # === Twitter Intelligence ===
     
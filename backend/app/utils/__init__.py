@@ -4,4 +4,4 @@ Sentinel Utils - Helper Functions and Utilities
 
 from .helpers import *
 
-__all__ = ['is_valid_ethereum_address', 'format_wei_to_ether', 'format_address', 'validate_ethereum_address', 'handle_errors']
+__all__ = ['is_valid_ethereum_address', 'format_wei_to_ether', 'format_address', 'validate_ethereum_address', 'handle_errors', 'fast_jsonify', 'run_blocking']
@@ -3,11 +3,42 @@ Sentinel Helper Functions - Common Utilities
 """
 
 import re
-from typing import Optional
-from functools import wraps
-from flask import jsonify
+import asyncio
+import atexit
+import threading
+from typing import Awaitable, Callable, List, Optional
+from functools import wraps, partial
+from concurrent.futures import ThreadPoolExecutor
+from flask import jsonify, Response
+import httpx
 import logging
 
+try:
+    import msgspec
+    _json_encoder = msgspec.json.Encoder()
+except ImportError:
+    msgspec = None
+    _json_encoder = None
+
+try:
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared pool for blocking client calls made from coroutines. Each request runs
+# on its own event loop, whose default executor would be rebuilt every time.
+_blocking_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='sentinel-io')
+
+# One long-lived event loop, on its own thread, for every async service call made
+# from a sync Flask view. Pooled clients (httpx, aiohttp, redis) are bound to the
+# loop that opened their connections, so they can only be shared across requests
+# if every request runs on the same loop.
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+_async_cleanups: List[Callable[[], Awaitable]] = []
+_http_client: Optional[httpx.AsyncClient] = None
+
 def is_valid_ethereum_address(address: str) -> bool:
     """Validate if a string is a valid Ethereum address"""
     if not address:
@@ -37,6 +68,97 @@ def format_address(address: str, short: bool = False) -> str:
     else:
         return address
 
+def fast_jsonify(data, status: int = 200):
+    """Serialize a response payload with msgspec's native encoder, falling back to Flask's jsonify"""
+    if _json_encoder is not None:
+        try:
+            return Response(_json_encoder.encode(data), status=status, mimetype='application/json')
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            # Unsupported types, or integers wider than 64 bits on older msgspec releases - let Flask handle them
+            pass
+    return jsonify(data), status
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the shared I/O thread pool without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, partial(func, *args, **kwargs))
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """The shared service event loop, started on first use"""
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='sentinel-async', daemon=True).start()
+            _async_loop = loop
+        return _async_loop
+
+def run_async(coro):
+    """Run a coroutine on the shared service event loop and wait for its result
+    
+    For synchronous callers only; awaiting code should await the coroutine directly.
+    """
+    loop = _get_async_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_async called from the shared event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def in_shared_loop() -> bool:
+    """Whether the caller is a coroutine running on the shared service event loop"""
+    try:
+        return asyncio.get_running_loop() is _async_loop
+    except RuntimeError:
+        return False
+
+def on_async_shutdown(close: Callable[[], Awaitable]):
+    """Register a coroutine function to await on the shared event loop at interpreter exit"""
+    with _async_loop_lock:
+        _async_cleanups.append(close)
+
+@atexit.register
+def _shutdown_async_loop():
+    """Close registered async resources on their own loop, then stop it"""
+    loop = _async_loop
+    if loop is None:
+        return
+    
+    async def close_all():
+        for close in reversed(_async_cleanups):
+            try:
+                await close()
+            except Exception as e:
+                logging.warning(f"Error closing async resource: {str(e)}")
+    
+    try:
+        asyncio.run_coroutine_threadsafe(close_all(), loop).result(timeout=10)
+    except Exception as e:
+        logging.warning(f"Async shutdown incomplete: {str(e)}")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled httpx client for the async data services
+    
+    Only use it from coroutines running on the shared loop (see run_async); it
+    is closed there at interpreter exit. Multiplexes concurrent requests over
+    HTTP/2 when h2 is installed.
+    """
+    global _http_client
+    with _async_loop_lock:
+        if _http_client is None:
+            _http_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=200)
+            )
+            _async_cleanups.append(_http_client.aclose)
+        return _http_client
+
 def handle_errors(func):
     """Decorator to handle API errors gracefully"""
     @wraps(func)
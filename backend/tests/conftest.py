@@ -0,0 +1,10 @@
+"""
+Pytest setup for the backend service tests
+Run from backend/: python -m pytest tests
+"""
+
+import os
+import sys
+
+# Make the backend's `app` package importable however pytest is invoked
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
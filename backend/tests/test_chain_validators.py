@@ -0,0 +1,78 @@
+"""
+Chain validator tests - address format checks against the original implementations
+"""
+
+import base58
+import pytest
+
+from app.services._chain_validators import is_bitcoin_address, is_ethereum_address, is_solana_address
+
+def reference_is_ethereum(address):
+    return len(address) == 42 and address.startswith('0x') and all(c in '0123456789abcdefABCDEF' for c in address[2:])
+
+def reference_is_solana(address):
+    try:
+        if len(address) < 32 or len(address) > 44:
+            return False
+        return len(base58.b58decode(address)) == 32
+    except Exception:
+        return False
+
+SOLANA_KEY = base58.b58encode(bytes(range(32))).decode()
+
+@pytest.mark.parametrize('address', [
+    SOLANA_KEY,
+    base58.b58encode(b'\xff' * 32).decode(),
+    '11111111111111111111111111111111',
+    'So11111111111111111111111111111111111111112',
+    base58.b58encode(bytes(31)).decode(),
+    base58.b58encode(b'\x01' * 33).decode(),
+    '1A1zP1eFfh7DefPMY5A1zP1eFfh7DefPMY',
+    SOLANA_KEY[:-1] + '0',
+    SOLANA_KEY[:-1] + 'l',
+    SOLANA_KEY[:-1] + 'é',
+    '0x' + 'ab' * 20,
+    '',
+])
+def test_solana_matches_reference(address):
+    assert is_solana_address(address) is reference_is_solana(address)
+
+def test_solana_rejects_surrounding_whitespace():
+    # base58.b58decode strips it, so the original check accepted padded keys
+    assert not is_solana_address(SOLANA_KEY + ' ')
+    assert not is_solana_address(' ' + SOLANA_KEY)
+
+@pytest.mark.parametrize('address', [
+    '0x' + 'ab' * 20,
+    '0x3f5CE5FBFe3E9af3971dD833D26bA9b5C936f0bE',
+    '0x' + '0' * 40,
+    '0X' + 'ab' * 20,
+    '0x' + 'ab' * 19 + 'ag',
+    '0x' + 'ab' * 19 + 'a',
+    '0x' + 'ab' * 21,
+    '0x' + 'ab' * 19 + 'a٠',
+    '0x' + 'ab' * 19 + 'ａｂ',
+    '00' + 'ab' * 20,
+    '0x' + ' ' * 40,
+    '',
+])
+def test_ethereum_matches_reference(address):
+    assert is_ethereum_address(address) is reference_is_ethereum(address)
+
+@pytest.mark.parametrize('address, expected', [
+    ('1A1zP1eFfh7DefPMY5A1zP1eFfh7DefPMY', True),
+    ('3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy', True),
+    ('bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq', True),
+    ('BC1QAR0SRRR7XFKVY5L643LYDNW9RE59GTZZWF5MDQ', True),
+    ('1A1zP1eFfh7DefPMY5A1zP1eFfh7DefPM0', False),
+    ('1short', False),
+    ('1' + 'A' * 35, False),
+    ('bc1Qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq', False),
+    ('bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdb', False),
+    ('bc1qshort', False),
+    ('2NBFNJTktNa7GZusGbDbGKRZTxdK9VVez3n', False),
+    ('0x' + 'ab' * 20, False),
+    ('1A1zP1eFfh7DefPMY5A1zP1eFfh7DefPMé', False),
+])
+def test_bitcoin_address_format(address, expected):
+    assert is_bitcoin_address(address) is expected
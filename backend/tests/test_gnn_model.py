@@ -0,0 +1,146 @@
+"""
+GNN model tests - save/load/predict round trip, prediction cache and timestamp parsing
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import torch
+from sklearn.preprocessing import StandardScaler
+
+from app.services.gnn_model import (
+    GNNIntelligenceEngine,
+    WalletGraphSAGE,
+    WalletPrediction,
+    _parse_timestamps,
+)
+
+def make_wallet(seed: int):
+    """(address, graph_data, transaction_data) with a few days of history"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    transactions = [
+        {
+            'value_wei': int(rng.integers(1, 50)) * 10**17,
+            'gas_used': int(rng.integers(21000, 200000)),
+            'timestamp': (start + timedelta(hours=int(h))).isoformat() + 'Z',
+            'to': f"0x{int(rng.integers(0, 2**32)):040x}"
+        }
+        for h in np.sort(rng.integers(0, 24 * 30, size=12))
+    ]
+    graph_data = {
+        'incoming_count': int(rng.integers(0, 40)),
+        'outgoing_count': int(rng.integers(0, 40)),
+        'total_received': int(rng.integers(0, 100)) * 10**18,
+        'total_sent': int(rng.integers(0, 100)) * 10**18,
+    }
+    return f"0x{seed:040x}", graph_data, transactions
+
+@pytest.fixture
+def trained_engine(tmp_path):
+    """Engine with a freshly initialized model and fitted scaler, saved to tmp_path"""
+    torch.manual_seed(0)
+    engine = GNNIntelligenceEngine(model_path=str(tmp_path / 'models' / 'wallet_gnn_model.pt'))
+    engine.model = WalletGraphSAGE(input_dim=engine.feature_dim, hidden_dim=128,
+                                   num_classes=len(engine.class_labels)).eval()
+    wallets = [make_wallet(seed) for seed in range(40)]
+    engine.feature_scaler = StandardScaler().fit(np.stack([engine.engineer_features(*w) for w in wallets]))
+    engine.is_trained = True
+    assert engine.save_model()
+    return engine
+
+def eager_prediction(engine, wallet):
+    """Risk score and class probabilities straight from the eager FP32 model"""
+    features = engine.engineer_features(*wallet)
+    scaled = engine.feature_scaler.transform(features[None, :]).astype(np.float32)
+    with torch.no_grad():
+        outputs = engine.model(torch.from_numpy(scaled))
+    return outputs['risk_scores'][0, 0].item(), torch.softmax(outputs['classifications'], dim=1)[0].tolist()
+
+def test_save_load_predict_round_trip(trained_engine):
+    loaded = GNNIntelligenceEngine(model_path=trained_engine.model_path)
+    assert loaded.is_trained
+    assert loaded.feature_dim == trained_engine.feature_dim
+    assert loaded.class_labels == trained_engine.class_labels
+    np.testing.assert_allclose(loaded.feature_scaler.mean_, trained_engine.feature_scaler.mean_, rtol=1e-6)
+    
+    for seed in (100, 101, 102):
+        wallet = make_wallet(seed)
+        prediction = loaded.predict_single_wallet(*wallet)
+        risk_score, class_probs = eager_prediction(trained_engine, wallet)
+        
+        assert isinstance(prediction, WalletPrediction)
+        assert prediction.model_version == 'GNN_v1.0'
+        assert prediction.risk_score == pytest.approx(risk_score, abs=1e-3)
+        assert list(prediction.class_probabilities.values()) == pytest.approx(class_probs, abs=1e-4)
+
+def test_batch_prediction_matches_single(trained_engine):
+    engine = GNNIntelligenceEngine(model_path=trained_engine.model_path)
+    wallets = [make_wallet(seed) for seed in range(200, 206)]
+    
+    batch = engine.predict_many_wallets(wallets)
+    singles = [engine.predict_single_wallet(*wallet) for wallet in wallets]
+    
+    assert [p.predicted_class for p in batch] == [p.predicted_class for p in singles]
+    for batched, single in zip(batch, singles):
+        assert batched.risk_score == pytest.approx(single.risk_score, abs=1e-3)
+
+def test_batch_prediction_leaves_thread_count(trained_engine):
+    engine = GNNIntelligenceEngine(model_path=trained_engine.model_path)
+    threads = torch.get_num_threads()
+    engine.predict_many_wallets([make_wallet(seed) for seed in range(3)])
+    assert torch.get_num_threads() == threads
+
+def test_cached_prediction_is_not_shared(trained_engine):
+    engine = GNNIntelligenceEngine(model_path=trained_engine.model_path)
+    wallet = make_wallet(300)
+    
+    first = engine.predict_single_wallet(*wallet)
+    first.behavioral_tags.append('mutated')
+    first.class_probabilities.clear()
+    
+    second = engine.predict_single_wallet(*wallet)
+    assert 'mutated' not in second.behavioral_tags
+    assert second.class_probabilities
+    assert second is not engine.predict_single_wallet(*wallet)
+
+def test_untrained_engine_falls_back_to_heuristics(tmp_path):
+    engine = GNNIntelligenceEngine(model_path=str(tmp_path / 'missing.pt'))
+    prediction = engine.predict_single_wallet(*make_wallet(1))
+    assert prediction.model_version == 'Heuristic_Fallback'
+
+def test_quantization_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv('GNN_QUANTIZE_INT8', raising=False)
+    assert not GNNIntelligenceEngine(model_path=str(tmp_path / 'missing.pt')).quantize
+    monkeypatch.setenv('GNN_QUANTIZE_INT8', 'true')
+    assert GNNIntelligenceEngine(model_path=str(tmp_path / 'missing.pt')).quantize
+
+# === Timestamp parsing ===
+
+def test_parse_timestamps_z_suffix_is_aware():
+    dates, tz_aware = _parse_timestamps(['2024-01-01T00:00:00Z', '2024-01-01T06:00:00Z'])
+    assert tz_aware
+    assert dates.tolist() == [datetime(2024, 1, 1), datetime(2024, 1, 1, 6)]
+
+def test_parse_timestamps_normalizes_offsets():
+    with pytest.warns(UserWarning):
+        dates, tz_aware = _parse_timestamps(['2024-01-01T00:00:00-05:00', '2024-01-01T06:00:00Z'])
+    assert tz_aware
+    assert dates.tolist() == [datetime(2024, 1, 1, 5), datetime(2024, 1, 1, 6)]
+
+def test_parse_timestamps_ignores_numeric_epochs():
+    dates, _ = _parse_timestamps([1704067200, '2024-01-02T00:00:00', 1704153600.0])
+    assert dates.tolist() == [datetime(2024, 1, 2)]
+    
+    dates, tz_aware = _parse_timestamps([1704067200, 1704153600])
+    assert dates.size == 0 and not tz_aware
+
+def test_parse_timestamps_mixed_awareness_is_empty():
+    dates, _ = _parse_timestamps(['2024-01-01T00:00:00', '2024-01-02T00:00:00Z'])
+    assert dates.size == 0
+
+def test_parse_timestamps_drops_bad_entries():
+    dates, tz_aware = _parse_timestamps(['2024-01-01T00:00:00', 'garbage', '2024-01-03'])
+    assert not tz_aware
+    assert dates.tolist() == [datetime(2024, 1, 1), datetime(2024, 1, 3)]
@@ -0,0 +1,328 @@
+"""
+Graph Protocol Service tests - batched fetches, pattern analysis, row processing and the query cache
+"""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+
+from app.services.graph_protocol_service import (
+    GraphProtocolService,
+    RelationshipRow,
+    TransactionRow,
+    _ERC20_TRANSFERS_DOC,
+    _RateLimiter,
+)
+
+ADDRESS = '0x' + 'ab' * 20
+
+def transfer(n, sender, receiver, value_wei, timestamp, nested=True):
+    """A transfer as the ERC20 subgraph returns it, or a raw transaction with inline metadata"""
+    meta = {'id': f"0x{n:064x}", 'blockNumber': str(1000 + n), 'gasUsed': str(21000 + n), 'gasPrice': str(10**9)}
+    tx = {'from': sender, 'to': receiver, 'value': str(value_wei), 'timestamp': str(timestamp)}
+    if nested:
+        tx.update(id=f"{meta['id']}-0", transaction=meta)
+    else:
+        tx.update(meta)
+    return tx
+
+def history(count, interval=3600, value_wei=10**18, counterparts=None, start=1704067200):
+    """Newest-first history of `count` transfers between ADDRESS and a rotating set of counterparts"""
+    counterparts = counterparts or [f"0x{i:040x}" for i in range(count)]
+    return [
+        transfer(i, counterparts[i % len(counterparts)].upper().replace('0X', '0x'), ADDRESS, value_wei,
+                 start + (count - i) * interval)
+        for i in range(count)
+    ]
+
+def reference_patterns(address, transactions):
+    """Statistics and detected patterns as the original per-field list passes computed them"""
+    timestamps = [int(tx.get('timestamp', 0)) for tx in transactions]
+    time_diffs = [timestamps[i] - timestamps[i + 1] for i in range(len(timestamps) - 1)]
+    avg_interval = sum(time_diffs) / len(time_diffs) if time_diffs else 0
+    values = [float(tx.get('value', 0)) / 10**18 for tx in transactions]
+    counterparts = set()
+    for tx in transactions:
+        for addr in (tx.get('from', '').lower(), tx.get('to', '').lower()):
+            if addr != address.lower():
+                counterparts.add(addr)
+    
+    temporal = {
+        'average_interval_seconds': avg_interval,
+        'first_transaction': datetime.fromtimestamp(min(timestamps)).isoformat(),
+        'last_transaction': datetime.fromtimestamp(max(timestamps)).isoformat(),
+        'time_span_days': (max(timestamps) - min(timestamps)) / 86400,
+        'activity_frequency': (len(transactions) / ((max(timestamps) - min(timestamps)) / 86400)
+                               if max(timestamps) != min(timestamps) else 0)
+    }
+    value = {
+        'total_volume': sum(values),
+        'average_value': sum(values) / len(values),
+        'max_value': max(values),
+        'min_value': min(values),
+        'round_number_ratio': sum(1 for v in values if v == int(v)) / len(values)
+    }
+    diversity = len(counterparts) / len(transactions)
+    
+    patterns = []
+    if avg_interval > 0:
+        regular = sum(1 for diff in time_diffs if abs(diff - avg_interval) < avg_interval * 0.1)
+        if regular > len(time_diffs) * 0.7:
+            patterns.append('regular_intervals')
+    if value['round_number_ratio'] > 0.7:
+        patterns.append('round_values')
+    if diversity < 0.1:
+        patterns.append('low_diversity')
+    return temporal, value, counterparts, diversity, patterns
+
+class FakeClient:
+    """Stands in for a gql Client; `responses` are results to return or errors to raise, in order"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.transport = None
+    
+    async def execute_async(self, query, variable_values=None):
+        self.calls.append(variable_values)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+@pytest.fixture
+def service():
+    service = GraphProtocolService()
+    # Unthrottled and without backoff sleeps
+    service._limiter = _RateLimiter(rate=10**6)
+    service.max_retry_delay = 0.0
+    return service
+
+def serve_transactions(service, monkeypatch, transactions):
+    async def get_address_transactions(address, limit=1000, skip=0):
+        return transactions
+    monkeypatch.setattr(service, 'get_address_transactions', get_address_transactions)
+
+# === Bulk fetches ===
+
+def test_bulk_fetch_sends_one_query_per_batch(service, monkeypatch):
+    addresses = [f"0x{i:040X}" for i in range(25)]
+    queries = []
+    
+    async def query_subgraph(subgraph_name, query, variables=None, cacheable=True):
+        queries.append(variables)
+        return {alias: [transfer(i, address, ADDRESS, 10**18, 1704067200 + i)]
+                for i, (alias, address) in enumerate(variables.items())}
+    monkeypatch.setattr(service, 'query_subgraph', query_subgraph)
+    
+    data = asyncio.run(service.bulk_fetch_address_data(addresses, batch_size=10))
+    
+    assert [len(variables) for variables in queries] == [10, 10, 5]
+    assert list(queries[1].values()) == [address.lower() for address in addresses[10:20]]
+    assert len(data['transactions']) == 25
+    assert set(data['addresses']) == {address.lower() for address in addresses} | {ADDRESS}
+
+def test_bulk_fetch_falls_back_to_single_queries(service, monkeypatch):
+    addresses = [f"0x{i:040x}" for i in range(3)]
+    
+    async def query_subgraph(subgraph_name, query, variables=None, cacheable=True):
+        if 'a0' in variables:
+            raise TransportQueryError('query too complex')
+        return {'transfers': [transfer(1, variables['address'], ADDRESS, 10**18, 1704067200)]}
+    monkeypatch.setattr(service, 'query_subgraph', query_subgraph)
+    
+    data = asyncio.run(service.bulk_fetch_address_data(addresses))
+    
+    assert len(data['transactions']) == 3
+    assert set(data['addresses']) == set(addresses) | {ADDRESS}
+
+# === Address pattern analysis ===
+
+@pytest.mark.parametrize('transactions', [
+    history(40),
+    history(40, value_wei=15 * 10**17),
+    history(60, counterparts=['0x' + 'cd' * 20]),
+    [transfer(i, ADDRESS, f"0x{i % 7:040x}", (i * 7919) * 10**15, 1704067200 + 1000 - i * (i % 5 + 1) * 60)
+     for i in range(30)],
+])
+def test_pattern_statistics_match_reference(service, monkeypatch, transactions):
+    serve_transactions(service, monkeypatch, transactions)
+    
+    analysis = asyncio.run(service.analyze_address_patterns(ADDRESS))
+    temporal, value, counterparts, diversity, patterns = reference_patterns(ADDRESS, transactions)
+    
+    assert analysis['total_transactions'] == len(transactions)
+    assert analysis['temporal_analysis'] == pytest.approx(temporal)
+    assert analysis['value_analysis'] == pytest.approx(value)
+    network = analysis['network_analysis']
+    assert network['unique_counterparts'] == len(counterparts)
+    assert network['network_diversity'] == pytest.approx(diversity)
+    assert set(network['top_counterparts']) <= counterparts
+    assert analysis['patterns']['detected_patterns'] == patterns
+    assert analysis['patterns']['suspicion_score'] == min(len(patterns) * 25, 100)
+
+def test_regular_round_circular_history_flags_all_patterns(service, monkeypatch):
+    serve_transactions(service, monkeypatch, history(60, counterparts=['0x' + 'cd' * 20]))
+    analysis = asyncio.run(service.analyze_address_patterns(ADDRESS))
+    assert analysis['patterns']['detected_patterns'] == ['regular_intervals', 'round_values', 'low_diversity']
+
+def test_no_transactions(service, monkeypatch):
+    serve_transactions(service, monkeypatch, [])
+    analysis = asyncio.run(service.analyze_address_patterns(ADDRESS))
+    assert analysis == {'address': ADDRESS, 'patterns': {}, 'analysis': 'No transaction data available'}
+
+def test_small_history_skips_numeric_passes(service, monkeypatch):
+    serve_transactions(service, monkeypatch, history(3))
+    
+    analysis = asyncio.run(service.analyze_address_patterns(ADDRESS))
+    
+    assert analysis['temporal_analysis'] == {} and analysis['value_analysis'] == {}
+    assert analysis['network_analysis']['unique_counterparts'] == 3
+    assert analysis['patterns'] == {'detected_patterns': [], 'pattern_count': 0, 'suspicion_score': 0}
+
+def test_only_requested_sections_computed(service, monkeypatch):
+    serve_transactions(service, monkeypatch, history(40))
+    
+    analysis = asyncio.run(service.analyze_address_patterns(ADDRESS, include=frozenset({'value'})))
+    
+    assert analysis['value_analysis']['total_volume'] == pytest.approx(40.0)
+    assert analysis['temporal_analysis'] == {} and analysis['network_analysis'] == {}
+    assert analysis['patterns'] == {}
+
+def test_top_counterparts_ranked_by_interactions(service, monkeypatch):
+    ranked = [f"0x{i:040x}" for i in range(1, 13)]
+    # Counterpart k interacts 13 - k times; one transfer has no sender
+    transactions = [transfer(n, counterpart, ADDRESS, 10**18, 1704067200 + n)
+                    for n, counterpart in enumerate(c for k, c in enumerate(ranked) for _ in range(12 - k))]
+    transactions.append(transfer(999, '', ADDRESS, 10**18, 1704067200))
+    serve_transactions(service, monkeypatch, transactions)
+    
+    analysis = asyncio.run(service.analyze_address_patterns(ADDRESS, include=frozenset({'network'})))
+    
+    assert analysis['network_analysis']['top_counterparts'] == ranked[:10]
+    assert analysis['network_analysis']['unique_counterparts'] == 12
+
+# === Row processing ===
+
+def test_nested_and_inline_metadata_processed_alike(service):
+    nested = transfer(5, '0x' + 'AA' * 20, ADDRESS, 2 * 10**18, 1704067200)
+    inline = transfer(5, '0x' + 'AA' * 20, ADDRESS, 2 * 10**18, 1704067200, nested=False)
+    
+    rows = [service.process_transactions_for_neo4j([tx]) for tx in (nested, inline)]
+    
+    expected = TransactionRow(f"0x{5:064x}", 1005, datetime.fromtimestamp(1704067200), 2.0, 21005, 10**9)
+    for processed in rows:
+        assert processed['transactions'] == [expected]
+        assert list(processed['addresses']) == ['0x' + 'aa' * 20, ADDRESS]
+        relationship = processed['relationships'][0]
+        assert (relationship.from_hash, relationship.to_hash, relationship.value) == ('0x' + 'aa' * 20, ADDRESS, 2.0)
+
+def test_first_appearance_sets_address_dates(service):
+    transactions = [transfer(i, f"0x{i % 2:040x}", ADDRESS, 10**18, 1704067200 - i * 60) for i in range(4)]
+    
+    processed = service.process_transactions_for_neo4j(transactions)
+    
+    assert processed['addresses'][ADDRESS].first_seen == datetime.fromtimestamp(1704067200)
+    assert processed['addresses'][f"0x{1:040x}"].first_seen == datetime.fromtimestamp(1704067200 - 60)
+    assert len(processed['relationships']) == 4
+
+def test_relationships_carry_gas_used(service):
+    processed = service.process_transactions_for_neo4j([transfer(7, '0x' + '11' * 20, ADDRESS, 10**18, 1704067200)])
+    assert processed['relationships'] == [
+        RelationshipRow('0x' + '11' * 20, ADDRESS, f"0x{7:064x}", 1.0, datetime.fromtimestamp(1704067200), 21007)
+    ]
+
+# === Address network ===
+
+def test_network_fetches_each_address_once_and_dedupes_edges(service, monkeypatch):
+    a, b, c = (f"0x{i:040x}" for i in range(1, 4))
+    # a <-> b transfer seen from both ends, b -> c only from b and c
+    edges = {
+        a: [transfer(1, a, b, 2 * 10**18, 1704067200)],
+        b: [transfer(1, a, b, 2 * 10**18, 1704067200), transfer(2, b, c, 5 * 10**18, 1704067300)],
+        c: [transfer(2, b, c, 5 * 10**18, 1704067300), transfer(3, c, a, 10**17, 1704067400)],
+    }
+    fetched = []
+    
+    async def get_address_transactions(address, limit=1000, skip=0):
+        fetched.append(address)
+        return edges[address]
+    monkeypatch.setattr(service, 'get_address_transactions', get_address_transactions)
+    
+    network = asyncio.run(service.get_address_network(a, depth=3))
+    
+    assert sorted(fetched) == [a, b, c]
+    assert [(edge['from'], edge['to'], edge['value']) for edge in network['edges']] == [(a, b, 2.0), (b, c, 5.0)]
+    assert set(network['nodes']) == {a, b, c}
+
+# === Query cache ===
+
+def test_cached_results_are_copies(service, monkeypatch):
+    client = FakeClient([{'transfers': [{'id': '1', 'value': '5'}]}])
+    monkeypatch.setattr(service, '_get_client', lambda endpoint: client)
+    variables = {'address': ADDRESS, 'limit': 10, 'skip': 0}
+    
+    first = asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, variables))
+    first['transfers'][0]['value'] = 'mutated'
+    second = asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, variables))
+    
+    assert len(client.calls) == 1
+    assert second == {'transfers': [{'id': '1', 'value': '5'}]}
+
+def test_cache_entries_expire(service, monkeypatch):
+    client = FakeClient([{'n': 1}, {'n': 2}])
+    monkeypatch.setattr(service, '_get_client', lambda endpoint: client)
+    service._query_cache_ttl = -1.0
+    variables = {'address': ADDRESS, 'limit': 10, 'skip': 0}
+    
+    asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, variables))
+    result = asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, variables))
+    
+    assert result == {'n': 2}
+    assert len(client.calls) == 2
+
+def test_cache_evicts_least_recently_used(service):
+    service._query_cache_size = 2
+    service._cache_put(('a',), {'n': 1})
+    service._cache_put(('b',), {'n': 2})
+    service._cache_get(('a',))
+    service._cache_put(('c',), {'n': 3})
+    
+    assert service._cache_get(('b',)) is None
+    assert service._cache_get(('a',)) == {'n': 1}
+
+# === Retries and circuit breaker ===
+
+def test_transient_failures_are_retried(service, monkeypatch):
+    client = FakeClient([httpx.ConnectError('reset'), TransportServerError('busy', 503), {'ok': True}])
+    monkeypatch.setattr(service, '_get_client', lambda endpoint: client)
+    
+    result = asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, {}, cacheable=False))
+    
+    assert result == {'ok': True}
+    assert len(client.calls) == 3
+    assert service._breaker == {}
+
+def test_query_errors_are_not_retried(service, monkeypatch):
+    client = FakeClient([TransportQueryError('bad field'), {'ok': True}])
+    monkeypatch.setattr(service, '_get_client', lambda endpoint: client)
+    
+    with pytest.raises(TransportQueryError):
+        asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, {}, cacheable=False))
+    assert len(client.calls) == 1
+
+def test_circuit_opens_after_repeated_failures(service, monkeypatch):
+    client = FakeClient([TransportServerError('down', 502)] * 10)
+    monkeypatch.setattr(service, '_get_client', lambda endpoint: client)
+    
+    for _ in range(2):
+        with pytest.raises(TransportServerError):
+            asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, {}, cacheable=False))
+    assert len(client.calls) == service.breaker_threshold
+    
+    with pytest.raises(RuntimeError, match='circuit open'):
+        asyncio.run(service.query_subgraph('ethereum_erc20', _ERC20_TRANSFERS_DOC, {}, cacheable=False))
+    assert len(client.calls) == service.breaker_threshold
@@ -0,0 +1,62 @@
+"""
+Helper tests - msgspec response encoding and its jsonify fallback
+"""
+
+import json
+
+import pytest
+from flask import Flask, Response
+
+from app.utils import helpers
+from app.utils.helpers import fast_jsonify
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    with app.app_context():
+        yield app
+
+def decode(result):
+    """(payload, status) from either fast_jsonify return shape"""
+    if isinstance(result, Response):
+        return json.loads(result.get_data()), result.status_code
+    response, status = result
+    return json.loads(response.get_data()), status
+
+@pytest.mark.skipif(helpers.msgspec is None, reason="msgspec not installed")
+def test_msgspec_path_encodes_payload(app):
+    payload = {'address': '0x' + 'ab' * 20, 'risk_score': 42.5, 'tags': ['MEV Bot'], 'balance_wei': 2**63 - 1}
+    
+    result = fast_jsonify(payload, 201)
+    
+    assert isinstance(result, Response)
+    assert result.mimetype == 'application/json'
+    assert decode(result) == (payload, 201)
+
+class WideIntEncoder:
+    """Stands in for older msgspec releases, which reject integers wider than 64 bits"""
+    
+    def encode(self, data):
+        raise OverflowError("can't serialize ints < -2**63 or > 2**64 - 1")
+
+def test_wei_values_above_64_bits_stay_exact(app):
+    payload = {'balance_wei': 2**64 + 1, 'transactions': [{'value_wei': 10**30}]}
+    assert decode(fast_jsonify(payload)) == (payload, 200)
+
+def test_wei_values_above_64_bits_fall_back_to_jsonify(app, monkeypatch):
+    monkeypatch.setattr(helpers, '_json_encoder', WideIntEncoder())
+    payload = {'balance_wei': 2**64 + 1, 'transactions': [{'value_wei': 10**30}]}
+    
+    result = fast_jsonify(payload, 201)
+    
+    # Flask's jsonify returns a (response, status) pair and keeps the integers exact
+    assert isinstance(result, tuple)
+    assert decode(result) == (payload, 201)
+
+def test_jsonify_used_without_msgspec(app, monkeypatch):
+    monkeypatch.setattr(helpers, '_json_encoder', None)
+    
+    result = fast_jsonify({'risk_score': 10}, 404)
+    
+    assert isinstance(result, tuple)
+    assert decode(result) == ({'risk_score': 10}, 404)
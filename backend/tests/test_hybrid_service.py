@@ -0,0 +1,171 @@
+"""
+Hybrid Service tests - concurrent source fetches and the data-source status cache
+"""
+
+import threading
+
+import pytest
+
+import app.services.hybrid_service as hybrid_module
+from app.services.hybrid_service import HybridService
+from app.utils.helpers import run_async
+
+ADDRESS = '0x' + 'ab' * 20
+
+class Probes:
+    """Counts the blocking calls behind the RPC and Etherscan status probes"""
+    
+    def __init__(self):
+        self.rpc = 0
+        self.api = 0
+    
+    def install(self, service):
+        def get_available_chains():
+            self.rpc += 1
+            return {'chains': ['ethereum', 'polygon']}
+        
+        def get_balance(address):
+            self.api += 1
+            return {'balance': 1, 'balance_ether': 1e-18}
+        service.rpc_service.get_available_chains = get_available_chains
+        service.etherscan_service.get_balance = get_balance
+
+@pytest.fixture(autouse=True)
+def fresh_module_state(monkeypatch):
+    # Status and last-success caches are shared across instances; isolate each test
+    monkeypatch.setattr(hybrid_module, '_status_cache', {})
+    monkeypatch.setattr(hybrid_module, '_last_success', {})
+
+def stub_sources(service, barrier=None):
+    def wait():
+        if barrier is not None:
+            barrier.wait()
+    
+    def rpc_balance(address, chain='ethereum'):
+        wait()
+        return {'balance': 2 * 10**18, 'balance_ether': 2.0}
+    
+    def api_balance(address):
+        wait()
+        return {'balance': 3 * 10**18, 'balance_ether': 3.0}
+    
+    def api_transactions(address, limit=10000):
+        wait()
+        return {'transactions': [{'hash': f"0x{i:064x}"} for i in range(8)]}
+    service.rpc_service.get_balance = rpc_balance
+    service.etherscan_service.get_balance = api_balance
+    service.etherscan_service.get_transactions = api_transactions
+
+# === Comprehensive analysis ===
+
+def test_sources_are_fetched_concurrently(monkeypatch):
+    service = HybridService('key-a')
+    # Each blocking call waits for the other two; run one after another they would time out
+    stub_sources(service, threading.Barrier(3, timeout=5))
+    
+    result = run_async(service.analyze_wallet_comprehensive(ADDRESS))
+    
+    assert result['data_sources_used'] == ['RPC', 'Etherscan API']
+    assert result['wallet_info']['balance']['source'] == 'API (Etherscan)'
+    assert result['wallet_info']['transaction_history']['total_count'] == 8
+    assert len(result['wallet_info']['transaction_history']['recent_transactions']) == 5
+
+def test_other_chains_skip_etherscan():
+    service = HybridService('key-a')
+    stub_sources(service)
+    
+    def unexpected(*args, **kwargs):
+        raise AssertionError("Etherscan only serves Ethereum")
+    service.etherscan_service.get_balance = unexpected
+    
+    result = run_async(service.analyze_wallet_comprehensive(ADDRESS, chain='polygon'))
+    
+    assert result['data_sources_used'] == ['RPC']
+    assert result['wallet_info']['balance'] == {'wei': 2 * 10**18, 'ether': 2.0, 'source': 'RPC', 'confidence': 'high'}
+
+def test_failed_api_falls_back_to_rpc_balance():
+    service = HybridService('key-a')
+    stub_sources(service)
+    
+    def failing(*args, **kwargs):
+        raise ConnectionError('etherscan down')
+    service.etherscan_service.get_transactions = failing
+    
+    result = run_async(service.analyze_wallet_comprehensive(ADDRESS))
+    
+    assert result['data_sources_used'] == ['RPC'] and 'api_data' not in result
+    assert result['wallet_info']['balance']['source'] == 'RPC'
+    assert 'transaction_history' not in result['wallet_info']
+
+# === Data source status ===
+
+def test_status_is_cached_per_api_key():
+    probes = Probes()
+    first, same_key, other_key = HybridService('key-a'), HybridService('key-a'), HybridService('key-b')
+    for service in (first, same_key, other_key):
+        probes.install(service)
+    
+    status = run_async(first.get_data_source_status())
+    run_async(same_key.get_data_source_status())
+    assert (probes.rpc, probes.api) == (1, 1)
+    assert status['sources']['rpc'] == {'status': 'available', 'chains': 2,
+                                        'details': {'chains': ['ethereum', 'polygon']}}
+    assert status['sources']['etherscan_api']['status'] == 'available'
+    
+    run_async(other_key.get_data_source_status())
+    assert (probes.rpc, probes.api) == (2, 2)
+
+def test_status_cache_expires(monkeypatch):
+    monkeypatch.setattr(hybrid_module, 'STATUS_CACHE_TTL', 0.0)
+    probes = Probes()
+    service = HybridService('key-a')
+    probes.install(service)
+    
+    run_async(service.get_data_source_status())
+    run_async(service.get_data_source_status())
+    
+    assert (probes.rpc, probes.api) == (2, 2)
+
+def test_probe_errors_are_reported():
+    service = HybridService('key-a')
+    
+    def failing(*args, **kwargs):
+        raise ConnectionError('unreachable')
+    service.rpc_service.get_available_chains = failing
+    service.etherscan_service.get_balance = failing
+    
+    status = run_async(service.get_data_source_status())
+    
+    assert status['sources']['rpc'] == {'status': 'error', 'error': 'unreachable'}
+    assert status['sources']['etherscan_api'] == {'status': 'error', 'error': 'unreachable',
+                                                  'api_key_configured': True}
+
+def test_recent_success_skips_etherscan_probe():
+    service = HybridService('key-a')
+    stub_sources(service)
+    run_async(service.analyze_wallet_comprehensive(ADDRESS))
+    
+    probes = Probes()
+    probes.install(service)
+    status = run_async(service.get_data_source_status())
+    
+    assert probes.api == 0
+    assert status['sources']['etherscan_api'] == {'status': 'available', 'api_key_configured': True}
+
+def test_recent_success_is_keyed_by_api_key():
+    stubbed = HybridService('key-a')
+    stub_sources(stubbed)
+    run_async(stubbed.analyze_wallet_comprehensive(ADDRESS))
+    
+    # A success under key-a says nothing about key-b; its probe still runs and fails
+    other = HybridService('key-b')
+    
+    def rejected(address):
+        raise PermissionError('Invalid API Key')
+    other.rpc_service.get_available_chains = lambda: {'chains': []}
+    other.etherscan_service.get_balance = rejected
+    
+    status = run_async(other.get_data_source_status())
+    
+    assert status['sources']['etherscan_api']['status'] == 'error'
+    assert status['sources']['etherscan_api']['error'] == 'Invalid API Key'
@@ -0,0 +1,147 @@
+"""
+Multi-chain Service tests - demo records, analysis cache and provider fallback
+"""
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from app.services.multichain_service import CHAIN_INDEX, ChainType, MultiChainService
+
+EVM_ADDRESS = '0x' + 'ab' * 20
+
+class FakeFetch:
+    """Replaces _fetch_chain_cached: records calls and fails or answers per chain"""
+    
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+    
+    async def __call__(self, session, cache, config, address):
+        self.calls.append(config.chain_type)
+        if config.chain_type in self.failing:
+            raise ConnectionError('provider unreachable')
+        return 3 * 10**18, 42
+
+@pytest.fixture
+def service():
+    return MultiChainService()
+
+def make_live(service, *chains):
+    for chain in chains:
+        service.chains[chain] = replace(service.chains[chain], live=True)
+
+def test_unconfigured_chains_return_demo_records(service, monkeypatch):
+    fetch = FakeFetch()
+    monkeypatch.setattr(service, '_fetch_chain_cached', fetch)
+    
+    results = service.analyze_address_multichain_sync(EVM_ADDRESS)
+    
+    assert fetch.calls == []
+    assert list(results) == service.detect_address_chain(EVM_ADDRESS)
+    for chain, record in results.items():
+        assert record.chain == chain
+        assert record.balance == '0.0'
+        assert record.transaction_count == 0
+
+def test_live_chain_fetched(service, monkeypatch):
+    fetch = FakeFetch()
+    monkeypatch.setattr(service, '_fetch_chain_cached', fetch)
+    make_live(service, ChainType.POLYGON)
+    
+    results = service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.ETHEREUM, ChainType.POLYGON])
+    
+    assert fetch.calls == [ChainType.POLYGON]
+    assert results[ChainType.POLYGON].balance == '3.0'
+    assert results[ChainType.POLYGON].transaction_count == 42
+    assert results[ChainType.ETHEREUM].transaction_count == 0
+
+def test_successful_analysis_is_cached(service, monkeypatch):
+    fetch = FakeFetch()
+    monkeypatch.setattr(service, '_fetch_chain_cached', fetch)
+    make_live(service, ChainType.POLYGON)
+    
+    first = service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.POLYGON])
+    first.clear()
+    second = service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.POLYGON])
+    
+    assert fetch.calls == [ChainType.POLYGON]
+    assert second[ChainType.POLYGON].transaction_count == 42
+
+def test_fallback_records_are_not_cached(service, monkeypatch):
+    fetch = FakeFetch(failing=[ChainType.POLYGON])
+    monkeypatch.setattr(service, '_fetch_chain_cached', fetch)
+    make_live(service, ChainType.POLYGON)
+    
+    results = service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.POLYGON])
+    assert results[ChainType.POLYGON].balance == '0.0'
+    assert len(service._analysis_cache) == 0
+    
+    # The provider recovers: the next request goes to it rather than the fallback
+    fetch.failing.clear()
+    results = service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.POLYGON])
+    assert results[ChainType.POLYGON].transaction_count == 42
+    assert fetch.calls == [ChainType.POLYGON, ChainType.POLYGON]
+    assert len(service._analysis_cache) == 1
+
+def test_awaited_from_another_loop(service, monkeypatch):
+    fetch = FakeFetch()
+    monkeypatch.setattr(service, '_fetch_chain_cached', fetch)
+    make_live(service, ChainType.POLYGON)
+    
+    results = asyncio.run(service.analyze_address_multichain(EVM_ADDRESS, [ChainType.POLYGON]))
+    
+    assert results[ChainType.POLYGON].transaction_count == 42
+    # Clients opened for a short-lived loop are not kept around
+    assert service._session is None
+
+def test_shared_loop_reuses_one_session(service, monkeypatch):
+    monkeypatch.setattr(service, '_fetch_chain_cached', FakeFetch())
+    make_live(service, ChainType.POLYGON, ChainType.BSC)
+    
+    service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.POLYGON])
+    session = service._session
+    service.analyze_address_multichain_sync(EVM_ADDRESS, [ChainType.BSC])
+    
+    assert session is not None
+    assert service._session is session
+
+def test_rpc_url_env_configures_chain(monkeypatch):
+    monkeypatch.setenv('POLYGON_RPC_URL', 'https://polygon.example/rpc')
+    service = MultiChainService()
+    
+    config = service.get_chain_config(ChainType.POLYGON)
+    assert config.live
+    assert config.rpc_url == 'https://polygon.example/rpc'
+    assert not service.get_chain_config(ChainType.ETHEREUM).live
+
+def test_api_key_fills_placeholder_url(service):
+    assert service.update_api_key(ChainType.ETHEREUM, 'secret')
+    
+    config = service.get_chain_config(ChainType.ETHEREUM)
+    assert config.live
+    assert config.rpc_url.endswith('/v2/secret')
+    assert config.rpc_url in service._limiters
+
+def test_redis_bypassed_after_failure(service):
+    service._redis_failed(ConnectionError('refused'))
+    assert not service._redis_usable()
+
+def test_batch_detection_matches_single(service):
+    addresses = [
+        EVM_ADDRESS,
+        '0X' + 'ab' * 20,
+        '0x' + 'ab' * 19 + 'ag',
+        '0x' + 'ab' * 19 + 'a٠',
+        '1A1zP1eFfh7DefPMY5A1zP1eFfh7DefPMY',
+        'bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq',
+        'So11111111111111111111111111111111111111112',
+        '',
+    ]
+    
+    mask = service.detect_address_chain_batch(addresses)
+    
+    for address, row in zip(addresses, mask):
+        detected = {chain for chain, column in CHAIN_INDEX.items() if row[column]}
+        assert detected == set(service.detect_address_chain(address))
@@ -0,0 +1,190 @@
+"""
+Network Behavior Analyzer tests - vectorized pipeline against the original per-transaction loop
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sklearn.cluster import DBSCAN
+from sklearn.preprocessing import StandardScaler
+
+from app.services.network_behavior_analyzer import (
+    NUMBA_AVAILABLE,
+    NetworkBehaviorAnalyzer,
+    _cluster_edge_stats,
+    _cluster_edge_stats_numpy,
+)
+
+MIN_CLUSTER_SIZE = 5
+
+class FakeGraphClient:
+    """Graph store stub serving a fixed transaction list"""
+    
+    def __init__(self, network_data):
+        self.network_data = network_data
+    
+    def get_suspicious_networks(self, limit):
+        return self.network_data
+    
+    def get_network_subgraph(self, center_address, max_depth):
+        return self.network_data
+
+def build_network(seed: int = 7):
+    """Background transfers plus two Sybil-style rings: one funder, equal funding, members passing funds round in turn"""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    background = [f"0x{i:040x}" for i in range(60)]
+    data = []
+    
+    for _ in range(400):
+        data.append({
+            'from_address': rng.choice(background),
+            'to_address': rng.choice(background),
+            'value': rng.choice([10**18, 5 * 10**17, rng.randint(1, 10**19)]),
+            'timestamp': (base + timedelta(minutes=rng.randint(0, 60 * 24 * 45))).isoformat() + 'Z'
+        })
+    
+    for ring in range(2):
+        funder = f"0xf{ring:039x}"
+        members = [f"0xa{ring:03x}{j:036x}" for j in range(10)]
+        start = base + timedelta(days=10 * ring)
+        for j, member in enumerate(members):
+            data.append({'from_address': funder, 'to_address': member, 'value': 10**18,
+                         'timestamp': (start + timedelta(minutes=j)).isoformat() + 'Z'})
+        for k in range(30):
+            sender, receiver = members[k % 10], members[(k + 1) % 10]
+            data.append({'from_address': sender, 'to_address': receiver, 'value': 10**17,
+                         'timestamp': (start + timedelta(minutes=20 + k)).isoformat() + 'Z'})
+    
+    # A self-transfer and a transaction without a timestamp
+    data.append({'from_address': background[0], 'to_address': background[0], 'value': 10**18,
+                 'timestamp': base.isoformat() + 'Z'})
+    data.append({'from_address': background[1], 'to_address': background[2], 'value': 1, 'timestamp': None})
+    return data
+
+def reference_features(network_data):
+    """Per-address features as the original per-transaction loop computed them, in first-appearance order"""
+    stats = defaultdict(lambda: {
+        'in_degree': 0, 'out_degree': 0, 'in_volume': 0, 'out_volume': 0,
+        'tx_count': 0, 'counterparties': set(), 'timestamps': []
+    })
+    for tx in network_data:
+        sender, receiver = stats[tx['from_address']], stats[tx['to_address']]
+        sender['out_degree'] += 1
+        sender['out_volume'] += tx['value']
+        sender['tx_count'] += 1
+        sender['counterparties'].add(tx['to_address'])
+        receiver['in_degree'] += 1
+        receiver['in_volume'] += tx['value']
+        receiver['tx_count'] += 1
+        receiver['counterparties'].add(tx['from_address'])
+        if tx['timestamp']:
+            sender['timestamps'].append(tx['timestamp'])
+            receiver['timestamps'].append(tx['timestamp'])
+    
+    addresses = list(stats)
+    rows = []
+    for address in addresses:
+        s = stats[address]
+        dates = [datetime.fromisoformat(ts.replace('Z', '+00:00')) for ts in s['timestamps']]
+        total_volume = s['in_volume'] + s['out_volume']
+        rows.append([
+            s['in_degree'], s['out_degree'], s['in_volume'] / 1e18, s['out_volume'] / 1e18,
+            s['tx_count'], len(s['counterparties']),
+            (max(dates) - min(dates)).days if dates else 0,
+            s['in_volume'] / max(1, total_volume)
+        ])
+    return addresses, np.array(rows, dtype=np.float64)
+
+def reference_clusters(addresses, features, min_cluster_size):
+    """DBSCAN over standardized features, grouped by label as the original implementation did"""
+    labels = DBSCAN(eps=0.5, min_samples=min_cluster_size).fit_predict(StandardScaler().fit_transform(features))
+    clusters = defaultdict(list)
+    for address, label in zip(addresses, labels):
+        if label != -1:
+            clusters[label].append(address)
+    return {label: nodes for label, nodes in clusters.items() if len(nodes) >= min_cluster_size}
+
+@pytest.fixture
+def network_data():
+    return build_network()
+
+@pytest.fixture
+def analyzer(network_data):
+    return NetworkBehaviorAnalyzer(FakeGraphClient(network_data))
+
+def test_addresses_numbered_in_first_appearance_order(analyzer, network_data):
+    arrays = analyzer._network_arrays(network_data)
+    expected, _ = reference_features(network_data)
+    
+    assert list(arrays.addresses) == expected
+    assert list(arrays.addresses[arrays.from_id]) == [tx['from_address'] for tx in network_data]
+    assert list(arrays.addresses[arrays.to_id]) == [tx['to_address'] for tx in network_data]
+
+def test_features_match_reference_loop(analyzer, network_data):
+    features = analyzer._extract_network_features(analyzer._network_arrays(network_data))
+    _, expected = reference_features(network_data)
+    
+    np.testing.assert_allclose(features, expected, rtol=1e-5)
+
+def test_clusters_match_reference_dbscan(analyzer, network_data):
+    arrays = analyzer._network_arrays(network_data)
+    features = analyzer._extract_network_features(arrays)
+    clusters = analyzer._detect_clusters(arrays.addresses, features, MIN_CLUSTER_SIZE)
+    
+    addresses, reference = reference_features(network_data)
+    expected = reference_clusters(addresses, reference, MIN_CLUSTER_SIZE)
+    
+    assert clusters
+    assert {label: list(nodes) for label, nodes in clusters.items()} == expected
+
+def test_posting_lists_cover_each_address_transactions(analyzer, network_data):
+    arrays = analyzer._network_arrays(network_data)
+    
+    for i, address in enumerate(arrays.addresses):
+        postings = arrays.tx_postings[arrays.posting_offsets[i]:arrays.posting_offsets[i + 1]]
+        touching = {n for n, tx in enumerate(network_data) if address in (tx['from_address'], tx['to_address'])}
+        assert set(postings.tolist()) == touching
+
+def test_analyze_network_clusters_finds_rings(analyzer):
+    result = analyzer.analyze_network_clusters(min_cluster_size=MIN_CLUSTER_SIZE)
+    
+    assert 'error' not in result
+    clusters = {cluster['cluster_id']: cluster for cluster in result['clusters']}
+    ring_members = {f"0xa{ring:03x}{j:036x}" for ring in range(2) for j in range(10)}
+    clustered = {address for cluster in clusters.values() for address in cluster['addresses']}
+    assert ring_members <= clustered
+    
+    # Galaxy nodes reference the full analyses by id instead of embedding them
+    galaxy = result['galaxy_view_data']
+    assert 'cluster_meta' not in galaxy
+    assert [node['cluster_id'] for node in galaxy['nodes']] == list(clusters)
+    for node in galaxy['nodes']:
+        assert node['size'] == clusters[node['cluster_id']]['size']
+
+def test_parallel_cluster_analysis_matches_serial(network_data):
+    serial = NetworkBehaviorAnalyzer(FakeGraphClient(network_data))
+    serial.parallel_cluster_min = 10**9
+    parallel = NetworkBehaviorAnalyzer(FakeGraphClient(network_data))
+    parallel.parallel_cluster_min = 1
+    
+    expected = serial.analyze_network_clusters(min_cluster_size=MIN_CLUSTER_SIZE)
+    actual = parallel.analyze_network_clusters(min_cluster_size=MIN_CLUSTER_SIZE)
+    assert actual['clusters'] == expected['clusters']
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+def test_cluster_edge_stats_kernel_matches_numpy():
+    rng = np.random.default_rng(3)
+    from_in = rng.random(500) < 0.3
+    to_in = rng.random(500) < 0.3
+    values = rng.random(500) * 1e18
+    
+    touching, internal, internal_volume, crossing_volume = _cluster_edge_stats(from_in, to_in, values)
+    expected = _cluster_edge_stats_numpy(from_in, to_in, values)
+    
+    assert (touching, internal) == expected[:2]
+    assert internal_volume == pytest.approx(expected[2])
+    assert crossing_volume == pytest.approx(expected[3])
@@ -0,0 +1,101 @@
+"""
+PostgreSQL Graph Client tests - bulk imports of processed subgraph rows
+"""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+import app.database.postgres_graph as postgres_module
+from app.database.postgres_graph import PostgreSQLGraphClient
+from app.services.graph_protocol_service import AddressRow, RelationshipRow, TransactionRow
+
+SEEN = datetime(2024, 1, 1, 12, 30)
+
+class FakeConnection:
+    @contextmanager
+    def cursor(self):
+        yield self
+
+@pytest.fixture
+def statements(monkeypatch):
+    """(query, values) for each execute_values call"""
+    calls = []
+    monkeypatch.setattr(postgres_module, 'execute_values',
+                        lambda cursor, query, values: calls.append((query, values)))
+    return calls
+
+@pytest.fixture
+def client():
+    client = PostgreSQLGraphClient('postgresql://unused')
+    client.connection = FakeConnection()
+    return client
+
+def test_address_rows_imported_as_json_nodes(client, statements):
+    rows = [AddressRow('0x' + 'aa' * 20, SEEN, SEEN), {'address': '0x' + 'bb' * 20, 'balance': 1.5}]
+    
+    assert client.bulk_import_addresses(rows)
+    
+    (query, values), = statements
+    assert 'INSERT INTO graph_nodes' in query
+    assert [(node_id, node_type) for node_id, node_type, _ in values] == [
+        ('0x' + 'aa' * 20, 'address'), ('0x' + 'bb' * 20, 'address')
+    ]
+    assert json.loads(values[0][2]) == {
+        'hash': '0x' + 'aa' * 20, 'first_seen': '2024-01-01T12:30:00', 'last_activity': '2024-01-01T12:30:00',
+        'balance': 0.0, 'transaction_count': 0, 'is_contract': False
+    }
+    assert json.loads(values[1][2]) == {'address': '0x' + 'bb' * 20, 'balance': 1.5}
+
+def test_transaction_rows_imported_as_json_nodes(client, statements):
+    row = TransactionRow('0x' + '12' * 32, 1005, SEEN, 2.0, 21005, 10**9)
+    
+    assert client.bulk_import_transactions([row])
+    
+    (_, values), = statements
+    node_id, node_type, properties = values[0]
+    assert (node_id, node_type) == ('0x' + '12' * 32, 'transaction')
+    assert json.loads(properties) == {
+        'hash': '0x' + '12' * 32, 'block_number': 1005, 'timestamp': '2024-01-01T12:30:00',
+        'value': 2.0, 'gas_used': 21005, 'gas_price': 10**9, 'is_error': False
+    }
+
+def test_relationships_written_in_one_statement(client, statements):
+    a, b, c = ('0x' + h * 20 for h in ('aa', 'bb', 'cc'))
+    rows = [
+        RelationshipRow(a, b, '0x01', 1.0, SEEN, 21000),
+        RelationshipRow(b, c, '0x02', 2.0, SEEN, 50000),
+        {'from_hash': c, 'to_hash': a, 'transaction': '0x03', 'value': 0.5, 'timestamp': '2024-01-02T00:00:00'},
+    ]
+    
+    assert client.bulk_import_relationships(rows)
+    
+    (query, values), = statements
+    assert 'INSERT INTO graph_edges' in query
+    assert [(from_node, to_node, edge_type) for _, from_node, to_node, edge_type, _ in values] == [
+        (a, b, 'SENT_TO'), (b, c, 'SENT_TO'), (c, a, 'SENT_TO')
+    ]
+    assert json.loads(values[1][4]) == {
+        'value': 2.0, 'transaction_hash': '0x02', 'timestamp': '2024-01-01T12:30:00', 'gas_used': 50000
+    }
+    assert json.loads(values[2][4])['timestamp'] == '2024-01-02T00:00:00'
+
+def test_repeated_relationships_keep_the_last(client, statements):
+    # One upsert statement may not touch a row twice; the last write wins as with sequential upserts
+    a, b = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+    rows = [RelationshipRow(a, b, '0x01', 1.0, SEEN, 21000), RelationshipRow(a, b, '0x02', 4.0, SEEN, 30000)]
+    
+    assert client.bulk_import_relationships(rows)
+    
+    (_, values), = statements
+    assert len(values) == 1
+    assert json.loads(values[0][4])['transaction_hash'] == '0x02'
+
+def test_failed_import_returns_false(client, monkeypatch):
+    def failing(cursor, query, values):
+        raise RuntimeError('connection lost')
+    monkeypatch.setattr(postgres_module, 'execute_values', failing)
+    
+    assert not client.bulk_import_relationships([RelationshipRow('0x1', '0x2', '0x03', 1.0, SEEN)])
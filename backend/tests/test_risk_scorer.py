@@ -0,0 +1,161 @@
+"""
+Risk Scorer tests - value, timing and address-pattern edge cases
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services.risk_scorer import RiskScorer
+
+ETH = 10**18
+
+@pytest.fixture
+def scorer():
+    return RiskScorer()
+
+def iso_utc(moment: datetime) -> str:
+    """UTC timestamp in the 'Z'-suffixed form explorers return"""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+
+def reference_address_patterns(address):
+    """The original regex-based address checks"""
+    factors = []
+    addr_lower = address.lower()
+    if re.match(r'^0x[0]{8,}', addr_lower):
+        factors.append("Vanity address with leading zeros")
+    if re.match(r'^0x[a-f0-9]*[0]{8,}$', addr_lower):
+        factors.append("Vanity address with trailing zeros")
+    hex_part = addr_lower[2:]
+    for i in range(2, 8):
+        pattern = hex_part[:i]
+        if hex_part == pattern * (len(hex_part) // i) + pattern[:len(hex_part) % i]:
+            factors.append(f"Address contains repeating pattern: {pattern}")
+            break
+    return factors
+
+# === Transaction values ===
+
+def test_values_above_int64_stay_exact(scorer):
+    # 200 ETH overflows int64; the whale and round-number checks must still see it exactly
+    transactions = [{'value_wei': 200 * ETH}, {'value_wei': 3 * ETH}, {'value_wei': 2**70}]
+    values = scorer._positive_values(transactions)
+    assert values.dtype == object
+    assert values.tolist() == [200 * ETH, 3 * ETH, 2**70]
+    
+    result = scorer._analyze_transaction_values(transactions)
+    assert "Very large transaction (>100 ETH)" in result['factors']
+    assert "Whale Activity" in result['tags']
+
+def test_round_numbers_counted_above_int64(scorer):
+    transactions = [{'value_wei': (100 + i) * ETH} for i in range(9)] + [{'value_wei': ETH + 1}]
+    result = scorer._analyze_transaction_values(transactions)
+    assert "Many round-number transactions" in result['factors']
+
+def test_values_within_int64_use_fast_path(scorer):
+    transactions = [{'value_wei': 10**14}] * 6 + [{'value_wei': 2 * ETH}]
+    values = scorer._positive_values(transactions)
+    assert values.dtype == np.int64
+    
+    result = scorer._analyze_transaction_values(transactions)
+    assert "Many dust transactions" in result['factors']
+    assert "Very large transaction (>100 ETH)" not in result['factors']
+
+def test_zero_and_missing_values_ignored(scorer):
+    transactions = [{'value_wei': 0}, {}, {'value_wei': 0}]
+    assert scorer._positive_values(transactions).size == 0
+    assert scorer._analyze_transaction_values(transactions) == {'score': 0, 'factors': [], 'tags': []}
+
+# === Timestamps and timing ===
+
+def test_z_suffixed_timestamp_parsed_as_utc(scorer):
+    assert scorer._parse_timestamp('2024-01-01T00:00:00Z') == 1704067200.0
+    assert scorer._parse_timestamp('2024-01-01T00:00:00+00:00') == 1704067200.0
+
+@pytest.mark.parametrize('value', [None, '', 'not-a-date', 1704067200, '2024-13-01T00:00:00Z'])
+def test_malformed_timestamps_are_none(scorer, value):
+    assert scorer._parse_timestamp(value) is None
+
+def test_recent_filter_skips_unparsed_and_old(scorer):
+    now = datetime.now(timezone.utc)
+    transactions = [
+        {'timestamp': iso_utc(now - timedelta(days=1))},
+        {'timestamp': 'garbage'},
+        {'timestamp': iso_utc(now - timedelta(days=90))},
+        {'timestamp': iso_utc(now - timedelta(hours=1))},
+    ]
+    timestamps = [scorer._parse_timestamp(tx['timestamp']) for tx in transactions]
+    recent, recent_timestamps = scorer._get_recent_transactions(transactions, timestamps, days=30)
+    assert recent == [transactions[0], transactions[3]]
+    assert recent_timestamps == [timestamps[0], timestamps[3]]
+
+def test_timing_needs_two_timestamps(scorer):
+    assert scorer._analyze_timing_patterns([]) == {'score': 0, 'factors': [], 'tags': []}
+    assert scorer._analyze_timing_patterns([1704067200.0]) == {'score': 0, 'factors': [], 'tags': []}
+
+def test_regular_intervals_flag_bot(scorer):
+    timestamps = [1704067200.0 + 3600 * i for i in range(10)]
+    result = scorer._analyze_timing_patterns(timestamps)
+    assert "Potential Bot" in result['tags']
+    assert "MEV Bot" not in result['tags']
+
+def test_rapid_transactions_flag_mev(scorer):
+    # Irregular, mostly sub-minute gaps: rapid but not regular
+    gaps = [5, 50, 10, 40, 20, 30, 3600]
+    timestamps = list(1704067200.0 + np.cumsum([0] + gaps))
+    result = scorer._analyze_timing_patterns(timestamps)
+    assert "MEV Bot" in result['tags']
+    assert "Potential Bot" not in result['tags']
+
+def test_timing_uses_absolute_intervals(scorer):
+    # Newest-first histories produce negative diffs; they must read as the same gaps
+    timestamps = [1704067200.0 + 3600 * i for i in range(10)]
+    forward = scorer._analyze_timing_patterns(timestamps)
+    backward = scorer._analyze_timing_patterns(timestamps[::-1])
+    assert forward == backward
+
+def test_calculate_risk_score_with_z_timestamps(scorer):
+    now = datetime.now(timezone.utc)
+    transactions = [
+        {'timestamp': iso_utc(now - timedelta(seconds=20 * i)), 'value_wei': ETH,
+         'from': '0x' + '1' * 40, 'to': '0x' + '2' * 40}
+        for i in range(10)
+    ]
+    result = scorer.calculate_risk_score('0x' + 'ab' * 20, transactions, 5 * ETH)
+    assert "MEV Bot" in result['behavioral_tags']
+    assert 0 <= result['risk_score'] <= 100
+
+# === Address patterns ===
+
+@pytest.mark.parametrize('address', [
+    '0x3f5CE5FBFe3E9af3971dD833D26bA9b5C936f0bE',
+    '0x0000000000000000000000000000000000000000',
+    '0x00000000ab5801a7d398351b8be11c439e05c5b3',
+    '0xab5801a7d398351b8be11c439e05c5b300000000',
+    '0x0000000ab5801a7d398351b8be11c439e05c5b30',
+    '0xzz00000000',
+    '0x',
+    'not-an-address00000000',
+])
+def test_vanity_checks_match_reference(scorer, address):
+    assert scorer._analyze_address_patterns(address)['factors'] == reference_address_patterns(address)
+
+@pytest.mark.parametrize('address', [
+    '0x' + 'ab' * 20,
+    '0x' + 'abc' * 13 + 'a',
+    '0x' + 'deadbee' * 5 + 'deadb',
+    '0x' + '1' * 40,
+    '0x' + '12345678' * 5,
+    '0xAB' + 'ab' * 19,
+    '0xab',
+])
+def test_repeating_pattern_checks_match_reference(scorer, address):
+    assert scorer._analyze_address_patterns(address)['factors'] == reference_address_patterns(address)
+
+def test_patterned_address_scored(scorer):
+    result = scorer._analyze_address_patterns('0x' + 'ab' * 20)
+    assert result['factors'] == ["Address contains repeating pattern: ab"]
+    assert result['score'] == 8
+    assert "Patterned Address" in result['tags']
@@ -0,0 +1,164 @@
+"""
+RPC Service tests - batched balance lookups, chunking and per-chunk fallback
+"""
+
+import pytest
+import requests
+
+import app.services.rpc_service as rpc_module
+from app.services.rpc_service import RPCService
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.payload
+
+class FakeSession:
+    """Stands in for the pooled requests.Session; `handler` maps a JSON body to a response payload"""
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.bodies = []
+    
+    def post(self, url, json=None, timeout=None):
+        self.bodies.append(json)
+        payload = self.handler(json)
+        if isinstance(payload, Exception):
+            raise payload
+        return FakeResponse(payload)
+
+def balance_of(address):
+    """Deterministic fake balance: the address's trailing digits, in wei"""
+    return int(address[-6:], 16)
+
+def answer(call, error=None):
+    if error is not None:
+        return {'jsonrpc': '2.0', 'id': call['id'], 'error': error}
+    return {'jsonrpc': '2.0', 'id': call['id'], 'result': hex(balance_of(call['params'][0]))}
+
+def batch_handler(body):
+    """Provider accepting batches; answers in reverse order to check id matching"""
+    if isinstance(body, list):
+        return [answer(call) for call in reversed(body)]
+    return answer(body)
+
+@pytest.fixture
+def addresses():
+    return [f"0x{i:040x}" for i in range(1, 251)]
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(rpc_module.time, 'sleep', lambda seconds: None)
+    return RPCService()
+
+def assert_balances(result, addresses):
+    assert result['total_addresses'] == len(addresses)
+    assert [entry['address'] for entry in result['balances']] == addresses
+    assert [entry['balance'] for entry in result['balances']] == [balance_of(a) for a in addresses]
+    assert all('error' not in entry for entry in result['balances'])
+
+def test_batches_are_chunked(service, addresses):
+    service.session = FakeSession(batch_handler)
+    
+    result = service.batch_get_balances(addresses)
+    
+    assert [len(body) for body in service.session.bodies] == [100, 100, 50]
+    assert_balances(result, addresses)
+
+def test_empty_address_list(service):
+    service.session = FakeSession(batch_handler)
+    
+    result = service.batch_get_balances([])
+    
+    assert result['balances'] == [] and result['total_addresses'] == 0
+    assert service.session.bodies == []
+
+def test_rejected_batches_fall_back_to_single_calls(service, addresses):
+    # Provider without batch support: a single error object for any array body
+    def handler(body):
+        if isinstance(body, list):
+            return {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'batch not supported'}}
+        return answer(body)
+    service.session = FakeSession(handler)
+    
+    result = service.batch_get_balances(addresses[:120])
+    
+    batch_bodies = [body for body in service.session.bodies if isinstance(body, list)]
+    assert [len(body) for body in batch_bodies] == [100, 20]
+    assert len(service.session.bodies) == 2 + 120
+    assert_balances(result, addresses[:120])
+
+def test_failed_chunk_does_not_sink_the_others(service, addresses):
+    # The second chunk's batch hits a network error; the others still go out batched
+    def handler(body):
+        if isinstance(body, list) and body[0]['params'][0] == addresses[100]:
+            return requests.exceptions.ConnectionError('connection reset')
+        return batch_handler(body)
+    service.session = FakeSession(handler)
+    
+    result = service.batch_get_balances(addresses)
+    
+    single_calls = [body for body in service.session.bodies if isinstance(body, dict)]
+    assert len(single_calls) == 100
+    assert {call['params'][0] for call in single_calls} == set(addresses[100:200])
+    assert_balances(result, addresses)
+
+def test_rate_limited_entries_are_retried(service, addresses):
+    throttled = set(addresses[5:8])
+    seen = set()
+    
+    def handler(body):
+        responses = []
+        for call in body:
+            address = call['params'][0]
+            if address in throttled and address not in seen:
+                seen.add(address)
+                responses.append(answer(call, {'code': -32005, 'message': 'limit exceeded'}))
+            else:
+                responses.append(answer(call))
+        return responses
+    service.session = FakeSession(handler)
+    
+    result = service.batch_get_balances(addresses[:10])
+    
+    assert [len(body) for body in service.session.bodies] == [10, 3]
+    assert_balances(result, addresses[:10])
+
+def test_rate_limit_retries_are_bounded(service, addresses):
+    def handler(body):
+        return [answer(call, {'code': 429, 'message': 'Too Many Requests'}) for call in body]
+    service.session = FakeSession(handler)
+    
+    result = service.batch_get_balances(addresses[:4])
+    
+    assert len(service.session.bodies) == service.max_batch_attempts
+    assert all(entry['balance'] == 0 and 'error' in entry for entry in result['balances'])
+
+def test_other_call_errors_are_not_retried(service, addresses):
+    def handler(body):
+        return [answer(call, {'code': -32602, 'message': 'invalid address'}) if i == 1 else answer(call)
+                for i, call in enumerate(body)]
+    service.session = FakeSession(handler)
+    
+    result = service.batch_get_balances(addresses[:3])
+    
+    assert len(service.session.bodies) == 1
+    assert 'invalid address' in result['balances'][1]['error']
+    assert result['balances'][1]['balance'] == 0
+    assert result['balances'][2]['balance'] == balance_of(addresses[2])
+
+@pytest.mark.parametrize('error, expected', [
+    ({'code': -32005, 'message': 'limit exceeded'}, True),
+    ({'code': 429, 'message': 'slow down'}, True),
+    ({'code': -32000, 'message': 'Rate limit reached'}, True),
+    ('Too many requests, try later', True),
+    ({'code': -32602, 'message': 'invalid params'}, False),
+    ('header not found', False),
+])
+def test_is_rate_limited(service, error, expected):
+    assert service._is_rate_limited(error) is expected